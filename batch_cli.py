@@ -0,0 +1,376 @@
+"""
+Headless batch pipeline: generation -> translation -> Google Form creation.
+
+Reads a CSV or JSONL file of rows with the columns goal, industry, product,
+languages and create_form, and streams every row through the three stages.
+Languages are language names or codes separated by ',' or ';'. Finished stage
+outputs are checkpointed, so rerunning the same job skips completed work.
+
+    python batch_cli.py jobs.csv --output results.jsonl --checkpoint-dir .checkpoints
+"""
+import argparse
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from dotenv import dotenv_values
+
+from cache_helper import make_cache_key
+from language_codes import language_codes
+
+_DONE = object()
+
+
+def read_rows(path: str):
+    """
+    Read job rows from a CSV or JSONL file.
+
+    Yields:
+    - dict: Rows with 'goal', 'industry', 'product', 'languages' (list of codes) and 'create_form' (bool).
+
+    Raises:
+    - ValueError: If a row misses a column or names an unsupported language.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if path.endswith('.jsonl'):
+            records = (json.loads(line) for line in source if line.strip())
+        else:
+            records = csv.DictReader(source)
+        for number, record in enumerate(records, start=1):
+            yield normalize_row(record, number)
+
+
+def normalize_row(record: dict, number: int) -> dict:
+    missing = [column for column in ('goal', 'industry', 'product') if not record.get(column)]
+    if missing:
+        raise ValueError(f"Row {number}: missing {', '.join(missing)}")
+    languages = record.get('languages') or 'en_XX'
+    if isinstance(languages, str):
+        languages = [language.strip() for language in languages.replace(';', ',').split(',') if language.strip()]
+    codes = []
+    for language in languages:
+        code = language_codes.get(language, language)
+        if code not in language_codes.values():
+            raise ValueError(f"Row {number}: unsupported language {language!r}")
+        codes.append(code)
+    create_form = record.get('create_form', False)
+    if isinstance(create_form, str):
+        create_form = create_form.strip().lower() in ('1', 'true', 'yes', 'y')
+    row = {'goal': record['goal'], 'industry': record['industry'], 'product': record['product'],
+           'languages': codes, 'create_form': bool(create_form)}
+    row['row_id'] = make_cache_key(row)[:16]
+    return row
+
+
+class Checkpoints:
+    """
+    Stage outputs stored as one JSON file per row, stage and language.
+
+    Parameters:
+    - directory (str): Where checkpoint files are written, None to disable checkpointing.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, row_id: str, stage: str, language: str = '') -> str:
+        name = '.'.join(part for part in (row_id, stage, language) if part)
+        return os.path.join(self.directory, f'{name}.json')
+
+    def load(self, row_id: str, stage: str, language: str = ''):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(row_id, stage, language), encoding='utf-8') as checkpoint:
+                return json.load(checkpoint)
+        except FileNotFoundError:
+            return None
+
+    def save(self, value, row_id: str, stage: str, language: str = ''):
+        if not self.directory:
+            return
+        path = self._path(row_id, stage, language)
+        # write atomically so an interrupted job never leaves a partial checkpoint
+        with open(path + '.tmp', 'w', encoding='utf-8') as checkpoint:
+            json.dump(value, checkpoint, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+
+class Stage:
+    """
+    One pipeline stage: a generator function run by worker threads between two bounded queues.
+
+    Parameters:
+    - name (str): Stage name used in progress reports and checkpoints.
+    - fn (callable): Generator function taking an iterator of input items and yielding output items.
+    - workers (int): Number of threads running `fn` on the same input queue.
+    """
+
+    def __init__(self, name: str, fn, workers: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.processed = 0
+        self.started = None
+        self._lock = threading.Lock()
+
+    def throughput(self) -> float:
+        if not self.started:
+            return 0.0
+        return self.processed / max(time.monotonic() - self.started, 1e-9)
+
+
+# seconds between checks of the stop flag while waiting on a queue
+_POLL_SECONDS = 0.1
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(source: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            item = source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if item is _DONE:
+            # let the sibling workers of this stage see the end of the stream too
+            _put(source, _DONE, stop)
+            return
+        yield item
+
+
+def run_pipeline(items, stages: list, queue_size: int = 16, report_every: float = 5.0, report=None):
+    """
+    Stream items through stages connected by bounded queues.
+
+    Parameters:
+    - items (iterable): The input items.
+    - stages (list): `Stage` objects, in order.
+    - queue_size (int): Capacity of each queue between stages; full queues block the upstream stage.
+    - report_every (float): Seconds between progress reports.
+    - report (callable): Receives the progress report string, defaults to printing on stderr.
+
+    Yields:
+    - The items produced by the last stage, as they are produced.
+
+    Raises:
+    - Exception: The first error raised by the input or a stage. The error sets
+      a stop flag that every queue operation checks, so no thread stays blocked
+      on a full or empty queue and the run ends instead of hanging.
+    """
+    report = report or (lambda line: print(line, file=sys.stderr))
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    errors = []
+    stop = threading.Event()
+
+    def feed():
+        try:
+            for item in items:
+                if not _put(queues[0], item, stop):
+                    return
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            _put(queues[0], _DONE, stop)
+
+    def work(stage, source, target, remaining):
+        try:
+            for item in stage.fn(_drain(source, stop)):
+                if not _put(target, item, stop):
+                    return
+                with stage._lock:
+                    stage.processed += 1
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            with stage._lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    _put(target, _DONE, stop)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for index, stage in enumerate(stages):
+        stage.started = time.monotonic()
+        remaining = [stage.workers]
+        threads += [threading.Thread(target=work, args=(stage, queues[index], queues[index + 1], remaining),
+                                     name=f'{stage.name}-{worker}', daemon=True)
+                    for worker in range(stage.workers)]
+    for thread in threads:
+        thread.start()
+
+    stop_reporting = threading.Event()
+    def reporter():
+        while not stop_reporting.wait(report_every):
+            report(' | '.join(f'{stage.name}: {stage.processed} done, {stage.throughput():.2f}/s, '
+                              f'queue {queues[index].qsize()}' for index, stage in enumerate(stages)))
+    threading.Thread(target=reporter, daemon=True).start()
+
+    try:
+        for item in _drain(queues[-1], stop):
+            yield item
+    finally:
+        # also releases the threads when the caller stops consuming early
+        stop.set()
+        stop_reporting.set()
+    if errors:
+        raise errors[0]
+
+
+def generation_stage(checkpoints: Checkpoints, regenerate: bool = False):
+    import langchain_helper as lch
+
+    def generate(rows):
+        for row in rows:
+            statements = checkpoints.load(row['row_id'], 'generate')
+            if statements is None:
+                try:
+                    statements = lch.generate_survey_statements(row['goal'], row['industry'], row['product'],
+                                                                regenerate=regenerate).statements
+                except Exception as error:
+                    yield dict(row, error=f'generate: {error}')
+                    continue
+                checkpoints.save(statements, row['row_id'], 'generate')
+            yield dict(row, statements=statements)
+    return generate
+
+
+def translation_stage(checkpoints: Checkpoints, pool=None):
+    """
+    Translate every row into its languages, through the translation server or, when
+    `pool` is a `TranslationProcessPool`, all languages of a row at once across its workers.
+    """
+    from translation_server import TranslationClient
+
+    def translate_row(client, row):
+        translations, errors = {}, {}
+        missing = []
+        for language in row['languages']:
+            if language == 'en_XX':
+                continue
+            translated = checkpoints.load(row['row_id'], 'translate', language)
+            if translated is None:
+                missing.append(language)
+            else:
+                translations[language] = translated
+        if pool is not None and missing:
+            try:
+                translations.update(pool.translate_many({language: row['statements'] for language in missing}))
+            except Exception as error:
+                errors = {language: error for language in missing}
+        else:
+            for language in missing:
+                try:
+                    translations[language] = client.translate(row['statements'], language)
+                except Exception as error:
+                    errors[language] = error
+        for language in missing:
+            if language in translations:
+                checkpoints.save(translations[language], row['row_id'], 'translate', language)
+        return translations, errors
+
+    def translate(rows):
+        client = TranslationClient() if pool is None else None
+        for row in rows:
+            if row.get('error'):
+                yield row
+                continue
+            translations, errors = translate_row(client, row)
+            # one item per language from here on
+            for language in row['languages']:
+                item = dict(row, language=language)
+                if language in errors:
+                    yield dict(item, error=f'translate: {errors[language]}')
+                elif language == 'en_XX':
+                    yield item
+                else:
+                    yield dict(item, statements=translations[language])
+    return translate
+
+
+def form_stage(checkpoints: Checkpoints, folder_id: str):
+    import google_form_helper as gf
+    names = {code: name for name, code in language_codes.items()}
+
+    def publish(items):
+        for item in items:
+            if item.get('error') or not item['create_form']:
+                yield item
+                continue
+            form = checkpoints.load(item['row_id'], 'form', item['language'])
+            if form is None:
+                try:
+                    result = gf.google_form_generator(
+                        text_list=item['statements'], folder_id=folder_id,
+                        form_name=f"({names[item['language']]}) {item['goal']} of {item['product']}",
+                        form_description='Please respond on a scale 1-5')
+                except Exception as error:
+                    yield dict(item, error=f'form: {error}')
+                    continue
+                form = {'formId': result.get('formId'), 'responderUri': result.get('responderUri')}
+                checkpoints.save(form, item['row_id'], 'form', item['language'])
+            yield dict(item, form=form)
+    return publish
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help='CSV or JSONL file of job rows')
+    parser.add_argument('--output', default='-', help='JSONL file for the results, - for stdout')
+    parser.add_argument('--checkpoint-dir', default='.batch_checkpoints')
+    parser.add_argument('--folder-id', default=None, help='Drive folder for forms, defaults to DRIVE_FOLDER_ID')
+    parser.add_argument('--generation-workers', type=int, default=4)
+    parser.add_argument('--form-workers', type=int, default=2)
+    parser.add_argument('--translation-workers', type=int, default=0,
+                        help='translate in this many forked processes instead of the in-process server')
+    parser.add_argument('--queue-size', type=int, default=16)
+    parser.add_argument('--report-every', type=float, default=5.0)
+    parser.add_argument('--regenerate', action='store_true', help='bypass the generation cache')
+    args = parser.parse_args(argv)
+
+    folder_id = args.folder_id or dotenv_values('.env').get('DRIVE_FOLDER_ID') or os.getenv('DRIVE_FOLDER_ID')
+    checkpoints = Checkpoints(args.checkpoint_dir)
+    pool = None
+    if args.translation_workers:
+        from translation_pool import TranslationProcessPool
+        # fork the workers before the pipeline starts any threads
+        pool = TranslationProcessPool(workers=args.translation_workers).start()
+    stages = [
+        Stage('generate', generation_stage(checkpoints, args.regenerate), workers=args.generation_workers),
+        Stage('translate', translation_stage(checkpoints, pool), workers=1),
+        Stage('form', form_stage(checkpoints, folder_id), workers=args.form_workers),
+    ]
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    failed = 0
+    try:
+        for item in run_pipeline(read_rows(args.input), stages, args.queue_size, args.report_every):
+            failed += bool(item.get('error'))
+            output.write(json.dumps(item, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if pool is not None:
+            pool.stop()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Throughput of the bulk generation API at several concurrency limits.
+
+Runs against the local fake OpenAI server, optionally with injected 429s to
+exercise adaptive throttling. Run from the repository root:
+
+    python -m benchmarks.bench_bulk_generation --products 200 --concurrency 1 4 16 64 --error-rate 0.02
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.fake_openai_server import FakeOpenAIServer
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-fake')
+os.environ['GENERATION_CACHE_PATH'] = ''
+
+import langchain_helper as lch  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency, error_rate=args.error_rate, error_status=429).start()
+    lch._generation_client = lch.GenerationClient(base_url=server.base_url, max_connections=max(args.concurrency))
+    requests = [('Assess Market Demand', 'Automotive', f'Product {index}') for index in range(args.products)]
+
+    results = []
+    for concurrency in args.concurrency:
+        started = time.perf_counter()
+        outputs = lch.generate_many(requests, max_concurrency=concurrency, regenerate=True)
+        elapsed = time.perf_counter() - started
+        results.append({
+            'concurrency': concurrency,
+            'seconds': elapsed,
+            'requests_per_second': len(outputs) / elapsed,
+            'failed': sum(output['error'] is not None for output in outputs),
+        })
+    server.stop()
+    print(json.dumps({'settings': vars(args), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
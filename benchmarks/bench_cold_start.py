@@ -0,0 +1,84 @@
+"""
+Cold start and per-process memory with `from_pretrained` versus the prepared, memory-mapped model.
+
+Starts several fresh Python processes at once for each loading mode. Each
+process imports `translator_helper`, loads the model and translates one
+statement. The script reports process start-to-ready time, library import
+time, model load time (weights and tokenizer), and the RSS and PSS of every
+process while they are all alive. A PSS well below RSS means the weight
+pages are shared between processes. Run from the repository root:
+
+    python -m benchmarks.bench_cold_start --processes 4
+    TRANSLATOR_MODEL=.tiny_translator python -m benchmarks.bench_cold_start --prepared-dir /tmp/prepared
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import translator_helper as lang_helper
+from translation_pool import process_memory
+
+WORKER = """
+import json, sys, time
+started = time.perf_counter()
+import torch, transformers
+import translator_helper as lang_helper
+import_seconds = time.perf_counter() - started
+started = time.perf_counter()
+lang_helper.get_translator()
+load_seconds = time.perf_counter() - started
+lang_helper.translate_survey_questions(['The price of the product is reasonable.'], 'de_DE')
+print(json.dumps({'import_seconds': import_seconds, 'load_seconds': load_seconds,
+                  'source': lang_helper.translator_stats['model_source']}), flush=True)
+sys.stdin.read()
+"""
+
+
+def run_processes(count: int, prepared_dir: str) -> dict:
+    environment = dict(os.environ, TRANSLATOR_PREPARED_DIR=prepared_dir, TRANSLATION_CACHE_PATH='',
+                       TRANSLATION_CACHE_ITEMS='0', TOKENIZERS_PARALLELISM='false')
+    started = time.perf_counter()
+    processes = [subprocess.Popen([sys.executable, '-c', WORKER], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, env=environment, text=True)
+                 for _ in range(count)]
+    reports, ready = [], []
+    for process in processes:
+        reports.append(json.loads(process.stdout.readline()))
+        ready.append(time.perf_counter() - started)
+    # every process is alive and idle here, so shared pages are split between all of them
+    memory = [process_memory(process.pid) for process in processes]
+    for process in processes:
+        process.stdin.close()
+        process.wait()
+    return {
+        'source': reports[0]['source'],
+        'ready_seconds': statistics.median(ready),
+        'import_seconds': statistics.median(report['import_seconds'] for report in reports),
+        'load_seconds': statistics.median(report['load_seconds'] for report in reports),
+        'rss_mb': statistics.median(entry['rss'] for entry in memory),
+        'pss_mb': statistics.median(entry['pss'] for entry in memory),
+        'shared_mb': statistics.median(entry['shared'] for entry in memory),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--prepared-dir', default=lang_helper.PREPARED_MODEL_DIR)
+    args = parser.parse_args()
+
+    if not lang_helper.prepared_model_available(args.prepared_dir):
+        lang_helper.prepare_model(args.prepared_dir)
+    results = {
+        'from_pretrained': run_processes(args.processes, ''),
+        'prepared_mmap': run_processes(args.processes, args.prepared_dir),
+    }
+    print(json.dumps({'settings': vars(args), 'model': lang_helper.MODEL_NAME, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
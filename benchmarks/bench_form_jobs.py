@@ -0,0 +1,99 @@
+"""
+Throughput of the background form publishing queue under many simultaneous submissions.
+
+Many threads submit forms at once against the fake Forms/Drive service. The
+script reports how long `submit` blocks the caller, how fast the queue
+drains with different worker counts, and, with injected failures, whether
+retried jobs end with exactly one form and no duplicated questions. Run from
+the repository root:
+
+    python -m benchmarks.bench_form_jobs --jobs 200 --workers 1 4 16 --latency 0.05
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.fake_google import install_fake_google
+
+import google_form_helper as gf
+from form_jobs import FormJobQueue, publish_form, question_count
+
+
+def flaky_publish(fail_every: int):
+    """Wrap `publish_form` so every `fail_every`-th attempt dies after its first progress update."""
+    attempts = {'count': 0}
+
+    def publish(job, progress):
+        attempts['count'] += 1
+        if attempts['count'] % fail_every:
+            return publish_form(job, progress)
+
+        def failing_progress(**fields):
+            progress(**fields)
+            raise ConnectionError('injected failure')
+        return publish_form(job, failing_progress)
+    return publish
+
+
+def run(args, workers: int, directory: str, fail_every: int = 0) -> dict:
+    fake = install_fake_google(gf, latency=args.latency, throttle_rate=args.throttle_rate)
+    queue = FormJobQueue(path=os.path.join(directory, f'jobs-{workers}-{fail_every}.sqlite3'), workers=workers,
+                         retry_delay=0.01, max_attempts=10,
+                         publish_fn=flaky_publish(fail_every) if fail_every else None).start()
+    statements = [f'Statement {index}' for index in range(args.statements)]
+
+    def submit(index):
+        started = time.perf_counter()
+        job_id = queue.submit(statements, 'folder', f'Survey {index}', 'Please respond on a scale 1-5',
+                              batch_size=args.batch_size)
+        return job_id, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.submitters) as executor:
+        submitted = list(executor.map(submit, range(args.jobs)))
+    jobs = [queue.wait(job_id) for job_id, _ in submitted]
+    elapsed = time.perf_counter() - started
+    queue.stop()
+
+    forms = [form for form in fake.forms_store.values() if form['info'].get('title', '').startswith('Survey')]
+    submit_latency = sorted(latency for _, latency in submitted)
+    return {
+        'workers': workers,
+        'fail_every': fail_every,
+        'seconds': elapsed,
+        'jobs_per_second': args.jobs / elapsed,
+        'submit_p50_ms': 1000 * statistics.median(submit_latency),
+        'submit_p99_ms': 1000 * submit_latency[min(len(submit_latency) - 1, int(len(submit_latency) * 0.99))],
+        'done': sum(job['status'] == 'done' for job in jobs),
+        'failed': sum(job['status'] == 'failed' for job in jobs),
+        'attempts': sum(job['attempts'] for job in jobs),
+        'forms_created': len(forms),
+        'duplicated_questions': sum(max(0, question_count(form) - args.statements) for form in forms),
+        'api_calls': fake.total_calls(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--submitters', type=int, default=32, help='threads submitting jobs at once')
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=4, help='questions per batchUpdate, for finer progress')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--fail-every', type=int, default=3, help='fail every n-th attempt in the retry run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run(args, workers, directory) for workers in args.workers]
+        results.append(run(args, max(args.workers), directory, fail_every=args.fail_every))
+    print(json.dumps({'settings': vars(args), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Measure p50/p99 latency of the generation client against the local fake OpenAI server.
+
+The fake server adds a latency tail and transient errors, and the same
+workload is run with and without hedged requests. The client is sized for
+`--concurrency` calls and, with hedging, adds a connection per call for the
+hedge, so hedges never queue behind the calls they back up. Run from the
+repository root:
+
+    python -m benchmarks.bench_generation_client --calls 200 --tail-latency 2 --tail-probability 0.05 --hedge-after 0.5
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+
+from benchmarks.fake_openai_server import FakeOpenAIServer
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-fake')
+os.environ['GENERATION_CACHE_PATH'] = ''
+
+import langchain_helper as lch  # noqa: E402
+
+
+def run(args, hedge_after) -> dict:
+    server = FakeOpenAIServer(latency=args.latency, tail_latency=args.tail_latency,
+                              tail_probability=args.tail_probability, error_rate=args.error_rate,
+                              error_status=args.error_status).start()
+    client = lch.GenerationClient(base_url=server.base_url, timeout=args.timeout, hedge_after=hedge_after,
+                                  max_connections=args.concurrency)
+    inputs = {'goal': 'Assess Market Demand', 'industry': 'Automotive', 'product': 'EV'}
+    failures = 0
+
+    def call(_):
+        nonlocal failures
+        try:
+            client.invoke(inputs)
+        except Exception:
+            failures += 1
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(call, range(args.calls)))
+    server.stop()
+    return dict(client.latency_percentiles(), failures=failures, server_requests=server.requests, **client.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--tail-latency', type=float, default=1.5)
+    parser.add_argument('--tail-probability', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--hedge-after', type=float, default=0.3)
+    args = parser.parse_args()
+    print(json.dumps({
+        'settings': vars(args),
+        'without_hedging': run(args, None),
+        'with_hedging': run(args, args.hedge_after),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
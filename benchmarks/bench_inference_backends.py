@@ -0,0 +1,99 @@
+"""
+Compare translator inference backends on a fixed statement set.
+
+For every backend the script reports load time, latency and throughput, and
+a quality score against the baseline translations (chrF, character n-gram
+F-score, 100 = identical). The baseline is the fp32 eager model with the
+model's own generation settings, as the original `generate()` call used;
+`--beams` and `--max-new-tokens` apply only to the compared runs. Run from
+the repository root:
+
+    python -m benchmarks.bench_inference_backends --backends eager int8 onnx --threads 4
+"""
+import argparse
+from collections import Counter
+import json
+import time
+
+import translator_helper as lang_helper
+
+QUALITY_STATEMENTS = [
+    "I am satisfied with the overall quality of the product.",
+    "The price of the product is reasonable for the features it offers.",
+    "I would recommend this product to my friends and family.",
+    "The product meets my expectations in terms of performance.",
+    "Customer service was helpful when I had a problem.",
+    "The brand is one I trust.",
+    "The product is easy to use without reading the manual.",
+    "I am likely to buy from this brand again.",
+    "The advertising made me aware of features I did not know about.",
+    "Compared with competitors, this product offers better value for money.",
+]
+
+
+def chrf(hypothesis: str, reference: str, order: int = 6, beta: float = 2.0) -> float:
+    """Character n-gram F-score between two strings, from 0 to 100."""
+    scores = []
+    for n in range(1, order + 1):
+        hyp = Counter(hypothesis[i:i + n] for i in range(len(hypothesis) - n + 1))
+        ref = Counter(reference[i:i + n] for i in range(len(reference) - n + 1))
+        if not hyp or not ref:
+            continue
+        overlap = sum((hyp & ref).values())
+        precision, recall = overlap / sum(hyp.values()), overlap / sum(ref.values())
+        if precision + recall:
+            scores.append((1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall))
+        else:
+            scores.append(0.0)
+    return 100 * sum(scores) / len(scores) if scores else 100.0 * (hypothesis == reference)
+
+
+def run_backend(backend: str, args, baseline: bool = False) -> dict:
+    lang_helper.set_inference_profile(backend=backend, num_threads=args.threads,
+                                      num_beams=None if baseline else args.beams,
+                                      max_new_tokens=None if baseline else args.max_new_tokens)
+    started = time.perf_counter()
+    lang_helper.get_translator()
+    load_seconds = time.perf_counter() - started
+
+    # warm-up, then keep the best of several runs
+    outputs = lang_helper._generate_translations(QUALITY_STATEMENTS, args.language)
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        lang_helper._generate_translations(QUALITY_STATEMENTS, args.language)
+        latencies.append(time.perf_counter() - started)
+    best = min(latencies)
+    return {
+        'backend': 'baseline' if baseline else backend,
+        'load_seconds': load_seconds,
+        'batch_seconds': best,
+        'statements_per_second': len(QUALITY_STATEMENTS) / best,
+        'outputs': outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--backends', nargs='+', default=['eager', 'int8'], choices=lang_helper.INFERENCE_BACKENDS)
+    parser.add_argument('--language', default='de_DE')
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--beams', type=int, default=None)
+    parser.add_argument('--max-new-tokens', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # the unchanged fp32 eager path is both the quality reference and the latency baseline
+    results = [run_backend('eager', args, baseline=True)]
+    results += [run_backend(backend, args) for backend in args.backends]
+    reference = results[0]
+    for result in results:
+        scores = [chrf(hyp, ref) for hyp, ref in zip(result['outputs'], reference['outputs'])]
+        result['chrf_vs_baseline'] = sum(scores) / len(scores)
+        result['exact_match_vs_baseline'] = sum(hyp == ref for hyp, ref in zip(result['outputs'], reference['outputs'])) / len(scores)
+        result['speedup_vs_baseline'] = reference['batch_seconds'] / result['batch_seconds']
+    print(json.dumps({'settings': vars(args), 'results': results}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Multi-target translation with one encoder pass versus one translation call per language.
+
+Translates the same statements into K languages, once with K calls to
+`translate_survey_questions` and once with a single `translate_to_languages`
+call, which encodes the English input once and decodes every (statement,
+language) pair in shared batches. The translation cache is disabled, so both
+sides run the model for every pair. The script reports the wall time of both,
+the speed-up, and the share of translations that are identical. Run from the
+repository root:
+
+    python -m benchmarks.bench_multi_target --languages 1 5 20 --statements 50
+    TRANSLATOR_MODEL=.tiny_translator python -m benchmarks.bench_multi_target
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ['TRANSLATION_CACHE_PATH'] = ''
+os.environ['TRANSLATION_CACHE_ITEMS'] = '0'
+
+from benchmarks.fake_openai_server import STATEMENTS  # noqa: E402
+
+import translator_helper as lang_helper  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--languages', type=int, nargs='+', default=[1, 5, 20], help='numbers of target languages')
+    parser.add_argument('--statements', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    codes = [code for code in dict.fromkeys(lang_helper.language_codes.values()) if code != 'en_XX']
+    statements = [f'{STATEMENTS[index % len(STATEMENTS)]} ({index})' for index in range(args.statements)]
+    lang_helper.get_translator()
+    # one untimed call, so lazy initialisation is not charged to the first run
+    lang_helper.translate_survey_questions(statements[:1], codes[0])
+
+    results = []
+    for count in args.languages:
+        target_lngs = codes[:count]
+        separate_seconds = multi_seconds = 0.0
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            separate = {target_lng: lang_helper.translate_survey_questions(statements, target_lng)
+                        for target_lng in target_lngs}
+            separate_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            multi = lang_helper.translate_to_languages(statements, target_lngs)
+            multi_seconds += time.perf_counter() - started
+        identical = sum(separate[target_lng][index] == multi[target_lng][index]
+                        for target_lng in target_lngs for index in range(len(statements)))
+        results.append({
+            'languages': count,
+            'separate_seconds': separate_seconds / args.repeat,
+            'multi_seconds': multi_seconds / args.repeat,
+            'speedup': separate_seconds / multi_seconds,
+            'identical': identical / (len(statements) * count),
+        })
+    print(json.dumps({'settings': vars(args), 'model': lang_helper.MODEL_NAME, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
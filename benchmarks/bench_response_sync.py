@@ -0,0 +1,97 @@
+"""
+Full and incremental response syncs, and vectorized scoring, against the fake Forms service.
+
+Creates a form on the fake service, fills it with a large synthetic response
+set, syncs it, adds more responses and syncs again, then checks that the
+incremental store scores the same as a fresh full sync. Run from the
+repository root:
+
+    python -m benchmarks.bench_response_sync --responses 50000 --new-responses 2000 --questions 10
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fake_google import install_fake_google
+
+import google_form_helper as gf
+
+
+def naive_summary(responses: list) -> dict:
+    """Per-question means computed with plain Python, as a reference for the vectorized scores."""
+    totals = {}
+    for response in responses:
+        for question_id, answer in response['answers'].items():
+            value = int(answer['textAnswers']['answers'][0]['value'])
+            count, total = totals.get(question_id, (0, 0))
+            totals[question_id] = (count + 1, total + value)
+    return {question_id: total / count for question_id, (count, total) in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--responses', type=int, default=50000)
+    parser.add_argument('--new-responses', type=int, default=2000)
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every fake API call')
+    args = parser.parse_args()
+
+    fake = install_fake_google(gf, latency=args.latency)
+    form = gf.google_form_generator([f'Statement {index}' for index in range(args.questions)],
+                                    'folder', 'Survey', 'Please respond on a scale 1-5')
+    form_id = form['formId']
+    fake.add_synthetic_responses(form_id, args.responses)
+
+    calls = fake.calls['forms.responses.list']
+    started = time.perf_counter()
+    store = gf.sync_form_responses(form_id, store=gf.ResponseStore.from_form(form), page_size=args.page_size)
+    full_seconds = time.perf_counter() - started
+    full_calls = fake.calls['forms.responses.list'] - calls
+
+    fake.add_synthetic_responses(form_id, args.new_responses, seed=1)
+    calls = fake.calls['forms.responses.list']
+    started = time.perf_counter()
+    gf.sync_form_responses(form_id, store=store, page_size=args.page_size)
+    incremental_seconds = time.perf_counter() - started
+    incremental_calls = fake.calls['forms.responses.list'] - calls
+
+    started = time.perf_counter()
+    summary = store.summary()
+    vectorized_seconds = time.perf_counter() - started
+    responses = fake.responses_store[form_id]
+    started = time.perf_counter()
+    reference = naive_summary(responses)
+    naive_seconds = time.perf_counter() - started
+
+    # the incremental store must match a fresh full sync and the reference means
+    fresh = gf.sync_form_responses(form_id, page_size=args.page_size)
+    consistent = (len(store) == len(fresh) == len(responses)
+                  and all(np.isclose(summary[question_id]['mean'], reference[question_id]) for question_id in reference)
+                  and fresh.summary() == {question_id: summary[question_id] for question_id in fresh.question_ids})
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'responses.npz')
+        store.save(path)
+        stored_bytes = os.path.getsize(path)
+        reloaded = gf.ResponseStore.load(path)
+        consistent = consistent and reloaded.summary() == summary and reloaded.last_submitted == store.last_submitted
+
+    print(json.dumps({
+        'settings': vars(args),
+        'full_sync': {'seconds': full_seconds, 'list_calls': full_calls, 'responses': args.responses},
+        'incremental_sync': {'seconds': incremental_seconds, 'list_calls': incremental_calls,
+                             'responses': len(store) - args.responses},
+        'scoring': {'vectorized_seconds': vectorized_seconds, 'naive_means_seconds': naive_seconds},
+        'answer_array_bytes': int(store.answers[:, :len(store)].nbytes),
+        'saved_bytes': stored_bytes,
+        'consistent': bool(consistent),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
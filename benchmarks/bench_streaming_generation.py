@@ -0,0 +1,73 @@
+"""
+Compare time-to-first-statement and total latency of the blocking and streaming flows.
+
+The blocking flow is the original one: wait for the whole completion, parse
+it, then translate. The streaming flow submits every statement to the
+translation server as soon as its line is complete. Needs `OPENAI_API_KEY`
+(or an OpenAI-compatible endpoint in `OPENAI_API_BASE`). Run from the
+repository root:
+
+    python -m benchmarks.bench_streaming_generation --language es_XX --repeat 3
+"""
+import argparse
+import json
+import statistics
+import time
+
+import langchain_helper as lch
+import translator_helper as lang_helper
+from translation_server import get_translation_server
+
+GOAL = "Assess Market Demand"
+INDUSTRY = "Automotive"
+PRODUCT = "Ford Mustang Mach-E electric SUV"
+
+
+def blocking_flow(language: str) -> dict:
+    started = time.perf_counter()
+    statements = lch.generate_survey_statements(GOAL, INDUSTRY, PRODUCT, regenerate=True).statements
+    first = time.perf_counter() - started
+    if language != 'en_XX':
+        statements = lang_helper.translate_survey_questions(statements, language)
+        first = time.perf_counter() - started
+    return {'first_statement_seconds': first, 'total_seconds': time.perf_counter() - started}
+
+
+def streaming_flow(language: str) -> dict:
+    started = time.perf_counter()
+    first = None
+    futures = []
+    server = get_translation_server()
+    for statement in lch.stream_survey_statements(GOAL, INDUSTRY, PRODUCT, regenerate=True):
+        if language == 'en_XX':
+            first = first or time.perf_counter() - started
+        else:
+            futures.append(server.submit([statement], language))
+    for future in futures:
+        future.result()
+        first = first or time.perf_counter() - started
+    return {'first_statement_seconds': first, 'total_seconds': time.perf_counter() - started}
+
+
+def summarize(runs: list) -> dict:
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--language', default='en_XX')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.language != 'en_XX':
+        lang_helper.get_translator()
+        # translation memory would hide the translation cost on repeated runs
+        lang_helper.translation_cache.get = lambda key, default=None: default
+
+    blocking = summarize([blocking_flow(args.language) for _ in range(args.repeat)])
+    streaming = summarize([streaming_flow(args.language) for _ in range(args.repeat)])
+    print(json.dumps({'settings': vars(args), 'blocking': blocking, 'streaming': streaming}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
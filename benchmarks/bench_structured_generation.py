@@ -0,0 +1,110 @@
+"""
+Wasted tokens, translation calls and Form items per survey: newline splitting versus structured parsing.
+
+Both flows run against the local fake OpenAI server with a model that
+misbehaves at a configurable rate. The line flow is the original one: free
+text without a token limit, split on newlines, where every line (preambles,
+blank lines, duplicates, extra statements) is translated and becomes a Form
+question. The structured flow asks for a JSON list of exactly N statements
+under a token limit, parses it with `parse_statements` and repairs only the
+missing statements. Run from the repository root:
+
+    python -m benchmarks.bench_structured_generation --surveys 100 --mess-rate 0.2
+"""
+import argparse
+import json
+import os
+import random
+
+from benchmarks.fake_openai_server import STATEMENTS, FakeOpenAIServer, fake_json_completion
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-fake')
+os.environ['GENERATION_CACHE_PATH'] = ''
+
+import langchain_helper as lch  # noqa: E402
+from statement_parser import STATEMENT_COUNT, parse_statements  # noqa: E402
+
+INPUTS = {'goal': 'Assess Market Demand', 'industry': 'Automotive', 'product': 'Ford Mustang Mach-E'}
+
+
+def messy_lines(rate: float, seed: int):
+    """Free-text completions with preambles, blank lines, duplicates and extra statements."""
+    rng = random.Random(seed)
+
+    def complete(prompt):
+        count = STATEMENT_COUNT + (rng.randint(1, 5) if rng.random() < rate else 0)
+        lines = ['Sure! Here are the survey statements for your market research:', ''] if rng.random() < rate else []
+        for index in range(count):
+            lines.append(f"{index + 1}. {STATEMENTS[index % len(STATEMENTS)].format(product='the product')}")
+            if rng.random() < rate:
+                lines.append('' if rng.random() < 0.5 else lines[-1])
+        if rng.random() < rate:
+            lines += ['', 'Feel free to adapt these statements to your target audience.']
+        return '\n'.join(lines)
+    return complete
+
+
+def messy_json(rate: float, seed: int):
+    """JSON completions where some items are empty, headings or duplicates."""
+    rng = random.Random(seed)
+
+    def complete(prompt):
+        statements = json.loads(fake_json_completion(prompt))['statements']
+        for index in range(len(statements)):
+            if rng.random() < rate:
+                statements[index] = rng.choice(['', 'Statements:', statements[index - 1]])
+        return json.dumps({'statements': statements})
+    return complete
+
+
+def line_flow(args) -> dict:
+    server = FakeOpenAIServer(completion_fn=messy_lines(args.mess_rate, args.seed)).start()
+    client = lch.GenerationClient(base_url=server.base_url, json_mode=False, max_tokens=4096)
+    totals = {'llm_calls': 0, 'completion_tokens': 0, 'wasted_tokens': 0, 'translation_calls': 0,
+              'form_items': 0, 'junk_items': 0}
+    for _ in range(args.surveys):
+        text, usage = client.generate(INPUTS)
+        items = text.strip().split('\n')
+        parsed = parse_statements(text, count=len(items))
+        totals['llm_calls'] += 1
+        totals['completion_tokens'] += usage['completion_tokens']
+        totals['wasted_tokens'] += parsed.wasted_tokens(usage['completion_tokens'])
+        totals['translation_calls'] += len(items)
+        totals['form_items'] += len(items)
+        totals['junk_items'] += len(items) - len(parsed.statements)
+    server.stop()
+    return {name: value / args.surveys for name, value in totals.items()}
+
+
+def structured_flow(args) -> dict:
+    server = FakeOpenAIServer(completion_fn=messy_json(args.mess_rate, args.seed)).start()
+    lch._generation_client = lch.GenerationClient(base_url=server.base_url)
+    short = 0
+    for _ in range(args.surveys):
+        result = lch.generate_survey_statements(**INPUTS, regenerate=True)
+        short += len(result.statements) < STATEMENT_COUNT
+    server.stop()
+    stats = lch.get_statement_stats()
+    return {
+        'llm_calls': server.requests / args.surveys,
+        'completion_tokens': stats['completion_tokens'] / args.surveys,
+        'wasted_tokens': stats['wasted_tokens_per_survey'],
+        'translation_calls': stats['statements_per_survey'],
+        'form_items': stats['statements_per_survey'],
+        'repair_calls': stats['repair_calls'] / args.surveys,
+        'short_surveys': short,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--surveys', type=int, default=50)
+    parser.add_argument('--mess-rate', type=float, default=0.2, help='chance of each kind of malformed output')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps({'settings': vars(args), 'statements_requested': STATEMENT_COUNT,
+                      'line_split': line_flow(args), 'structured': structured_flow(args)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the length-bucketed translation engine with the original single-batch call.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_translation_batching --language es_XX --repeat 3
+"""
+import argparse
+import json
+import random
+import time
+
+import translator_helper as lang_helper
+
+SHORT_STATEMENTS = [
+    "The price is fair.",
+    "I would recommend this product to a friend.",
+    "The brand feels trustworthy.",
+    "Charging the car is easy.",
+    "The design is attractive.",
+]
+LONG_STATEMENTS = [
+    "I am satisfied with the driving range of the vehicle on a single charge. "
+    "It covers my daily commute and most weekend trips without range anxiety.",
+    "The infotainment system is intuitive and responsive while driving. "
+    "Connecting my phone, choosing music and following navigation instructions all work without distraction. "
+    "I rarely need to consult the manual.",
+    "Compared with similar products from competitors, this one offers better value for money. "
+    "The features included as standard are usually sold as extras elsewhere.",
+]
+
+
+def legacy_translate(text_list: list, target_lng: str) -> list:
+    """The translation call before bucketing: one padded batch truncated at 40 tokens."""
+    model, tokenizer = lang_helper.get_translator()
+    model_inputs = tokenizer(text_list, return_tensors="pt", padding=True, truncation=True, max_length=40)
+    generated_tokens = model.generate(**model_inputs, forced_bos_token_id=tokenizer.lang_code_to_id[target_lng])
+    return tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+
+def statement_set(size: int, long_share: float, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(LONG_STATEMENTS if rng.random() < long_share else SHORT_STATEMENTS) + f" ({index})"
+            for index in range(size)]
+
+
+def timed(function, text_list, target_lng, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text_list, target_lng)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--language', default='es_XX')
+    parser.add_argument('--size', type=int, default=40)
+    parser.add_argument('--long-share', type=float, default=0.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    text_list = statement_set(args.size, args.long_share)
+    _, tokenizer = lang_helper.get_translator()
+    lengths = [len(ids) for ids in tokenizer(text_list)['input_ids']]
+
+    legacy_seconds = timed(legacy_translate, text_list, args.language, args.repeat)
+    for key in lang_helper.translation_batch_stats:
+        lang_helper.translation_batch_stats[key] = 0
+    bucketed_seconds = timed(lang_helper._generate_translations, text_list, args.language, args.repeat)
+    stats = lang_helper.translation_batch_stats
+
+    print(json.dumps({
+        'statements': len(text_list),
+        'legacy': {
+            'seconds': legacy_seconds,
+            'statements_per_second': len(text_list) / legacy_seconds,
+            'truncated': sum(length > 40 for length in lengths),
+            'padding_tokens': max(lengths) * len(lengths) - sum(lengths),
+        },
+        'bucketed': {
+            'seconds': bucketed_seconds,
+            'statements_per_second': len(text_list) / bucketed_seconds,
+            'truncated': stats['truncated'] // args.repeat,
+            'split_statements': stats['split_statements'] // args.repeat,
+            'batches': stats['batches'] // args.repeat,
+            'padding_tokens': stats['padding_tokens'] // args.repeat,
+        },
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
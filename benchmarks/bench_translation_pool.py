@@ -0,0 +1,80 @@
+"""
+Throughput scaling and per-worker memory of the multi-process translation pool.
+
+Translates the same statements into several languages with 1..N forked
+workers and reports statements per second, the speed-up over one worker and
+the resident (RSS) and proportional (PSS) memory of every worker; PSS well
+below RSS means the model pages are shared copy-on-write. The in-process
+translator with all cores is measured last, since the parent must not run
+the model before forking. Run from the repository root:
+
+    python -m benchmarks.bench_translation_pool --workers 1 2 4 8 --statements 200
+    TRANSLATOR_MODEL=.tiny_translator python -m benchmarks.bench_translation_pool
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+os.environ['TRANSLATION_CACHE_PATH'] = ''
+os.environ['TRANSLATION_CACHE_ITEMS'] = '0'
+
+from benchmarks.fake_openai_server import STATEMENTS  # noqa: E402
+
+import translator_helper as lang_helper  # noqa: E402
+from translation_pool import TranslationProcessPool, process_memory  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help='defaults to the cores divided by the workers')
+    parser.add_argument('--statements', type=int, default=100)
+    parser.add_argument('--languages', nargs='+', default=['de_DE', 'fr_XX', 'es_XX', 'it_IT'])
+    args = parser.parse_args()
+
+    # distinct statements, so nothing is deduplicated
+    statements = [f'{STATEMENTS[index % len(STATEMENTS)]} ({index})' for index in range(args.statements)]
+    jobs = {language: statements for language in args.languages}
+    total = len(statements) * len(args.languages)
+
+    started = time.perf_counter()
+    lang_helper.get_translator()
+    parent_memory = process_memory()
+    results = {'cpu_count': os.cpu_count(), 'load_seconds': time.perf_counter() - started,
+               'parent_memory_mb': parent_memory, 'pool': []}
+
+    for workers in args.workers:
+        with TranslationProcessPool(workers=workers, threads_per_worker=args.threads_per_worker) as pool:
+            # one small job first, so every worker has touched the model before memory is measured
+            pool.translate_many({language: statements[:workers] for language in args.languages})
+            started = time.perf_counter()
+            pool.translate_many(jobs)
+            elapsed = time.perf_counter() - started
+            memory = [process_memory(child.pid) for child in multiprocessing.active_children()]
+            results['pool'].append({
+                'workers': workers,
+                'threads_per_worker': pool.threads_per_worker,
+                'seconds': elapsed,
+                'statements_per_second': total / elapsed,
+                'worker_rss_mb': [round(entry['rss'], 1) for entry in memory],
+                'worker_pss_mb': [round(entry['pss'], 1) for entry in memory],
+                'worker_shared_mb': [round(entry['shared'], 1) for entry in memory],
+                'chunks': pool.stats['chunks'],
+            })
+    baseline = results['pool'][0]['statements_per_second']
+    for entry in results['pool']:
+        entry['speedup'] = entry['statements_per_second'] / baseline
+
+    started = time.perf_counter()
+    for language in args.languages:
+        lang_helper.translate_survey_questions(statements, language)
+    elapsed = time.perf_counter() - started
+    results['in_process'] = {'seconds': elapsed, 'statements_per_second': total / elapsed}
+    print(json.dumps({'settings': vars(args), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
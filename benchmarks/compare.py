@@ -0,0 +1,63 @@
+"""
+Compare two benchmark result files written by `benchmarks.run_suite`.
+
+Prints every numeric metric side by side with its relative change, and exits
+with status 1 when a metric regresses by more than `--threshold`.
+
+    python -m benchmarks.compare baseline.json bench_results.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+# metric name fragments where a larger value is better; everything else is a cost
+HIGHER_IS_BETTER = ('per_second', 'statements_per_batch')
+IGNORED = ('concurrency', 'jobs', 'languages', 'settings')
+
+
+def flatten(value, prefix: str = '') -> dict:
+    """Flatten nested results into dotted metric names; list entries are keyed by concurrency."""
+    metrics = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            metrics.update(flatten(item, f'{prefix}.{key}' if prefix else key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            label = f"c{item['concurrency']}" if isinstance(item, dict) and 'concurrency' in item else str(index)
+            metrics.update(flatten(item, f'{prefix}[{label}]'))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        metrics[prefix] = float(value)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative change counted as a regression')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+    before = flatten({'results': baseline['results'], 'memory': baseline['memory']})
+    after = flatten({'results': candidate['results'], 'memory': candidate['memory']})
+
+    print(f"baseline {baseline['meta'].get('commit', '')[:10]}  candidate {candidate['meta'].get('commit', '')[:10]}")
+    regressions = []
+    for name in sorted(set(before) & set(after)):
+        if name.rsplit('.', 1)[-1] in IGNORED:
+            continue
+        old, new = before[name], after[name]
+        change = (new - old) / old if old else 0.0
+        worse = -change if any(fragment in name for fragment in HIGHER_IS_BETTER) else change
+        flag = ''
+        if worse > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f'{name:70s} {old:12.4f} {new:12.4f} {change:+8.1%}{flag}')
+    print(f'{len(regressions)} regression(s) above {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+In-process fakes of the Google Forms and Drive clients used by `google_form_helper`.
+
+The fakes follow the `service.forms().batchUpdate(...).execute()` call shape,
+count every call, add a configurable latency and inject 429 and 500 responses, so
+form creation can be benchmarked without network access or credentials.
+"""
+from collections import Counter
+import datetime
+import itertools
+import random
+import re
+import threading
+import time
+
+import httplib2
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+
+
+# HTTP method of each fake API method; everything else is a POST
+HTTP_METHODS = {'forms.get': 'GET', 'forms.responses.list': 'GET', 'files.get': 'GET', 'files.list': 'GET',
+                'files.delete': 'DELETE', 'files.update': 'PATCH'}
+
+
+class FakeRequest:
+    def __init__(self, service, method: str, handler):
+        self.service = service
+        self.name = method
+        # same attributes as googleapiclient's HttpRequest; `methodId` is also used in trace span names
+        self.methodId = ('drive.' if method.startswith('files.') else 'forms.') + method
+        self.method = HTTP_METHODS.get(method, 'POST')
+        self.handler = handler
+
+    def execute(self, num_retries: int = 0):
+        return self.service._execute(self.name, self.handler)
+
+
+class _Collection:
+    def __init__(self, service, prefix: str, handlers: dict, children: dict = None):
+        self._service = service
+        self._prefix = prefix
+        self._handlers = handlers
+        self._children = children or {}
+
+    def __getattr__(self, name):
+        if name in self._children:
+            return self._children[name]
+        if name not in self._handlers:
+            raise AttributeError(name)
+        handler = self._handlers[name]
+        return lambda **kwargs: FakeRequest(self._service, f'{self._prefix}.{name}',
+                                            lambda: handler(**kwargs))
+
+
+class FakeGoogleService(Resource):
+    """
+    Fake Forms v1 and Drive v3 client sharing one in-memory store.
+
+    Parameters:
+    - latency (float): Seconds added to every call.
+    - throttle_rate (float): Fraction of calls answered with HTTP 429.
+    - retry_after (float): `Retry-After` seconds sent with injected 429s.
+    - applied_error_rate (float): Fraction of writes answered with HTTP 500 after
+      they were applied, as a server failing after the commit would.
+    - seed (int): Seed of the error injection.
+
+    It subclasses `Resource` so the type checks of `google_form_helper` accept it;
+    the `Resource` constructor is deliberately not called.
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 0.01,
+                 applied_error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.applied_error_rate = applied_error_rate
+        self.calls = Counter()
+        self.throttled = 0
+        self.applied_errors = 0
+        self.forms_store = {}
+        self.files_store = {}
+        self.responses_store = {}
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # -- call plumbing ---------------------------------------------------
+    def _execute(self, method: str, handler):
+        with self._lock:
+            self.calls[method] += 1
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+            failed = HTTP_METHODS.get(method, 'POST') != 'GET' and self._random.random() < self.applied_error_rate
+            if failed:
+                self.applied_errors += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            response = httplib2.Response({'status': 429, 'retry-after': str(self.retry_after)})
+            raise HttpError(response, b'{"error": {"code": 429, "message": "Rate limit exceeded"}}')
+        with self._lock:
+            result = handler()
+        if failed:
+            raise HttpError(httplib2.Response({'status': 500}), b'{"error": {"code": 500, "message": "Backend error"}}')
+        return result
+
+    def _new_id(self, prefix: str) -> str:
+        return f'{prefix}{next(self._ids)}'
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    # -- Forms -------------------------------------------------------------
+    def forms(self):
+        return _Collection(self, 'forms', {
+            'create': self._form_create,
+            'get': self._form_get,
+            'batchUpdate': self._form_batch_update,
+        }, children={
+            'responses': lambda: _Collection(self, 'forms.responses', {'list': self._responses_list}),
+        })
+
+    def _form_record(self, form_id: str, title: str = '') -> dict:
+        form = self.forms_store.get(form_id)
+        if form is None:
+            form = self.forms_store[form_id] = {'formId': form_id, 'info': {'title': title}, 'items': [],
+                                                'revisionId': '1',
+                                                'responderUri': f'https://docs.google.com/forms/d/{form_id}/viewform'}
+        return form
+
+    def _form_create(self, body: dict) -> dict:
+        form_id = self._new_id('form')
+        form = self._form_record(form_id, body.get('info', {}).get('title', ''))
+        self.files_store[form_id] = {'id': form_id, 'name': form['info']['title'], 'parents': ['root'],
+                                     'mimeType': 'application/vnd.google-apps.form', 'createdTime': self._now()}
+        return dict(form)
+
+    def _form_get(self, formId: str) -> dict:
+        return dict(self.forms_store[formId])
+
+    def _form_batch_update(self, formId: str, body: dict) -> dict:
+        form = self.forms_store[formId]
+        replies = []
+        for request in body.get('requests', []):
+            if 'updateFormInfo' in request:
+                form['info'].update(request['updateFormInfo']['info'])
+                replies.append({})
+            elif 'createItem' in request:
+                item = dict(request['createItem']['item'], itemId=self._new_id('item'))
+                item['questionItem'] = dict(item['questionItem'],
+                                            question=dict(item['questionItem']['question'],
+                                                          questionId=self._new_id('q')))
+                form['items'].insert(request['createItem']['location']['index'], item)
+                replies.append({'createItem': {'itemId': item['itemId'],
+                                               'questionId': [item['questionItem']['question']['questionId']]}})
+        form['revisionId'] = str(int(form['revisionId']) + 1)
+        response = {'replies': replies, 'writeControl': {'requiredRevisionId': form['revisionId']}}
+        if body.get('includeFormInResponse'):
+            response['form'] = dict(form)
+        return response
+
+    def _responses_list(self, formId: str, pageSize: int = 5000, pageToken: str = None, filter: str = None) -> dict:
+        responses = self.responses_store.get(formId, [])
+        if filter:
+            # only the "timestamp > <RFC3339>" and "timestamp >= <RFC3339>" filters of the Forms API are supported
+            inclusive = '>=' in filter
+            since = filter.split('>=' if inclusive else '>', 1)[1].strip()
+            responses = [response for response in responses
+                         if response['lastSubmittedTime'] > since
+                         or (inclusive and response['lastSubmittedTime'] == since)]
+        start = int(pageToken or 0)
+        page = responses[start:start + pageSize]
+        result = {'responses': page} if page else {}
+        if start + pageSize < len(responses):
+            result['nextPageToken'] = str(start + pageSize)
+        return result
+
+    def add_synthetic_responses(self, form_id: str, count: int, start: datetime.datetime = None,
+                                interval: float = 1.0, skip_rate: float = 0.02, seed: int = 0) -> list:
+        """
+        Append `count` random 1-5 responses to every question of a form, in submission order.
+
+        Parameters:
+        - form_id (str): A form created through the fake.
+        - count (int): Number of responses.
+        - start (datetime): Submission time of the first response, defaults to after the last stored one.
+        - interval (float): Seconds between consecutive submissions.
+        - skip_rate (float): Fraction of questions left unanswered.
+        - seed (int): Seed of the answers.
+
+        Returns:
+        - list: The new responses.
+        """
+        generator = random.Random(seed)
+        question_ids = [item['questionItem']['question']['questionId']
+                        for item in self.forms_store[form_id]['items'] if 'questionItem' in item]
+        stored = self.responses_store.setdefault(form_id, [])
+        if start is None:
+            start = (datetime.datetime.strptime(stored[-1]['lastSubmittedTime'], '%Y-%m-%dT%H:%M:%S.%fZ')
+                     + datetime.timedelta(seconds=interval)) if stored else datetime.datetime(2024, 1, 1)
+        # a per-question bias, so the distributions differ between questions
+        biases = {question_id: generator.uniform(-1.0, 1.0) for question_id in question_ids}
+        responses = []
+        for index in range(count):
+            submitted = (start + datetime.timedelta(seconds=index * interval)).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            answers = {}
+            for question_id in question_ids:
+                if generator.random() < skip_rate:
+                    continue
+                value = min(5, max(1, round(generator.gauss(3 + biases[question_id], 1.1))))
+                answers[question_id] = {'questionId': question_id, 'textAnswers': {'answers': [{'value': str(value)}]}}
+            responses.append({'responseId': self._new_id('response'), 'createTime': submitted,
+                              'lastSubmittedTime': submitted, 'answers': answers})
+        with self._lock:
+            stored.extend(responses)
+        return responses
+
+    # -- Drive -------------------------------------------------------------
+    def files(self):
+        return _Collection(self, 'files', {
+            'create': self._file_create,
+            'copy': self._file_copy,
+            'delete': self._file_delete,
+            'get': self._file_get,
+            'list': self._file_list,
+            'update': self._file_update,
+        })
+
+    def _file_create(self, body: dict, fields: str = None, supportsAllDrives: bool = False) -> dict:
+        file_id = self._new_id('form')
+        self.files_store[file_id] = {'id': file_id, 'name': body.get('name', ''), 'parents': body.get('parents', ['root']),
+                                     'mimeType': body.get('mimeType'), 'createdTime': self._now(),
+                                     'appProperties': dict(body.get('appProperties', {}))}
+        if body.get('mimeType') == 'application/vnd.google-apps.form':
+            self._form_record(file_id, '')
+        return {'id': file_id}
+
+    def _file_copy(self, fileId: str, body: dict, fields: str = None, supportsAllDrives: bool = False) -> dict:
+        file_id = self._new_id('form')
+        source = self.files_store[fileId]
+        self.files_store[file_id] = dict(source, id=file_id, name=body.get('name') or source['name'],
+                                         parents=body.get('parents', source['parents']), createdTime=self._now(),
+                                         appProperties=dict(body.get('appProperties', {})))
+        if fileId in self.forms_store:
+            form = self.forms_store[file_id] = dict(self.forms_store[fileId], formId=file_id)
+            form['items'] = list(form['items'])
+        return {'id': file_id}
+
+    def _file_delete(self, fileId: str, supportsAllDrives: bool = False):
+        if fileId not in self.files_store:
+            raise HttpError(httplib2.Response({'status': 404}), b'{"error": {"code": 404, "message": "File not found"}}')
+        self.files_store.pop(fileId)
+        self.forms_store.pop(fileId, None)
+        return ''
+
+    def _file_get(self, fileId: str, fields: str = None, supportsAllDrives: bool = False) -> dict:
+        return dict(self.files_store[fileId])
+
+    def _file_list(self, q: str = '', fields: str = None, pageSize: int = 100, supportsAllDrives: bool = False,
+                   includeItemsFromAllDrives: bool = False) -> dict:
+        # only the "appProperties has {...}", "name =", "mimeType =" and "createdTime >" terms are supported
+        files = list(self.files_store.values())
+        for key, value in re.findall(r"appProperties has \{ key='([^']*)' and value='([^']*)' \}", q):
+            files = [record for record in files if record.get('appProperties', {}).get(key) == value]
+        for name, value in re.findall(r"(name|mimeType) = '((?:[^'\\]|\\.)*)'", q):
+            value = re.sub(r'\\(.)', r'\1', value)
+            files = [record for record in files if record.get(name) == value]
+        for value in re.findall(r"createdTime > '([^']*)'", q):
+            files = [record for record in files if record.get('createdTime', '') > value]
+        return {'files': [{'id': record['id']} for record in files[:pageSize]]}
+
+    def _file_update(self, fileId: str, body: dict = None, addParents: str = '', removeParents: str = '',
+                     fields: str = None, supportsAllDrives: bool = False) -> dict:
+        record = self.files_store[fileId]
+        removed = set(filter(None, removeParents.split(',')))
+        record['parents'] = [parent for parent in record['parents'] if parent not in removed]
+        record['parents'] += [parent for parent in addParents.split(',') if parent]
+        record.update(body or {})
+        return {'id': fileId}
+
+
+def install_fake_google(gf_module, **kwargs) -> FakeGoogleService:
+    """
+    Route the Drive and Forms clients of `google_form_helper` to a new fake.
+
+    Parameters:
+    - gf_module (module): The imported `google_form_helper` module.
+    - **kwargs: Passed to `FakeGoogleService`.
+
+    Returns:
+    - FakeGoogleService: The fake, for inspecting call counts.
+    """
+    fake = FakeGoogleService(**kwargs)
+    gf_module.get_drive_service = lambda: fake
+    gf_module.get_forms_service = lambda: fake
+    return fake
@@ -0,0 +1,212 @@
+"""
+Local fake of the OpenAI chat completions API for offline tests and benchmarks.
+
+    python -m benchmarks.fake_openai_server --port 8765 --latency 0.2 --tail-latency 2 --tail-probability 0.05
+
+Point a client at it with `base_url=http://127.0.0.1:8765/v1` and any API key.
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+
+STATEMENTS = [
+    "I am satisfied with the overall quality of {product}.",
+    "The price of {product} is reasonable for the features it offers.",
+    "I would recommend {product} to my friends and family.",
+    "{product} meets my expectations in terms of performance.",
+    "Customer service for {product} was helpful.",
+    "I trust the brand behind {product}.",
+    "{product} is easy to use.",
+    "I am likely to buy {product} again.",
+    "The advertising for {product} is convincing.",
+    "{product} offers better value than its competitors.",
+]
+
+
+def fake_completion(prompt: str, count: int = 10) -> str:
+    """Return `count` numbered statements, one per line."""
+    product = 'the product'
+    if 'of product ' in prompt:
+        product = prompt.split('of product ', 1)[1].split('.', 1)[0].strip() or product
+    return '\n'.join(f"{index + 1}. {STATEMENTS[index % len(STATEMENTS)].format(product=product)}"
+                     for index in range(count))
+
+
+def fake_json_completion(prompt: str) -> str:
+    """Return the JSON object of statements asked for by the survey or repair prompt."""
+    product = 'the product'
+    if 'of product ' in prompt:
+        product = prompt.split('of product ', 1)[1].split('.', 1)[0].strip() or product
+    counts = re.findall(r'exactly (\d+)', prompt)
+    count = int(counts[-1]) if counts else 10
+    statements = [STATEMENTS[index % len(STATEMENTS)].format(product=product) for index in range(len(STATEMENTS))]
+    if 'replace them' in prompt:
+        # repairs must differ from the statements the survey already has
+        statements = [f'Compared with other brands, {statement[0].lower()}{statement[1:]}' for statement in statements]
+        statements = [statement for statement in statements if statement not in prompt]
+    return json.dumps({'statements': [statements[index % len(statements)] for index in range(count)]})
+
+
+def truncate_words(text: str, max_words: int) -> str:
+    """Cut a text after `max_words` words, as a completion token limit would."""
+    words = list(re.finditer(r'\S+', text))
+    return text if len(words) <= max_words else text[:words[max_words - 1].end()]
+
+
+class FakeOpenAIServer:
+    """
+    OpenAI-compatible `/v1/chat/completions` endpoint with configurable latency and errors.
+
+    Parameters:
+    - latency (float): Base response latency in seconds.
+    - tail_latency (float): Extra latency added to a fraction of requests.
+    - tail_probability (float): Fraction of requests that get the tail latency.
+    - error_rate (float): Fraction of requests answered with `error_status`.
+    - error_status (int): HTTP status of injected errors, e.g. 429 or 500.
+    - chunk_delay (float): Delay between streamed chunks.
+    - completion_fn (callable): Builds the completion text from the prompt, defaults to `fake_completion`.
+      A request's `max_tokens` cuts the completion after as many words.
+    - port (int): Port to listen on, 0 for a free port.
+
+    Example:
+    ```python
+    server = FakeOpenAIServer(latency=0.1).start()
+    client = GenerationClient(base_url=server.base_url)
+    ...
+    server.stop()
+    ```
+    """
+
+    def __init__(self, latency: float = 0.0, tail_latency: float = 0.0, tail_probability: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 429, chunk_delay: float = 0.0,
+                 completion_fn=None, port: int = 0, seed: int = 0):
+        self.latency = latency
+        self.tail_latency = tail_latency
+        self.tail_probability = tail_probability
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_delay = chunk_delay
+        self.completion_fn = completion_fn or fake_completion
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}/v1'
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _plan(self):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency
+            if self._random.random() < self.tail_probability:
+                delay += self.tail_latency
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send_json(404, {'error': {'message': 'not found', 'type': 'invalid_request_error'}})
+                    return
+                delay, failed = fake._plan()
+                time.sleep(delay)
+                if failed:
+                    self._send_json(fake.error_status, {'error': {'message': 'injected error', 'type': 'server_error'}})
+                    return
+
+                prompt = '\n'.join(str(message.get('content', '')) for message in request.get('messages', []))
+                text = fake.completion_fn(prompt)
+                if request.get('max_tokens'):
+                    text = truncate_words(text, request['max_tokens'])
+                model = request.get('model', 'fake-model')
+                usage = {'prompt_tokens': len(prompt.split()), 'completion_tokens': len(text.split()),
+                         'total_tokens': len(prompt.split()) + len(text.split())}
+                if request.get('stream'):
+                    self._stream(model, text)
+                    return
+                self._send_json(200, {
+                    'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': text}}],
+                    'usage': usage,
+                })
+
+            def _stream(self, model: str, text: str):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                pieces = [text[i:i + 8] for i in range(0, len(text), 8)] + [None]
+                for piece in pieces:
+                    delta = {'content': piece} if piece is not None else {}
+                    chunk = {'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                             'model': model, 'choices': [{'index': 0, 'delta': delta,
+                                                          'finish_reason': None if piece is not None else 'stop'}]}
+                    self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+                    self.wfile.flush()
+                    time.sleep(fake.chunk_delay)
+                self.wfile.write(b'data: [DONE]\n\n')
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--tail-latency', type=float, default=0.0)
+    parser.add_argument('--tail-probability', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=429)
+    args = parser.parse_args()
+    server = FakeOpenAIServer(latency=args.latency, tail_latency=args.tail_latency,
+                              tail_probability=args.tail_probability, error_rate=args.error_rate,
+                              error_status=args.error_status, port=args.port)
+    print(f'Fake OpenAI server listening on {server.base_url}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
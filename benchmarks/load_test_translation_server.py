@@ -0,0 +1,112 @@
+"""
+Load test of the batching translation server with N concurrent users.
+
+Every simulated user sends `--requests` translation requests of `--statements`
+statements. The baseline translates each request directly under a shared lock,
+which is how concurrent Streamlit sessions competed for the global model; the
+server run sends the same requests through `TranslationClient`. Run from the
+repository root:
+
+    python -m benchmarks.load_test_translation_server --users 1 4 16
+    python -m benchmarks.load_test_translation_server --fake-overhead 0.2 --fake-per-statement 0.01
+
+With `--fake-*` options the model is replaced by a sleep of
+`overhead + per_statement * n` per call, so the test runs without the model.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+
+import translator_helper as lang_helper
+from translation_server import TranslationClient, TranslationServer
+
+STATEMENTS = [
+    "I am satisfied with the overall quality of the product.",
+    "The price of the product is reasonable.",
+    "I would recommend this product to my friends.",
+    "The product meets my expectations.",
+    "Customer service was helpful.",
+]
+
+
+def make_translate_fn(args):
+    if args.fake_overhead is None:
+        # bypass the translation cache so every request reaches the model
+        return lang_helper._generate_translations
+
+    def fake_translate(text_list, target_lng):
+        time.sleep(args.fake_overhead + args.fake_per_statement * len(text_list))
+        return [f'{target_lng}:{text}' for text in text_list]
+    return fake_translate
+
+
+def run_users(users: int, args, translate) -> dict:
+    latencies = []
+    latencies_lock = threading.Lock()
+
+    def user(user_index):
+        for request_index in range(args.requests):
+            text_list = [f'{STATEMENTS[(user_index + i) % len(STATEMENTS)]} ({request_index})'
+                         for i in range(args.statements)]
+            started = time.perf_counter()
+            translate(text_list, args.languages[(user_index + request_index) % len(args.languages)])
+            with latencies_lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        list(executor.map(user, range(users)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    statements = users * args.requests * args.statements
+    return {
+        'seconds': elapsed,
+        'statements_per_second': statements / elapsed,
+        'p50_latency': latencies[len(latencies) // 2],
+        'p99_latency': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=3)
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--languages', nargs='+', default=['es_XX'])
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait', type=float, default=0.05)
+    parser.add_argument('--fake-overhead', type=float, default=None)
+    parser.add_argument('--fake-per-statement', type=float, default=0.01)
+    args = parser.parse_args()
+
+    translate_fn = make_translate_fn(args)
+    if args.fake_overhead is None:
+        lang_helper.get_translator()
+
+    model_lock = threading.Lock()
+    def direct(text_list, target_lng):
+        with model_lock:
+            return translate_fn(text_list, target_lng)
+
+    results = []
+    for users in args.users:
+        server = TranslationServer(translate_fn=translate_fn, max_batch_size=args.max_batch_size,
+                                   max_wait=args.max_wait, max_queue=max(256, users * 2)).start()
+        client = TranslationClient(server=server)
+        baseline = run_users(users, args, direct)
+        batched = run_users(users, args, client.translate)
+        server.stop()
+        results.append({
+            'users': users,
+            'direct': baseline,
+            'server': batched,
+            'server_stats': server.stats(),
+            'throughput_gain': batched['statements_per_second'] / baseline['statements_per_second'],
+        })
+    print(json.dumps({'settings': vars(args), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+End-to-end offline benchmark suite.
+
+Every external dependency is replaced by a local stand-in: a fake
+OpenAI-compatible server with configurable latency, fake Forms/Drive clients
+that count calls, add latency and inject 429s, and a tiny MBart-shaped
+translator built locally. The suite measures per-stage latency, API call
+counts, memory and throughput at several concurrency levels, and writes a
+JSON file that `benchmarks.compare` can diff between commits.
+
+    python -m benchmarks.run_suite --output bench_results.json
+    python -m benchmarks.compare baseline.json bench_results.json
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+# Offline configuration, set before the project modules read it
+os.environ.setdefault('OPENAI_API_KEY', 'sk-fake')
+os.environ['GENERATION_CACHE_PATH'] = ''
+os.environ['GENERATION_CACHE_ITEMS'] = '0'
+os.environ['TRANSLATION_CACHE_PATH'] = ''
+os.environ['TRANSLATION_CACHE_ITEMS'] = '0'
+os.environ['HF_HUB_OFFLINE'] = '1'
+
+from benchmarks.fake_google import install_fake_google  # noqa: E402
+from benchmarks.fake_openai_server import FakeOpenAIServer  # noqa: E402
+from benchmarks.tiny_translator import build_tiny_translator  # noqa: E402
+
+GOAL, INDUSTRY, PRODUCT = 'Assess Market Demand', 'Automotive', 'EV'
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (peak size where /proc is unavailable)."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentiles(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        'p50_seconds': statistics.median(samples),
+        'p99_seconds': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        'mean_seconds': statistics.fmean(samples),
+    }
+
+
+def timed_calls(function, count: int) -> list:
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def concurrent_throughput(function, jobs: int, concurrency: int) -> dict:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: function(), range(jobs)))
+    elapsed = time.perf_counter() - started
+    return {'concurrency': concurrency, 'jobs': jobs, 'seconds': elapsed, 'jobs_per_second': jobs / elapsed}
+
+
+def bench_generation(args) -> dict:
+    import langchain_helper as lch
+    server = FakeOpenAIServer(latency=args.openai_latency, chunk_delay=args.openai_chunk_delay).start()
+    lch._generation_client = lch.GenerationClient(base_url=server.base_url, max_connections=max(args.concurrency))
+    try:
+        latencies = timed_calls(lambda: lch.generate_survey_statements(GOAL, INDUSTRY, PRODUCT, regenerate=True),
+                                args.samples)
+        first_statement = []
+        for _ in range(args.samples):
+            started = time.perf_counter()
+            next(iter(lch.stream_survey_statements(GOAL, INDUSTRY, PRODUCT, regenerate=True)))
+            first_statement.append(time.perf_counter() - started)
+        requests_before = server.requests
+        bulk = []
+        for concurrency in args.concurrency:
+            started = time.perf_counter()
+            outputs = lch.generate_many([(GOAL, INDUSTRY, f'Product {index}') for index in range(args.products)],
+                                        max_concurrency=concurrency, regenerate=True)
+            elapsed = time.perf_counter() - started
+            bulk.append({'concurrency': concurrency, 'jobs': len(outputs), 'seconds': elapsed,
+                         'jobs_per_second': len(outputs) / elapsed})
+        return {
+            'latency': percentiles(latencies),
+            'time_to_first_statement': percentiles(first_statement),
+            'bulk_throughput': bulk,
+            'api_calls_per_survey': (server.requests - requests_before) / (args.products * len(args.concurrency)),
+        }
+    finally:
+        server.stop()
+
+
+def bench_translation(args) -> dict:
+    import translator_helper as lang_helper
+    from translation_server import TranslationClient, TranslationServer
+
+    started = time.perf_counter()
+    lang_helper.get_translator()
+    load_seconds = time.perf_counter() - started
+    statements = [f'{index}. The price of the product is reasonable.' for index in range(args.statements)]
+    latencies = timed_calls(lambda: lang_helper.translate_survey_questions(statements, 'de_DE'), args.samples)
+
+    throughput = []
+    for concurrency in args.concurrency:
+        server = TranslationServer(max_queue=max(256, 2 * concurrency)).start()
+        client = TranslationClient(server=server)
+        result = concurrent_throughput(lambda: client.translate(statements, 'de_DE'), args.products, concurrency)
+        result['statements_per_batch'] = server.stats()['statements_per_batch']
+        server.stop()
+        throughput.append(result)
+    return {
+        'load_seconds': load_seconds,
+        'latency': percentiles(latencies),
+        'server_throughput': throughput,
+        'generate_batches': lang_helper.translation_batch_stats['batches'],
+        'padding_tokens': lang_helper.translation_batch_stats['padding_tokens'],
+    }
+
+
+def bench_forms(args) -> dict:
+    import google_form_helper as gf
+    import multilingual_helper
+
+    statements = [f'Statement {index}' for index in range(args.statements)]
+    fake = install_fake_google(gf, latency=args.google_latency, throttle_rate=0.0)
+    latencies = timed_calls(lambda: gf.google_form_generator(statements, 'folder', 'Survey', 'Please respond'),
+                            args.samples)
+    calls_per_form = fake.total_calls() / args.samples
+
+    throttled = install_fake_google(gf, latency=args.google_latency, throttle_rate=args.google_throttle_rate)
+    throttled_latencies = timed_calls(lambda: gf.google_form_generator(statements, 'folder', 'Survey', 'Please respond'),
+                                      args.samples)
+
+    fan_out = []
+    languages = args.languages
+    for concurrency in args.concurrency:
+        fake = install_fake_google(gf, latency=args.google_latency, throttle_rate=args.google_throttle_rate)
+        started = time.perf_counter()
+        results = list(multilingual_helper.generate_multilingual_surveys(
+            statements, languages, folder_id='folder', form_name='Survey', form_description='Please respond',
+            max_workers=concurrency))
+        elapsed = time.perf_counter() - started
+        fan_out.append({'concurrency': concurrency, 'languages': len(languages), 'seconds': elapsed,
+                        'languages_per_second': len(languages) / elapsed,
+                        'failed': sum(result['error'] is not None for result in results),
+                        'api_calls': fake.total_calls(), 'throttled': fake.throttled})
+    return {
+        'latency': percentiles(latencies),
+        'latency_with_throttling': percentiles(throttled_latencies),
+        'api_calls_per_form': calls_per_form,
+        'throttled_calls': throttled.throttled,
+        'multilingual_fan_out': fan_out,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--stages', nargs='+', default=['generation', 'translation', 'forms'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--products', type=int, default=32)
+    parser.add_argument('--statements', type=int, default=10)
+    parser.add_argument('--languages', nargs='+', default=['de_DE', 'fr_XX', 'es_XX', 'it_IT', 'ja_XX', 'pt_XX'])
+    parser.add_argument('--openai-latency', type=float, default=0.2)
+    parser.add_argument('--openai-chunk-delay', type=float, default=0.005)
+    parser.add_argument('--google-latency', type=float, default=0.05)
+    parser.add_argument('--google-throttle-rate', type=float, default=0.05)
+    parser.add_argument('--model-dir', default='.tiny_translator')
+    args = parser.parse_args()
+
+    os.environ['TRANSLATOR_MODEL'] = build_tiny_translator(args.model_dir)
+    benches = {'generation': bench_generation, 'translation': bench_translation, 'forms': bench_forms}
+    results = {}
+    memory = {'start_rss_mb': rss_mb()}
+    for stage in args.stages:
+        started = time.perf_counter()
+        results[stage] = benches[stage](args)
+        results[stage]['wall_seconds'] = time.perf_counter() - started
+        memory[f'{stage}_rss_mb'] = rss_mb()
+    memory['peak_rss_mb'] = peak_rss_mb()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': vars(args),
+        },
+        'results': results,
+        'memory': memory,
+    }
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
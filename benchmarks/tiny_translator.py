@@ -0,0 +1,64 @@
+"""
+Build a tiny, randomly initialised MBart-50 shaped translator for offline benchmarks.
+
+The model has the same architecture, tokenizer interface and language codes
+as the production checkpoint, only with a handful of small layers, so the
+whole translation path runs without downloading anything. Its output is
+meaningless; only timings and shapes are comparable between commits.
+
+    python -m benchmarks.tiny_translator .tiny_translator
+"""
+import argparse
+import os
+import re
+
+from benchmarks.fake_openai_server import STATEMENTS
+
+SPECIAL_TOKENS = ['<s>', '<pad>', '</s>', '<unk>']
+
+
+def build_tiny_translator(directory: str, d_model: int = 64, layers: int = 2, seed: int = 0) -> str:
+    """
+    Create the tiny model and tokenizer in `directory`, unless they already exist.
+
+    Returns:
+    - str: The directory, usable as `TRANSLATOR_MODEL`.
+    """
+    if os.path.exists(os.path.join(directory, 'config.json')):
+        return directory
+
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import MBart50TokenizerFast, MBartConfig, MBartForConditionalGeneration
+
+    words = sorted({word for statement in STATEMENTS for word in re.findall(r'\w+|[^\w\s]', statement)})
+    vocab = {token: index for index, token in enumerate(SPECIAL_TOKENS + words)}
+    backend = Tokenizer(models.WordLevel(vocab=vocab, unk_token='<unk>'))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer = MBart50TokenizerFast(tokenizer_object=backend, src_lang='en_XX', model_max_length=256)
+
+    torch.manual_seed(seed)
+    config = MBartConfig(
+        vocab_size=len(tokenizer), d_model=d_model,
+        encoder_layers=layers, decoder_layers=layers,
+        encoder_attention_heads=4, decoder_attention_heads=4,
+        encoder_ffn_dim=2 * d_model, decoder_ffn_dim=2 * d_model,
+        max_position_embeddings=256, scale_embedding=True,
+        pad_token_id=tokenizer.pad_token_id, bos_token_id=0, eos_token_id=tokenizer.eos_token_id,
+        decoder_start_token_id=tokenizer.eos_token_id, forced_eos_token_id=tokenizer.eos_token_id,
+    )
+    model = MBartForConditionalGeneration(config).eval()
+    model.save_pretrained(directory)
+    tokenizer.save_pretrained(directory)
+    return directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?', default='.tiny_translator')
+    args = parser.parse_args()
+    print(build_tiny_translator(args.directory))
+
+
+if __name__ == '__main__':
+    main()
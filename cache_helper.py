@@ -0,0 +1,232 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+
+    Returns:
+    - str: The SHA-256 hex digest of the parts serialized as JSON.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory least-recently-used cache.
+
+    Parameters:
+    - max_items (int): Number of entries kept before the least recently used one is evicted.
+    - ttl (float): Seconds an entry stays valid, None to keep entries until they are evicted.
+    """
+
+    def __init__(self, max_items: int = 4096, ttl: float = None):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            value, expires = self._items[key]
+            if expires is not None and expires <= time.time():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._items[key] = (value, expires)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+# guards opening a connection; replaced in a forked child, where it may have been copied while held
+_connect_lock = threading.Lock()
+
+def _reset_connect_lock():
+    global _connect_lock
+    _connect_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_connect_lock)
+
+
+class SQLiteCache:
+    """
+    Persistent key-value cache stored in a SQLite file, bounded by size.
+
+    Parameters:
+    - path (str): Path of the SQLite database file.
+    - max_bytes (int): Total size of the stored values before the least recently used entries are evicted.
+    - ttl (float): Seconds an entry stays valid, None to keep entries until they are evicted.
+
+    Values are stored as JSON. Reads record the access time of an entry in
+    memory and write the collected times in one transaction every
+    `ACCESS_FLUSH_ITEMS` reads or on the next write, so a read does not commit.
+    The total size of the stored values is kept as a running count; once a
+    write takes it over `max_bytes`, expired entries are dropped, the total is
+    recounted (other processes may share the file), and the least recently
+    accessed entries are evicted until it is back under `max_bytes`.
+
+    The database is opened on first use, and every process opens its own
+    connection: a child forked after the parent used the cache leaves the
+    inherited connection alone, so the processes share the file safely.
+    """
+
+    # reads whose access times are collected before they are written
+    ACCESS_FLUSH_ITEMS = 256
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: float = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total = 0
+        self._accessed = {}
+        self._pid = None
+        # connections inherited through fork; kept referenced so they are never closed in the child
+        self._inherited = []
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._pid == os.getpid():
+            return self._conn
+        with _connect_lock:
+            if self._pid != os.getpid():
+                if self._conn is not None:
+                    self._inherited.append(self._conn)
+                    self._lock = threading.Lock()
+                    self._accessed = {}
+                self._conn = self._connect()
+                self._total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+                self._pid = os.getpid()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        with conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(cache)')]
+            if 'expires' not in columns:
+                conn.execute('ALTER TABLE cache ADD COLUMN expires REAL')
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+        return conn
+
+    def get(self, key: str, default=None):
+        self._connection()
+        with self._lock:
+            row = self._conn.execute('SELECT value, expires, size FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return default
+            if row[1] is not None and row[1] <= time.time():
+                with self._conn:
+                    self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._total -= row[2]
+                return default
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.ACCESS_FLUSH_ITEMS:
+                with self._conn:
+                    self._flush_accessed()
+            return json.loads(row[0])
+
+    def _flush_accessed(self):
+        if self._accessed:
+            self._conn.executemany('UPDATE cache SET accessed = ? WHERE key = ?',
+                                   [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed = {}
+
+    def set(self, key: str, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        self._connection()
+        with self._lock, self._conn:
+            previous = self._conn.execute('SELECT size FROM cache WHERE key = ?', (key,)).fetchone()
+            self._conn.execute('INSERT OR REPLACE INTO cache (key, value, size, accessed, expires) VALUES (?, ?, ?, ?, ?)',
+                               (key, payload, len(payload), now, expires))
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            self._total += len(payload) - (previous[0] if previous else 0)
+            if self._total > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        self._conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute('SELECT key, size FROM cache ORDER BY accessed').fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM cache WHERE key = ?', stale)
+        self._total = total
+
+    def __len__(self):
+        self._connection()
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+class TieredCache:
+    """
+    In-memory LRU tier in front of an optional persistent SQLite tier.
+
+    Parameters:
+    - max_items (int): Size of the in-memory tier.
+    - path (str): Path of the SQLite file, or None to keep the cache in memory only.
+    - max_bytes (int): Size bound of the SQLite tier.
+    - ttl (float): Seconds an entry stays valid in both tiers, None for no expiry.
+
+    Entries found only on disk are promoted to the memory tier on read.
+
+    Example:
+    ```python
+    cache = TieredCache(path='translation_cache.sqlite3')
+    key = make_cache_key('Hello', 'es_XX')
+    if cache.get(key) is None:
+        cache.set(key, 'Hola')
+    ```
+    """
+
+    def __init__(self, max_items: int = 4096, path: str = None, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = None):
+        self.memory = LRUCache(max_items, ttl)
+        self.disk = SQLiteCache(path, max_bytes, ttl) if path else None
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return default if value is None else value
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from instrumentation import span
+from rate_limit_helper import backoff_delay
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+
+def question_count(form: dict) -> int:
+    """Return the number of question items of a form resource."""
+    return sum('questionItem' in item for item in form.get('items', []))
+
+
+def publish_form(job: dict, progress):
+    """
+    Run the steps of a form publishing job, resuming after the last completed step.
+
+    Parameters:
+    - job (dict): The job row, see `FormJobQueue.status`.
+    - progress (callable): Called with the job fields to persist after every step.
+
+    Returns:
+    - dict: The 'formId' and 'responderUri' of the published form.
+
+    Steps are 'created' (form exists), 'relocated' (form is in the folder) and
+    'questions' (N of M questions added). Each completed step is persisted
+    through `progress`, so a retried job reuses the form it already created and
+    counts the questions already on the form before adding the rest; a retry
+    never creates a second form or duplicates questions.
+    """
+    import google_form_helper as gf
+
+    payload = job['payload']
+    forms_service = gf.get_forms_service()
+    form_id = job['form_id']
+
+    if form_id is None:
+        def on_step(step, step_form_id, mode):
+            progress(step=step, form_id=step_form_id, placement=mode)
+        form_id, _ = gf.create_form_in_folder(forms_service, payload['folder_id'], payload['form_name'],
+                                              placement=payload.get('placement', 'direct'), on_step=on_step)
+    elif job['step'] == 'created' and job['placement'] in ('move', 'copy'):
+        form_id = gf.relocate_file(form_id, target_folder_id=payload['folder_id'],
+                                   new_file_name=payload['form_name'], mode=job['placement'])
+        progress(step='relocated', form_id=form_id)
+
+    # count what an earlier attempt already added, so no question is added twice
+    form = gf.execute_request(forms_service.forms().get(formId=form_id))
+    added = question_count(form)
+    statements = payload['text_list']
+    progress(step='questions', questions_added=added)
+
+    builder = gf.FormBatchBuilder(client=forms_service, form_id=form_id,
+                                  max_requests=payload.get('batch_size') or gf.MAX_BATCH_REQUESTS)
+    if added == 0:
+        builder.add_title(payload['form_name'])
+        builder.add_description(payload['form_description'])
+    builder.next_index = added
+    for question in statements[added:]:
+        builder.add_question(question)
+
+    def on_chunk(chunk):
+        nonlocal added
+        added += sum('createItem' in request for request in chunk)
+        progress(questions_added=added)
+
+    form = builder.execute(include_form=True, on_chunk=on_chunk) if builder.requests else form
+    return {'formId': form_id, 'responderUri': form.get('responderUri')}
+
+
+class FormJobQueue:
+    """
+    Persistent background queue that publishes Google Forms with a pool of worker threads.
+
+    Parameters:
+    - path (str): SQLite file of the job table, shared by every process using it.
+    - workers (int): Number of worker threads publishing forms concurrently.
+    - max_attempts (int): Attempts per job before it is marked 'failed'.
+    - retry_delay (float): Base delay in seconds of the jittered exponential backoff between attempts.
+    - publish_fn (callable): Called as `publish_fn(job, progress)`, defaults to `publish_form`.
+    - lease (float): Seconds without progress after which a running job is
+      considered abandoned, e.g. by a crashed process, and is claimed again.
+
+    `submit` only inserts a row and returns the job ID, so callers never wait
+    for the Drive and Forms calls and can poll `status` instead. Every submit
+    gets a new job ID, so the same form can be published again later; only
+    while a job with the same inputs is still queued or running is that job
+    returned instead, so a double submit does not publish twice. Progress is written to the job row after every step, and a running
+    job whose progress stops for `lease` seconds is picked up by another worker.
+
+    Example:
+    ```python
+    jobs = FormJobQueue(workers=4).start()
+    job_id = jobs.submit(statements, folder_id, "Survey", "Please respond on a scale 1-5")
+    print(jobs.wait(job_id)['result']['responderUri'])
+    ```
+    """
+
+    def __init__(self, path: str = 'form_jobs.sqlite3', workers: int = 4, max_attempts: int = 5,
+                 retry_delay: float = 2.0, publish_fn=None, lease: float = 300.0):
+        self.path = path
+        self.lease = lease
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.publish_fn = publish_fn or publish_form
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS form_jobs ('
+                'id TEXT PRIMARY KEY, status TEXT NOT NULL, step TEXT NOT NULL, payload TEXT NOT NULL, '
+                'form_id TEXT, placement TEXT, questions_added INTEGER NOT NULL DEFAULT 0, '
+                'questions_total INTEGER NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, '
+                'not_before REAL NOT NULL, result TEXT, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS form_jobs_queued ON form_jobs (status, not_before)')
+
+    # -- submitting and polling ------------------------------------------
+    def submit(self, text_list: list, folder_id: str, form_name: str, form_description: str,
+               placement: str = 'direct', batch_size: int = None) -> str:
+        """
+        Queue a form for publishing and return its job ID; see `google_form_generator` for the arguments.
+
+        A queued or running job with the same inputs is returned instead of
+        queueing a second one; after it is done or failed, a new job is queued.
+        """
+        payload = {'text_list': list(text_list), 'folder_id': folder_id, 'form_name': form_name,
+                   'form_description': form_description, 'placement': placement, 'batch_size': batch_size}
+        payload = json.dumps(payload, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            # an immediate transaction keeps another process from queueing the same job at once
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute("SELECT id FROM form_jobs WHERE payload = ? AND status IN ('queued', 'running') "
+                                         'ORDER BY created LIMIT 1', (payload,)).fetchone()
+                job_id = row[0] if row is not None else uuid.uuid4().hex[:24]
+                if row is None:
+                    self._conn.execute(
+                        'INSERT INTO form_jobs (id, status, step, payload, questions_total, not_before, created, updated) '
+                        "VALUES (?, 'queued', 'queued', ?, ?, ?, ?, ?)",
+                        (job_id, payload, len(text_list), now, now, now))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        with self._wake:
+            self._wake.notify()
+        return job_id
+
+    def status(self, job_id: str) -> dict:
+        """
+        Return a job as a dict, or None if it does not exist.
+
+        The dict holds 'id', 'status' (one of `JOB_STATUSES`), 'step', 'questions_added',
+        'questions_total', 'attempts', 'form_id', 'placement', 'result', 'error' and 'payload'.
+        """
+        with self._lock:
+            cursor = self._conn.execute('SELECT * FROM form_jobs WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        if row is None:
+            return None
+        job = dict(zip(columns, row))
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def wait(self, job_id: str, timeout: float = None, poll_interval: float = 0.1) -> dict:
+        """Block until a job is done or failed, and return its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job['status'] in ('done', 'failed'):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f'Form job {job_id} did not finish within {timeout}s')
+            time.sleep(poll_interval)
+
+    def stats(self) -> dict:
+        """Return the number of jobs per status."""
+        with self._lock:
+            counts = dict(self._conn.execute('SELECT status, COUNT(*) FROM form_jobs GROUP BY status').fetchall())
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+    # -- workers -----------------------------------------------------------
+    def start(self) -> 'FormJobQueue':
+        if self._threads:
+            return self
+        self._stopping.clear()
+        self._threads = [threading.Thread(target=self._run, name=f'form-job-{index}', daemon=True)
+                         for index in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        self._stopping.set()
+        with self._wake:
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _update(self, job_id: str, **fields):
+        fields['updated'] = time.time()
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock:
+            self._conn.execute(f'UPDATE form_jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+
+    def _claim(self):
+        now = time.time()
+        with self._lock:
+            # an immediate transaction keeps other processes from claiming the same job
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute("SELECT id FROM form_jobs WHERE (status = 'queued' AND not_before <= ?) "
+                                         "OR (status = 'running' AND updated < ?) ORDER BY created LIMIT 1",
+                                         (now, now - self.lease)).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE form_jobs SET status = 'running', attempts = attempts + 1, "
+                                       'updated = ? WHERE id = ?', (now, row[0]))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return self.status(row[0]) if row is not None else None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                with self._wake:
+                    # other processes may queue jobs too, so poll as well
+                    self._wake.wait(timeout=0.5)
+                continue
+            self._process(job)
+
+    def _process(self, job: dict):
+        def progress(**fields):
+            job.update(fields)
+            self._update(job['id'], **fields)
+
+        with span('form.job', questions=job['questions_total'], attempt=job['attempts']) as job_span:
+            try:
+                result = self.publish_fn(job, progress)
+            except Exception as error:
+                retry = job['attempts'] < self.max_attempts and _is_retryable(error)
+                job_span.set(retried=int(retry))
+                if retry:
+                    self._update(job['id'], status='queued', error=repr(error),
+                                 not_before=time.time() + backoff_delay(job['attempts'], self.retry_delay))
+                else:
+                    self._update(job['id'], status='failed', error=repr(error))
+                return
+        self._update(job['id'], status='done', step='done', result=json.dumps(result),
+                     questions_added=job['questions_total'], error=None)
+
+
+def _is_retryable(error: Exception) -> bool:
+    from googleapiclient.errors import HttpError
+
+    import google_form_helper as gf
+    # client errors such as a missing folder will not succeed on a retry
+    return gf.is_retryable_http_error(error) if isinstance(error, HttpError) else not isinstance(error, (TypeError, ValueError))
+
+
+_form_job_queue = None
+_form_job_queue_lock = threading.Lock()
+
+def get_form_job_queue() -> FormJobQueue:
+    """
+    Return the process-wide, started `FormJobQueue`.
+
+    The job table path and the number of workers are read from the
+    `FORM_JOBS_PATH` and `FORM_JOB_WORKERS` environment variables.
+    """
+    global _form_job_queue
+    with _form_job_queue_lock:
+        if _form_job_queue is None:
+            _form_job_queue = FormJobQueue(
+                path=os.getenv('FORM_JOBS_PATH', 'form_jobs.sqlite3'),
+                workers=int(os.getenv('FORM_JOB_WORKERS', '4')),
+            ).start()
+        return _form_job_queue
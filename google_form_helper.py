@@ -1,12 +1,31 @@
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import Resource
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+import httplib2
+import numpy as np
+from contextlib import contextmanager
+import contextvars
+import datetime
+import json
 import os
+import threading
+import time
+import uuid
+
+from instrumentation import span
+from rate_limit_helper import TokenBucket, retry_with_backoff
 
 import random
 
+# Define the scopes for Google Forms and Drive APIs
+SCOPES = ['https://www.googleapis.com/auth/forms',
+          'https://www.googleapis.com/auth/drive']
+
 def get_credentials() -> Credentials:
     """
     Get Google OAuth2 credentials.
@@ -30,9 +49,7 @@ def get_credentials() -> Credentials:
     - ValueError: If the OAuth2 authentication flow fails or the credentials are invalid.
     """
     
-    # Define the scopes for Google Forms API
-    scopes = ['https://www.googleapis.com/auth/forms', 
-              'https://www.googleapis.com/auth/drive']
+    scopes = SCOPES
     creds = None
     if os.path.exists('token.json'):
         creds = Credentials.from_authorized_user_file('token.json', scopes)
@@ -46,6 +63,403 @@ def get_credentials() -> Credentials:
             token.write(creds.to_json())
     return creds
 
+# Discovery document URLs tried in order, as `googleapiclient.discovery.build` does
+DISCOVERY_URIS = ('https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest',
+                  'https://{api}.googleapis.com/$discovery/rest?version={version}')
+
+class _PooledHttp:
+    """
+    `httplib2.Http` stand-in shared by the registry's clients.
+
+    Every request checks out an `AuthorizedHttp` from the registry's pool and
+    returns it afterwards, so concurrent calls never share a connection.
+    """
+
+    def __init__(self, registry: 'GoogleClientRegistry'):
+        self._registry = registry
+
+    def request(self, *args, **kwargs):
+        http = self._registry.checkout_http()
+        try:
+            return http.request(*args, **kwargs)
+        finally:
+            self._registry.return_http(http)
+
+    def close(self):
+        self._registry.close()
+
+
+class GoogleClientRegistry:
+    """
+    Process-wide cache of Google credentials and API clients.
+
+    Parameters:
+    - refresh_margin (datetime.timedelta): Refresh the credentials this long before they expire.
+    - pool_size (int): Number of idle HTTP connections kept for reuse.
+
+    Credentials are loaded once with `get_credentials()` and refreshed in place
+    shortly before they expire, so every client built from them keeps working.
+    Discovery documents are loaded once per API, and each API gets one client
+    shared by all threads and Streamlit sessions of the process. httplib2
+    connections are not thread-safe, so the clients do not own one: every call
+    checks out an `AuthorizedHttp` from a small lock-protected pool and returns
+    it when the response has been read, which keeps connections alive across
+    calls no matter which thread makes them.
+
+    Example:
+    ```python
+    registry = get_client_registry()
+    forms_service = registry.service('forms', 'v1')
+    print(registry.stats())
+    ```
+    """
+
+    def __init__(self, refresh_margin: datetime.timedelta = datetime.timedelta(minutes=5), pool_size: int = 8):
+        self.refresh_margin = refresh_margin
+        self.pool_size = pool_size
+        self._lock = threading.RLock()
+        self._creds = None
+        self._discovery_docs = {}
+        self._clients = {}
+        self._idle_http = []
+        self._stats = {
+            'credential_loads': 0,
+            'credential_refreshes': 0,
+            'discovery_loads': 0,
+            'client_builds': 0,
+            'cache_hits': 0,
+            'http_creates': 0,
+            'http_reuses': 0,
+        }
+
+    def _needs_refresh(self, creds: Credentials) -> bool:
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        return creds.expiry - self.refresh_margin <= datetime.datetime.utcnow()
+
+    def credentials(self) -> Credentials:
+        """
+        Return the shared credentials, loading or refreshing them when needed.
+
+        Returns:
+        - Credentials: The OAuth2 credentials shared by every client of the registry.
+        """
+        with self._lock:
+            if self._creds is None:
+                self._creds = get_credentials()
+                self._stats['credential_loads'] += 1
+            elif self._needs_refresh(self._creds) and self._creds.refresh_token:
+                # refresh in place so existing connections pick up the new token
+                self._creds.refresh(Request())
+                self._stats['credential_refreshes'] += 1
+                with open('token.json', 'w') as token:
+                    token.write(self._creds.to_json())
+            return self._creds
+
+    def discovery_document(self, api: str, version: str) -> str:
+        """
+        Return the discovery document of an API, loading it once per process.
+
+        Parameters:
+        - api (str): The API name, e.g. 'forms' or 'drive'.
+        - version (str): The API version, e.g. 'v1'.
+
+        Returns:
+        - str: The discovery document accepted by `build_from_document`.
+
+        Raises:
+        - HttpError: If the document is neither bundled nor available from a discovery URL.
+        """
+        key = (api, version)
+        with self._lock:
+            document = self._discovery_docs.get(key)
+            if document is None:
+                document = get_static_doc(api, version) or self._fetch_discovery_document(api, version)
+                self._discovery_docs[key] = document
+                self._stats['discovery_loads'] += 1
+            return document
+
+    @staticmethod
+    def _fetch_discovery_document(api: str, version: str) -> str:
+        # not bundled with the client library; discovery documents are public, so no credentials are needed
+        http = httplib2.Http()
+        for uri in DISCOVERY_URIS:
+            response, content = http.request(uri.format(api=api, version=version))
+            if response.status < 400:
+                return content.decode('utf-8') if isinstance(content, bytes) else content
+        raise HttpError(response, content, uri=uri)
+
+    def service(self, api: str, version: str) -> Resource:
+        """
+        Return the process-wide client for an API.
+
+        Parameters:
+        - api (str): The API name, e.g. 'forms' or 'drive'.
+        - version (str): The API version, e.g. 'v1'.
+
+        Returns:
+        - Resource: An authorized client whose calls use pooled HTTP connections.
+        """
+        self.credentials()
+        with self._lock:
+            client = self._clients.get((api, version))
+            if client is not None:
+                self._stats['cache_hits'] += 1
+                return client
+            client = build_from_document(self.discovery_document(api, version), http=_PooledHttp(self))
+            self._clients[(api, version)] = client
+            self._stats['client_builds'] += 1
+            return client
+
+    def checkout_http(self) -> AuthorizedHttp:
+        """Take an idle authorized connection from the pool, or create one."""
+        creds = self.credentials()
+        with self._lock:
+            if self._idle_http:
+                self._stats['http_reuses'] += 1
+                return self._idle_http.pop()
+            self._stats['http_creates'] += 1
+        return AuthorizedHttp(creds, http=httplib2.Http())
+
+    def return_http(self, http: AuthorizedHttp):
+        """Give a connection back to the pool, closing it when the pool is full."""
+        with self._lock:
+            if len(self._idle_http) < self.pool_size:
+                self._idle_http.append(http)
+                return
+        http.close()
+
+    def close(self):
+        """Close the idle pooled connections."""
+        with self._lock:
+            idle, self._idle_http = self._idle_http, []
+        for http in idle:
+            http.close()
+
+    def stats(self) -> dict:
+        """Return a copy of the cache hit, refresh and connection counters."""
+        with self._lock:
+            return dict(self._stats)
+
+
+_client_registry = None
+_client_registry_lock = threading.Lock()
+
+def get_client_registry() -> GoogleClientRegistry:
+    """
+    Return the process-wide `GoogleClientRegistry`, creating it on first use.
+    """
+    global _client_registry
+    with _client_registry_lock:
+        if _client_registry is None:
+            _client_registry = GoogleClientRegistry()
+        return _client_registry
+
+def get_drive_service() -> Resource:
+    """Return the cached, process-wide Google Drive v3 client."""
+    return get_client_registry().service('drive', 'v3')
+
+def get_forms_service() -> Resource:
+    """Return the cached, process-wide Google Forms v1 client."""
+    return get_client_registry().service('forms', 'v1')
+
+# Optional limit on Google API calls per second, shared by every thread
+api_rate_limiter = None
+# limit of the calls made inside an `api_rate_limit` block, in place of `api_rate_limiter`
+_scoped_rate_limiter = contextvars.ContextVar('google_api_rate_limiter', default=None)
+
+def make_api_rate_limiter(requests_per_second: float, burst: float = None) -> TokenBucket:
+    """
+    Return a token bucket allowing `requests_per_second` Google API calls.
+
+    Parameters:
+    - requests_per_second (float): Allowed calls per second.
+    - burst (float): Number of calls allowed in a burst (defaults to `requests_per_second`, at least 1).
+
+    Raises:
+    - ValueError: If `requests_per_second` is not positive or `burst` is below 1.
+    """
+    if burst is not None and burst < 1:
+        raise ValueError("burst must be at least 1, otherwise no call could ever be made.")
+    return TokenBucket(requests_per_second, burst)
+
+def set_api_rate_limit(requests_per_second: float = None, burst: float = None):
+    """
+    Limit the rate of all Google API calls of the process made through `execute_request`.
+
+    Parameters:
+    - requests_per_second (float): Allowed calls per second, or None to remove the limit.
+    - burst (float): Number of calls allowed in a burst (defaults to `requests_per_second`).
+
+    Use `api_rate_limit` to limit only the calls of one operation.
+    """
+    global api_rate_limiter
+    api_rate_limiter = make_api_rate_limiter(requests_per_second, burst) if requests_per_second else None
+
+@contextmanager
+def api_rate_limit(limiter: TokenBucket):
+    """
+    Use `limiter` for the Google API calls made by the calling thread inside the block.
+
+    Parameters:
+    - limiter (TokenBucket): The limit, e.g. from `make_api_rate_limiter`, shared by
+      the threads of one operation; None keeps the process-wide limit.
+
+    The previous limit is restored when the block ends, so other callers of the
+    process are not affected.
+    """
+    if limiter is None:
+        yield
+        return
+    token = _scoped_rate_limiter.set(limiter)
+    try:
+        yield
+    finally:
+        _scoped_rate_limiter.reset(token)
+
+def is_retryable_http_error(error: Exception) -> bool:
+    """Return True for Google API errors worth retrying (429 and 5xx)."""
+    if not isinstance(error, HttpError):
+        return False
+    status = int(error.resp.status)
+    return status == 429 or status >= 500
+
+def _retry_after(error: Exception):
+    value = error.resp.get('retry-after') if isinstance(error, HttpError) else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+# Requests that can be repeated without changing the outcome. Other writes, such
+# as creating a file or adding questions, may already have been applied when the
+# server answers with a 5xx, so repeating them blindly could create duplicates.
+IDEMPOTENT_HTTP_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+IDEMPOTENT_METHOD_IDS = ('drive.files.update',)
+
+def is_idempotent_request(request) -> bool:
+    """Return True if a Google API request is safe to send again."""
+    return (str(getattr(request, 'method', 'POST')).upper() in IDEMPOTENT_HTTP_METHODS
+            or getattr(request, 'methodId', None) in IDEMPOTENT_METHOD_IDS)
+
+def execute_request(request, max_retries: int = 5, idempotent: bool = None, landed=None):
+    """
+    Execute a Google API request with rate limiting and exponential backoff.
+
+    Parameters:
+    - request (HttpRequest): The request built from a Google API client.
+    - max_retries (int): Maximum number of retries on 429 and 5xx responses.
+    - idempotent (bool): Whether the request is safe to repeat, see `is_idempotent_request` for the default.
+    - landed (callable): For requests that are not idempotent, called before a retry
+      to check whether the failed attempt was applied anyway. Returns the result
+      to use in that case, or None to send the request again.
+
+    Returns:
+    - dict: The response of the request.
+
+    Every attempt takes a token from the `api_rate_limit` limit of the calling
+    thread, or from `api_rate_limiter` when a process-wide limit is set.
+    Responses with status 429 are always retried with jittered exponential
+    backoff, honouring the `Retry-After` header when the server sends one,
+    since a throttled request is rejected before it runs. 5xx responses are
+    retried for idempotent requests, and for other requests only when `landed`
+    is given and reports that the failed attempt left nothing behind.
+
+    Each call is traced as a 'google.<method id>' span with its retry count.
+
+    Raises:
+    - HttpError: If the request fails with a non-retryable status or runs out of retries.
+    """
+    if idempotent is None:
+        idempotent = is_idempotent_request(request)
+    # set after a failure that may have been applied, so the next attempt checks first
+    state = {'check_landed': False, 'failed': False}
+
+    def attempt():
+        if state['check_landed']:
+            result = landed()
+            if result is not None:
+                return result
+        limiter = _scoped_rate_limiter.get() or api_rate_limiter
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return request.execute()
+        except HttpError as error:
+            status = int(error.resp.status)
+            if status == 404 and state['failed'] and str(getattr(request, 'method', '')).upper() == 'DELETE':
+                # the failed attempt deleted it already
+                return ''
+            state['failed'] = state['failed'] or status >= 500
+            state['check_landed'] = not idempotent and status != 429
+            raise
+
+    def is_retryable(error):
+        if not is_retryable_http_error(error):
+            return False
+        return idempotent or int(error.resp.status) == 429 or landed is not None
+
+    with span('google.' + getattr(request, 'methodId', 'request'), retries=0) as request_span:
+        def on_retry(attempt_number, error, delay):
+            request_span.set(retries=attempt_number + 1, status=int(error.resp.status))
+
+        return retry_with_backoff(attempt, is_retryable=is_retryable,
+                                  max_retries=max_retries, retry_after=_retry_after, on_retry=on_retry)
+
+# Drive app property that tags a created or copied file, so a retry can find it
+CREATE_TOKEN_PROPERTY = 'mraCreateToken'
+
+def _quote_query(value: str) -> str:
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def find_file(query: str) -> dict:
+    """
+    Return the first Drive file matching a search query, or None.
+
+    Parameters:
+    - query (str): A Drive `files.list` query, e.g. "name = 'Survey' and trashed = false".
+
+    Returns:
+    - dict | None: The 'id' of the file.
+    """
+    service = get_drive_service()
+    files = execute_request(service.files().list(q=query, fields='files(id)', pageSize=1,
+                                                 supportsAllDrives=True, includeItemsFromAllDrives=True,
+                                                 )).get('files', [])
+    return {'id': files[0]['id']} if files else None
+
+def create_form(forms_service: Resource, title: str) -> dict:
+    """
+    Create an empty Google Form in the root of My Drive with the Forms API.
+
+    Parameters:
+    - forms_service (Resource): The Google Forms client.
+    - title (str): The title of the form, also used as its Drive file name.
+
+    Returns:
+    - dict: The created form resource.
+
+    The Forms API takes no request ID, so after a failed response the form is
+    looked up in Drive by its title and a creation time after the first
+    attempt before the request is sent again.
+    """
+    # allow for clock skew between this machine and Drive
+    since = (datetime.datetime.utcnow() - datetime.timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%S')
+
+    def landed():
+        found = find_file(f"name = {_quote_query(title)} and mimeType = 'application/vnd.google-apps.form' "
+                          f"and createdTime > '{since}' and trashed = false")
+        return {'formId': found['id']} if found else None
+
+    return execute_request(forms_service.forms().create(body={"info": {"title": title}}), landed=landed)
+
+def find_tagged_file(token: str) -> dict:
+    """Return the file created with the `CREATE_TOKEN_PROPERTY` app property `token`, or None."""
+    return find_file(f"appProperties has {{ key='{CREATE_TOKEN_PROPERTY}' and value={_quote_query(token)} }} "
+                     "and trashed = false")
+
 def copy_file(file_id: str, destination_folder_id: str, new_name: str = ''):
     """
     Copy a file to a destination folder in Google Drive and optionally rename it.
@@ -70,20 +484,22 @@ def copy_file(file_id: str, destination_folder_id: str, new_name: str = ''):
     ```
     """
     
-    creds = get_credentials()
+    # the copy is tagged, so a retry after a failed response can find a copy that was made anyway
+    token = uuid.uuid4().hex
     file_metadata = {
         'parents': [destination_folder_id],
-        'name': new_name
+        'name': new_name,
+        'appProperties': {CREATE_TOKEN_PROPERTY: token},
     }
     if new_name:
         file_metadata['name'] = new_name
     
-    service = build('drive', 'v3', credentials=creds)
-    file = service.files().copy(fileId=file_id,
+    service = get_drive_service()
+    file = execute_request(service.files().copy(fileId=file_id,
                                 body=file_metadata,
                                 fields='id',
                                 supportsAllDrives=True, 
-                            ).execute()
+                            ), landed=lambda: find_tagged_file(token))
     
     return file.get('id')
 
@@ -105,14 +521,92 @@ def delete_file(file_id:str):
     ```
     """
    
-    creds = get_credentials()
-    service = build('drive', 'v3', credentials=creds)
-    service.files().delete(fileId=file_id, supportsAllDrives=True).execute()
+    service = get_drive_service()
+    execute_request(service.files().delete(fileId=file_id, supportsAllDrives=True))
 
     
           
 
-def relocate_file(file_id: str, target_folder_id: str, new_file_name: str):
+def move_file(file_id: str, target_folder_id: str, new_name: str = '', previous_parents: list = None):
+    """
+    Move a file to a target folder in Google Drive in place and optionally rename it.
+
+    Parameters:
+    - file_id (str): The ID of the file to be moved.
+    - target_folder_id (str): The ID of the target folder.
+    - new_name (str): The new name for the file (optional).
+    - previous_parents (list): The current parent folder IDs (optional, looked up when missing).
+
+    Returns:
+    - str: The ID of the moved file, which is the same as `file_id`.
+
+    Unlike `relocate_file(mode='copy')`, this changes the parents and the name of
+    the file with a single metadata update, so nothing is copied and the file
+    keeps its ID.
+
+    Example:
+    ```python
+    file_id = move_file(file_id="your_file_id_here",
+                        target_folder_id="your_target_folder_id_here",
+                        new_name="new_file_name_here")
+    ```
+    """
+
+    service = get_drive_service()
+    if previous_parents is None:
+        previous_parents = execute_request(service.files().get(fileId=file_id,
+                                               fields='parents',
+                                               supportsAllDrives=True,
+                                               )).get('parents', [])
+    file_metadata = {}
+    if new_name:
+        file_metadata['name'] = new_name
+
+    file = execute_request(service.files().update(fileId=file_id,
+                                  body=file_metadata,
+                                  addParents=target_folder_id,
+                                  removeParents=','.join(previous_parents),
+                                  fields='id',
+                                  supportsAllDrives=True,
+                                  ))
+    return file.get('id')
+
+def create_form_file(folder_id: str, form_name: str) -> str:
+    """
+    Create an empty Google Form directly inside a Google Drive folder.
+
+    Parameters:
+    - folder_id (str): The ID of the folder where the Google Form will be created.
+    - form_name (str): The name of the Google Form file.
+
+    Returns:
+    - str: The ID of the new form, usable with the Forms API.
+
+    The Drive file name is set here; the form title shown to respondents is set
+    separately through the Forms API.
+
+    Example:
+    ```python
+    form_id = create_form_file(folder_id="your_folder_id_here", form_name="Survey Form")
+    ```
+    """
+
+    service = get_drive_service()
+    # the file is tagged, so a retry after a failed response can find a form that was created anyway
+    token = uuid.uuid4().hex
+    file_metadata = {
+        'name': form_name,
+        'mimeType': 'application/vnd.google-apps.form',
+        'parents': [folder_id],
+        'appProperties': {CREATE_TOKEN_PROPERTY: token},
+    }
+    file = execute_request(service.files().create(body=file_metadata,
+                                  fields='id',
+                                  supportsAllDrives=True,
+                                  ), landed=lambda: find_tagged_file(token))
+    return file.get('id')
+
+def relocate_file(file_id: str, target_folder_id: str, new_file_name: str, mode: str = 'move'):
     """
     Relocate a file to a target folder in Google Drive and optionally rename it.
 
@@ -120,13 +614,14 @@ def relocate_file(file_id: str, target_folder_id: str, new_file_name: str):
     - file_id (str): The ID of the file to be relocated.
     - target_folder_id (str): The ID of the target folder where the file will be moved.
     - new_file_name (str): The new name for the file after relocation (optional).
+    - mode (str): 'move' to update the parents in place, 'copy' to copy the file and delete the original.
 
     Returns:
-    - str: The ID of the newly relocated file.
+    - str: The ID of the relocated file.
 
-    This function copies the specified file to the target folder in Google Drive and optionally
-    renames it with the provided new file name. After copying, the original file is deleted,
-    and the ID of the newly relocated file is returned.
+    With `mode='move'` the file keeps its ID and only its metadata is updated.
+    With `mode='copy'` the file is copied to the target folder and optionally
+    renamed, the original file is deleted, and the ID of the copy is returned.
 
     Example:
     ```python
@@ -134,13 +629,319 @@ def relocate_file(file_id: str, target_folder_id: str, new_file_name: str):
                                  target_folder_id="your_target_folder_id_here",
                                  new_file_name="new_file_name_here")
     ```
+
+    Raises:
+    - ValueError: If `mode` is not 'move' or 'copy'.
     """
 
+    if mode == 'move':
+        return move_file(file_id, target_folder_id=target_folder_id, new_name=new_file_name)
+    if mode != 'copy':
+        raise ValueError(f"Unknown relocation mode: {mode!r}")
     new_file_id = copy_file(file_id= file_id, destination_folder_id= target_folder_id, new_name= new_file_name)
     delete_file(file_id)
     return new_file_id
 
 
+# Number of forms and total seconds spent placing them into their folder, per placement mode
+placement_timings = {mode: {'count': 0, 'total_seconds': 0.0} for mode in ('direct', 'move', 'copy')}
+_placement_timings_lock = threading.Lock()
+
+def record_placement_timing(mode: str, seconds: float):
+    """Record how long it took to place a form into its folder with `mode`."""
+    with _placement_timings_lock:
+        placement_timings[mode]['count'] += 1
+        placement_timings[mode]['total_seconds'] += seconds
+
+def placement_timing_summary() -> dict:
+    """
+    Summarize form placement timings per mode.
+
+    Returns:
+    - dict: For each mode used so far, the number of forms and the mean seconds.
+
+    Only running totals are kept, so the memory use does not grow with the
+    number of forms. `benchmarks/bench_form_placement.py` times every mode on
+    the same workload to compare them.
+    """
+    with _placement_timings_lock:
+        return {mode: {'count': totals['count'], 'mean_seconds': totals['total_seconds'] / totals['count']}
+                for mode, totals in placement_timings.items() if totals['count']}
+
+def create_form_in_folder(forms_service: Resource, folder_id: str, form_name: str,
+                          placement: str = 'direct', on_step=None) -> tuple:
+    """
+    Create a new Google Form and place it in a Google Drive folder.
+
+    Parameters:
+    - forms_service (Resource): The Google Forms client.
+    - folder_id (str): The ID of the folder where the Google Form will be placed.
+    - form_name (str): The name and title of the Google Form.
+    - placement (str): The preferred placement mode: 'direct', 'move' or 'copy'.
+    - on_step (callable): Optional, called as `on_step(step, form_id, mode)` with the
+      steps 'created' and 'relocated', e.g. to record progress.
+
+    Returns:
+    - tuple: The form ID and the mode that was actually used.
+
+    'direct' creates the form inside the folder through the Drive API. 'move'
+    creates it with the Forms API and moves it in place. 'copy' copies it into
+    the folder and deletes the original. If the direct creation fails with an
+    `HttpError` the form is created with the Forms API instead. A form is
+    created only once: if moving it fails, the same form is copied into the
+    folder, and if that fails too the error is raised after 'created' was
+    reported, so the caller can retry the placement of that form.
+    Each placement is timed with `record_placement_timing`.
+
+    Raises:
+    - HttpError: If the form could not be created, or could not be placed in the folder.
+    - ValueError: If `placement` is not a known mode; no form is created then.
+    """
+
+    if placement not in ('direct', 'move', 'copy'):
+        raise ValueError(f"Unknown placement mode: {placement!r}")
+    started = time.perf_counter()
+    if placement == 'direct':
+        try:
+            form_id = create_form_file(folder_id, form_name)
+        except HttpError:
+            placement = 'move'
+        else:
+            if on_step:
+                on_step('created', form_id, 'direct')
+            record_placement_timing('direct', time.perf_counter() - started)
+            if on_step:
+                on_step('relocated', form_id, 'direct')
+            return form_id, 'direct'
+
+    modes = ['move', 'copy']
+    created_id = create_form(forms_service, form_name)["formId"]
+    if on_step:
+        on_step('created', created_id, placement)
+    for mode in modes[modes.index(placement):]:
+        try:
+            form_id = relocate_file(created_id, target_folder_id=folder_id,
+                                    new_file_name=form_name, mode=mode)
+        except HttpError:
+            if mode == modes[-1]:
+                raise
+            continue
+        record_placement_timing(mode, time.perf_counter() - started)
+        if on_step:
+            on_step('relocated', form_id, mode)
+        return form_id, mode
+
+
+# Forms API does not publish a hard cap on batchUpdate size, but very large
+# bodies are rejected, so split the collected requests into chunks.
+MAX_BATCH_REQUESTS = 100
+MAX_BATCH_BYTES = 512 * 1024
+
+
+def question_item_request(question: str, question_index: int) -> dict:
+    """
+    Build a `createItem` request for a 1-5 scale question.
+
+    Parameters:
+    - question (str): The text of the question to add.
+    - question_index (int): The index at which to add the question in the form.
+
+    Returns:
+    - dict: A single request entry for a Forms `batchUpdate` body.
+    """
+
+    return {
+        "createItem": {
+            "item": {
+                "title": question,
+                "questionItem": {
+                    "question": {
+                        "required": True,
+                        "choiceQuestion": {
+                            "type": "RADIO",
+                            "options": [
+                                {"value": "1"},
+                                {"value": "2"},
+                                {"value": "3"},
+                                {"value": "4"},
+                                {"value": "5"}
+                            ]
+                        }
+                    }
+                }
+            },
+            "location": {"index": question_index},
+        }
+    }
+
+
+def form_description_request(description: str) -> dict:
+    """
+    Build an `updateFormInfo` request that sets the form description.
+
+    Parameters:
+    - description (str): The description to add to the Google Form.
+
+    Returns:
+    - dict: A single request entry for a Forms `batchUpdate` body.
+    """
+
+    return {
+        "updateFormInfo": {
+            "info": {
+                "description": (
+                description
+                ),
+            },
+            "updateMask": "description",
+        }
+    }
+
+
+def form_title_request(title: str) -> dict:
+    """
+    Build an `updateFormInfo` request that sets the form title.
+
+    Parameters:
+    - title (str): The title shown to respondents.
+
+    Returns:
+    - dict: A single request entry for a Forms `batchUpdate` body.
+    """
+
+    return {
+        "updateFormInfo": {
+            "info": {"title": title},
+            "updateMask": "title",
+        }
+    }
+
+
+class FormBatchBuilder:
+    """
+    Collect Forms API requests and send them as few `batchUpdate` calls as possible.
+
+    Parameters:
+    - client (Resource): The Google Forms client obtained from `build('forms', 'v1', credentials=creds)`.
+    - form_id (str): The ID of the Google Form to update.
+    - max_requests (int): Maximum number of requests per `batchUpdate` call.
+    - max_bytes (int): Maximum serialized size of a single `batchUpdate` body.
+
+    Requests are queued with `add_description`, `add_question` or `add_request`
+    and sent by `execute`. When the queue exceeds `max_requests` or `max_bytes`
+    it is split into consecutive chunks; requests keep their order, so item
+    indices stay valid across chunks. The last chunk asks the API to include the
+    updated form in its response, which is returned instead of re-fetching it.
+
+    Example:
+    ```python
+    forms_service = build('forms', 'v1', credentials=creds)
+    builder = FormBatchBuilder(client=forms_service, form_id="your_form_id_here")
+    builder.add_description("Please respond on a scale 1-5")
+    for question in ["Question 1?", "Question 2?"]:
+        builder.add_question(question)
+    form = builder.execute()
+    ```
+
+    Raises:
+    - TypeError: If the `client` parameter is not of type `Resource`.
+    """
+
+    def __init__(self, client: Resource, form_id: str,
+                 max_requests: int = MAX_BATCH_REQUESTS, max_bytes: int = MAX_BATCH_BYTES):
+        # Validate the client parameter
+        if not isinstance(client, Resource):
+            raise TypeError("The client parameter must be of type googleapiclient.discovery.Resource.")
+        self.client = client
+        self.form_id = form_id
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.requests = []
+        self.next_index = 0
+        self.batch_calls = 0
+
+    def add_request(self, request: dict) -> "FormBatchBuilder":
+        """Queue a raw Forms API request entry."""
+        self.requests.append(request)
+        return self
+
+    def add_title(self, title: str) -> "FormBatchBuilder":
+        """Queue an update of the form title."""
+        return self.add_request(form_title_request(title))
+
+    def add_description(self, description: str) -> "FormBatchBuilder":
+        """Queue an update of the form description."""
+        return self.add_request(form_description_request(description))
+
+    def add_question(self, question: str, question_index: int = None) -> "FormBatchBuilder":
+        """Queue a 1-5 scale question, appended after the previous one by default."""
+        if question_index is None:
+            question_index = self.next_index
+        self.next_index = question_index + 1
+        return self.add_request(question_item_request(question, question_index))
+
+    def chunks(self) -> list:
+        """Split the queued requests into chunks that respect the size limits."""
+        chunks = []
+        current = []
+        current_bytes = 0
+        for request in self.requests:
+            size = len(json.dumps(request))
+            if current and (len(current) >= self.max_requests or current_bytes + size > self.max_bytes):
+                chunks.append(current)
+                current = []
+                current_bytes = 0
+            current.append(request)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _items_landed(self, creates: list) -> dict:
+        form = execute_request(self.client.forms().get(formId=self.form_id))
+        items = form.get('items', [])
+        for create in creates:
+            index = create['location']['index']
+            if index >= len(items) or items[index].get('title') != create['item']['title']:
+                return None
+        return {'form': form}
+
+    def execute(self, include_form: bool = True, on_chunk=None) -> dict:
+        """
+        Send the queued requests and clear the queue.
+
+        Parameters:
+        - include_form (bool): Return the updated form from the last batch response.
+        - on_chunk (callable): Optional, called with each chunk of requests once it has been applied.
+
+        Returns:
+        - dict: The form resource if `include_form` is set, otherwise the last batch response.
+        """
+        chunks = self.chunks()
+        response = {}
+        for position, chunk in enumerate(chunks):
+            body = {"requests": chunk}
+            if include_form and position == len(chunks) - 1:
+                body["includeFormInResponse"] = True
+            creates = [request['createItem'] for request in chunk if 'createItem' in request]
+            # a batch is applied as a whole, so it landed if its new items are in place
+            response = execute_request(
+                self.client.forms()
+                .batchUpdate(formId=self.form_id, body=body),
+                idempotent=not creates,
+                landed=(lambda creates=creates: self._items_landed(creates)) if creates else None,
+            )
+            self.batch_calls += 1
+            if on_chunk:
+                on_chunk(chunk)
+        self.requests = []
+        if include_form:
+            if not chunks:
+                return execute_request(self.client.forms().get(formId=self.form_id))
+            return response.get("form", response)
+        return response
+
+
 def add_question_to_form(client: Resource, question: str, question_index: int, formId: str) -> None:
     """
     Add a question to a Google Form.
@@ -156,7 +957,8 @@ def add_question_to_form(client: Resource, question: str, question_index: int, f
 
     This function adds a new question to a Google Form specified by its ID. The question
     is added at the specified index in the form's list of questions. The question type is
-    set to "RADIO" with options ranging from 1 to 5.
+    set to "RADIO" with options ranging from 1 to 5. Use `FormBatchBuilder` to add
+    several questions in a single request.
 
     Example:
     ```python
@@ -171,46 +973,10 @@ def add_question_to_form(client: Resource, question: str, question_index: int, f
     - TypeError: If the `client` parameter is not of type `Resource`.
     """
 
-    # Validate the client parameter
-    if not isinstance(client, Resource):
-        raise TypeError("The client parameter must be of type googleapiclient.discovery.Resource.")
-
-    # Construct the request body to add the question
-    new_question = {
-        "requests": [
-            {
-                "createItem": {
-                    "item": {
-                        "title": question,
-                        "questionItem": {
-                            "question": {
-                                "required": True,
-                                "choiceQuestion": {
-                                    "type": "RADIO",
-                                    "options": [
-                                        {"value": "1"},
-                                        {"value": "2"},
-                                        {"value": "3"},
-                                        {"value": "4"},
-                                        {"value": "5"}
-                                    ]
-                                }
-                            }
-                        }
-                    },
-                    "location": {"index": question_index},
-                }
-            }
-        ]
-    }
+    builder = FormBatchBuilder(client=client, form_id=formId)
+    builder.add_question(question, question_index)
+    builder.execute(include_form=False)
 
-    # Update the form with the new question
-    question_setting = (
-        client.forms()
-        .batchUpdate(formId=formId, body=new_question)
-        .execute()
-    )
-        
 def add_form_description(client: Resource, form_id: str, description: str):
     """
     Add a description to a Google Form.
@@ -237,34 +1003,13 @@ def add_form_description(client: Resource, form_id: str, description: str):
     - TypeError: If the `client` parameter is not of type `Resource`.
     """
 
-    # Validate the client parameter
-    if not isinstance(client, Resource):
-        raise TypeError("The client parameter must be of type googleapiclient.discovery.Resource.")
-    
-    # Request body to add description to a Form
-    update = {
-        "requests": [
-            {
-                "updateFormInfo": {
-                    "info": {
-                        "description": (
-                        description
-                        ),
-                    },
-                    "updateMask": "description",
-                }
-            }
-        ]
-    }
-    # Update the form with a description
-    update_description = (
-        client.forms()
-        .batchUpdate(formId=form_id, body=update)
-        .execute()
-    )
+    builder = FormBatchBuilder(client=client, form_id=form_id)
+    builder.add_description(description)
+    builder.execute(include_form=False)
 
 
-def google_form_generator(text_list: list, folder_id: str, form_name: str, form_description: str):
+def google_form_generator(text_list: list, folder_id: str, form_name: str, form_description: str,
+                          placement: str = 'direct'):
     
     """
     Generate a Google Form based on raw text input.
@@ -274,14 +1019,16 @@ def google_form_generator(text_list: list, folder_id: str, form_name: str, form_
     - folder_id (str): The ID of the folder where the Google Form will be placed.
     - form_name (str): The name of the Google Form.
     - form_description (str): The description of the Google Form.
+    - placement (str): How the form is placed in the folder, see `create_form_in_folder`.
 
     Returns:
-    - None
+    - dict: The created Google Form resource.
 
     This function generates a new Google Form based on the provided raw text. It splits
     the raw text into individual questions/statements and creates a new Google Form with
-    the specified name and description. The form is then relocated to the target folder
-    specified by its ID. Finally, each question/statement is added to the form.
+    the specified name and description directly in the target folder specified by its ID,
+    falling back to moving or copying it there. Finally, the description and every question/statement are added
+    to the form with a single `batchUpdate` call.
 
     Example:
     ```python
@@ -298,37 +1045,237 @@ def google_form_generator(text_list: list, folder_id: str, form_name: str, form_
     - HttpError: If there is an issue creating the form, relocating it, or adding questions to it.
     """
     
-    # Authenticate and create a service
-    creds = get_credentials()
-    forms_service = build('forms', 'v1', credentials=creds)
+    with span('form.generate', questions=len(text_list)) as form_span:
+        # Reuse the cached, authenticated service
+        forms_service = get_forms_service()
 
-    # Create a new Google Form
-    createResult = forms_service.forms().create(
-        body={
-        "info": {
-        "title": form_name,
-    }}
-    ).execute()
-    
-    # get form id
-    form_id = createResult["formId"]
-
-    # relocate to target folder
-    form_id = relocate_file(form_id, target_folder_id=folder_id, new_file_name= form_name)
-    # add description
-    add_form_description(client= forms_service, form_id= form_id, description= form_description)
- 
-    # add questions/statements
-    for index, question in enumerate(text_list):
-        # print(question)
-        add_question_to_form(client=forms_service, question=question, formId=form_id, question_index = index)
-
-     # Print the result to see it now has a video
-    result = forms_service.forms().get(formId=form_id).execute()
-    # print(result)
-    print("Survey Form created successfully.")
+        # Create a new Google Form in the target folder
+        form_id, placement_mode = create_form_in_folder(forms_service, folder_id, form_name, placement=placement)
+
+        # add title, description and questions/statements in a single batch
+        builder = FormBatchBuilder(client=forms_service, form_id=form_id)
+        if placement_mode == 'direct':
+            builder.add_title(form_name)
+        builder.add_description(form_description)
+        for question in text_list:
+            builder.add_question(question)
+
+        # the batch response already holds the updated form
+        result = builder.execute()
+        form_span.set(placement=placement_mode, batch_calls=builder.batch_calls)
     return result
 
+# Answers are stored as uint8 scale points; 0 marks a missing or non-numeric answer
+SCALE_POINTS = 5
+MISSING_ANSWER = 0
+
+class ResponseStore:
+    """
+    Columnar store of the 1-5 answers of one Google Form.
+
+    Parameters:
+    - question_ids (list): Optional question IDs, in form order; unseen IDs are added as responses arrive.
+    - capacity (int): Initial number of response rows allocated per question.
+
+    Answers are kept in a single `uint8` array with one contiguous row per
+    question ID and one column per response, grown by doubling. Responses are
+    identified by their response ID, so an edited response overwrites its
+    previous answers instead of being counted twice. `last_submitted` holds the
+    newest submission timestamp seen, which `sync_form_responses` uses to fetch
+    only newer responses.
+
+    Example:
+    ```python
+    store = sync_form_responses(form_id)
+    # later: fetch only the responses submitted since the last sync
+    store = sync_form_responses(form_id, store=store)
+    print(store.summary())
+    ```
+    """
+
+    def __init__(self, question_ids: list = None, capacity: int = 1024):
+        self.question_ids = []
+        self._question_rows = {}
+        self.response_ids = []
+        self._response_columns = {}
+        self.last_submitted = None
+        self.answers = np.zeros((0, max(capacity, 1)), dtype=np.uint8)
+        for question_id in question_ids or []:
+            self._question_row(question_id)
+
+    @classmethod
+    def from_form(cls, form: dict, capacity: int = 1024) -> 'ResponseStore':
+        """Create an empty store with the question IDs of a form resource, in form order."""
+        question_ids = [item['questionItem']['question']['questionId']
+                        for item in form.get('items', []) if 'questionItem' in item]
+        return cls(question_ids, capacity)
+
+    def __len__(self) -> int:
+        return len(self.response_ids)
+
+    def _question_row(self, question_id: str) -> int:
+        row = self._question_rows.get(question_id)
+        if row is None:
+            row = self._question_rows[question_id] = len(self.question_ids)
+            self.question_ids.append(question_id)
+            self.answers = np.vstack([self.answers, np.zeros((1, self.answers.shape[1]), dtype=np.uint8)])
+        return row
+
+    def _response_column(self, response_id: str) -> int:
+        column = self._response_columns.get(response_id)
+        if column is None:
+            column = self._response_columns[response_id] = len(self.response_ids)
+            self.response_ids.append(response_id)
+            if column >= self.answers.shape[1]:
+                grown = np.zeros((self.answers.shape[0], 2 * self.answers.shape[1]), dtype=np.uint8)
+                grown[:, :column] = self.answers[:, :column]
+                self.answers = grown
+        return column
+
+    def add_responses(self, responses: list) -> int:
+        """
+        Add or update responses as returned by `forms().responses().list`.
+
+        Returns:
+        - int: The number of responses that were not in the store yet.
+        """
+        known = len(self.response_ids)
+        columns, rows, cols, points = [], [], [], []
+        for response in responses:
+            column = self._response_column(response['responseId'])
+            columns.append(column)
+            for question_id, answer in response.get('answers', {}).items():
+                values = answer.get('textAnswers', {}).get('answers', [])
+                value = values[0].get('value', '') if values else ''
+                rows.append(self._question_row(question_id))
+                cols.append(column)
+                points.append(int(value) if value.isdigit() and 1 <= int(value) <= SCALE_POINTS else MISSING_ANSWER)
+            submitted = response.get('lastSubmittedTime')
+            if submitted and (self.last_submitted is None or submitted > self.last_submitted):
+                self.last_submitted = submitted
+        # clear edited responses, then write the whole page at once
+        self.answers[:, columns] = MISSING_ANSWER
+        self.answers[rows, cols] = points
+        return len(self.response_ids) - known
+
+    def column(self, question_id: str) -> np.ndarray:
+        """Return the answers to one question as a read-only view, 0 where unanswered."""
+        view = self.answers[self._question_rows[question_id], :len(self.response_ids)]
+        view.flags.writeable = False
+        return view
+
+    def distributions(self) -> np.ndarray:
+        """
+        Count the answers per scale point for every question.
+
+        Returns:
+        - np.ndarray: A (questions, SCALE_POINTS) array; row i belongs to `question_ids[i]`.
+        """
+        answers = self.answers[:, :len(self.response_ids)].astype(np.intp)
+        # offset every question's answers into its own range, then count them all in one pass
+        offsets = answers + (np.arange(len(self.question_ids)) * (SCALE_POINTS + 1))[:, None]
+        counts = np.bincount(offsets.ravel(), minlength=len(self.question_ids) * (SCALE_POINTS + 1))
+        return counts.reshape(len(self.question_ids), SCALE_POINTS + 1)[:, 1:]
+
+    def means(self, distributions: np.ndarray = None) -> np.ndarray:
+        """Return the mean answer per question, NaN for questions without answers."""
+        distributions = self.distributions() if distributions is None else distributions
+        answered = distributions.sum(axis=1)
+        totals = distributions @ np.arange(1, SCALE_POINTS + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(answered > 0, totals / answered, np.nan)
+
+    def top_box(self, boxes: int = 1, distributions: np.ndarray = None) -> np.ndarray:
+        """Return the share of answers in the top `boxes` scale points per question, NaN without answers."""
+        distributions = self.distributions() if distributions is None else distributions
+        answered = distributions.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(answered > 0, distributions[:, -boxes:].sum(axis=1) / answered, np.nan)
+
+    def summary(self) -> dict:
+        """
+        Return per-question scores keyed by question ID.
+
+        Returns:
+        - dict: 'responses', 'distribution' (counts of 1..5), 'mean', 'top_box' and 'top_2_box' per question.
+        """
+        distributions = self.distributions()
+        means = self.means(distributions)
+        top_box = self.top_box(1, distributions)
+        top_2_box = self.top_box(2, distributions)
+        return {
+            question_id: {
+                'responses': int(distributions[row].sum()),
+                'distribution': distributions[row].tolist(),
+                'mean': float(means[row]),
+                'top_box': float(top_box[row]),
+                'top_2_box': float(top_2_box[row]),
+            }
+            for row, question_id in enumerate(self.question_ids)
+        }
+
+    def save(self, path: str):
+        """Write the store to a compressed `.npz` file, so incremental syncs survive restarts."""
+        np.savez_compressed(path, answers=self.answers[:, :len(self.response_ids)],
+                            question_ids=np.array(self.question_ids, dtype=str),
+                            response_ids=np.array(self.response_ids, dtype=str),
+                            last_submitted=np.array(self.last_submitted or '', dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> 'ResponseStore':
+        """Read a store written by `save`."""
+        with np.load(path) as data:
+            store = cls(data['question_ids'].tolist(), capacity=max(len(data['response_ids']), 1))
+            store.response_ids = data['response_ids'].tolist()
+            store._response_columns = {response_id: column for column, response_id in enumerate(store.response_ids)}
+            store.answers[:, :len(store.response_ids)] = data['answers']
+            store.last_submitted = str(data['last_submitted']) or None
+        return store
+
+
+def sync_form_responses(form_id: str, store: ResponseStore = None, page_size: int = 5000,
+                        forms_service: Resource = None) -> ResponseStore:
+    """
+    Fetch the responses of a Google Form into a `ResponseStore`.
+
+    Parameters:
+    - form_id (str): The ID of the Google Form.
+    - store (ResponseStore): A store from an earlier sync; only responses submitted
+      since its `last_submitted` timestamp are fetched. None starts a new store.
+    - page_size (int): Responses per `responses.list` page (the API allows up to 5000).
+    - forms_service (Resource): The Forms client, defaults to `get_forms_service()`.
+
+    Returns:
+    - ResponseStore: The updated store.
+
+    The filter includes the last seen timestamp itself (`>=`), so responses
+    submitted in the same instant as the previous sync are not missed; they are
+    matched by response ID and not counted twice.
+
+    Raises:
+    - HttpError: If listing the responses fails.
+    """
+    forms_service = forms_service or get_forms_service()
+    store = store if store is not None else ResponseStore()
+    request = {'formId': form_id, 'pageSize': page_size}
+    if store.last_submitted:
+        request['filter'] = f'timestamp >= {store.last_submitted}'
+
+    with span('form.responses.sync', page_size=page_size) as sync_span:
+        pages = fetched = added = 0
+        while True:
+            page = execute_request(forms_service.forms().responses().list(**request))
+            responses = page.get('responses', [])
+            pages += 1
+            fetched += len(responses)
+            added += store.add_responses(responses)
+            if not page.get('nextPageToken'):
+                break
+            request['pageToken'] = page['nextPageToken']
+        sync_span.set(pages=pages, fetched=fetched, added=added)
+    return store
+
+
 if __name__ == "__main__":
     # Generate a random number between 1 and 1000
     # random_number = random.randint(1, 1000)
@@ -0,0 +1,255 @@
+"""
+Lightweight tracing and metrics for the survey pipeline.
+
+Stages are wrapped in `span(name, **attributes)`. When instrumentation is
+enabled every span records its duration in a Prometheus histogram, adds its
+numeric attributes (token counts, batch sizes, retries, ...) to per-stage
+counters, and is optionally appended to a JSON lines trace log. When it is
+disabled, `span` returns a shared no-op object, so the cost is one function
+call and a flag check.
+
+Configuration comes from `configure(...)` or the environment:
+- MRA_TRACING=1 enables instrumentation
+- MRA_TRACE_LOG=path writes one JSON object per finished span
+- MRA_METRICS_PORT=9100 serves Prometheus metrics on http://host:port/metrics
+"""
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+import uuid
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+_trace_log = None
+_metrics_server = None
+_lock = threading.Lock()
+_current_span = ContextVar('current_span', default=None)
+
+# stage -> [bucket counts..., +Inf count, sum]
+_durations = {}
+# (stage, attribute) -> running total of a numeric attribute
+_attribute_totals = {}
+# (stage, status) -> number of spans
+_span_counts = {}
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed pipeline stage; use `set(**attributes)` to attach attributes before it ends."""
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent = None
+        self.trace_id = None
+        self.start = None
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.trace_id = self.parent.trace_id if self.parent else uuid.uuid4().hex
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        _record(self, 'error' if exc_type is not None else 'ok')
+        return False
+
+
+def span(name: str, **attributes):
+    """
+    Time a pipeline stage.
+
+    Parameters:
+    - name (str): The stage name, e.g. 'llm.call' or 'translate.generate'.
+    - **attributes: Attributes of the span; numeric ones are also summed per stage.
+
+    Returns:
+    - A context manager yielding the span, or a no-op object when instrumentation is disabled.
+
+    Example:
+    ```python
+    with span('translate.generate', batch_size=len(batch)) as current:
+        outputs = model.generate(**inputs)
+        current.set(output_tokens=int(outputs.numel()))
+    ```
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+
+def record_span(name: str, seconds: float, **attributes):
+    """
+    Record a stage that was timed by the caller, e.g. one spanning the yields of a generator.
+
+    Parameters:
+    - name (str): The stage name.
+    - seconds (float): The measured duration.
+    - **attributes: Attributes of the span.
+    """
+    if not _enabled:
+        return
+    current = Span(name, attributes)
+    current.parent = _current_span.get()
+    current.trace_id = current.parent.trace_id if current.parent else uuid.uuid4().hex
+    current.start = time.time() - seconds
+    current.duration = seconds
+    _record(current, 'ok')
+
+
+def traced(name: str):
+    """Decorator form of `span` for whole functions."""
+    def decorator(function):
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+    return decorator
+
+
+def _record(current: Span, status: str):
+    with _lock:
+        histogram = _durations.setdefault(current.name, [0] * (len(DURATION_BUCKETS) + 1) + [0.0])
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if current.duration <= bound:
+                histogram[index] += 1
+        histogram[len(DURATION_BUCKETS)] += 1
+        histogram[-1] += current.duration
+        _span_counts[(current.name, status)] = _span_counts.get((current.name, status), 0) + 1
+        for key, value in current.attributes.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                _attribute_totals[(current.name, key)] = _attribute_totals.get((current.name, key), 0) + value
+        if _trace_log is not None:
+            _trace_log.write(json.dumps({
+                'trace_id': current.trace_id, 'span_id': current.span_id,
+                'parent_id': current.parent.span_id if current.parent else None,
+                'name': current.name, 'start': current.start, 'duration': current.duration,
+                'status': status, 'attributes': current.attributes,
+            }, default=str) + '\n')
+            _trace_log.flush()
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_metrics() -> str:
+    """
+    Return all metrics in the Prometheus text exposition format.
+    """
+    lines = ['# HELP mra_stage_duration_seconds Duration of pipeline stages.',
+             '# TYPE mra_stage_duration_seconds histogram']
+    with _lock:
+        for stage, histogram in sorted(_durations.items()):
+            for index, bound in enumerate(DURATION_BUCKETS):
+                lines.append(f'mra_stage_duration_seconds_bucket{{stage="{_label(stage)}",le="{bound}"}} {histogram[index]}')
+            count = histogram[len(DURATION_BUCKETS)]
+            lines.append(f'mra_stage_duration_seconds_bucket{{stage="{_label(stage)}",le="+Inf"}} {count}')
+            lines.append(f'mra_stage_duration_seconds_sum{{stage="{_label(stage)}"}} {histogram[-1]}')
+            lines.append(f'mra_stage_duration_seconds_count{{stage="{_label(stage)}"}} {count}')
+        lines += ['# HELP mra_stage_spans_total Finished spans per stage and status.',
+                  '# TYPE mra_stage_spans_total counter']
+        for (stage, status), count in sorted(_span_counts.items()):
+            lines.append(f'mra_stage_spans_total{{stage="{_label(stage)}",status="{status}"}} {count}')
+        lines += ['# HELP mra_stage_attribute_total Sum of numeric span attributes per stage.',
+                  '# TYPE mra_stage_attribute_total counter']
+        for (stage, attribute), total in sorted(_attribute_totals.items()):
+            lines.append(f'mra_stage_attribute_total{{stage="{_label(stage)}",attribute="{_label(attribute)}"}} {total}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, host: str = '0.0.0.0'):
+    """
+    Serve `/metrics` on a background thread; only the first call per process starts a server.
+    """
+    global _metrics_server
+    with _lock:
+        if _metrics_server is not None:
+            return _metrics_server
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        _metrics_server.daemon_threads = True
+    threading.Thread(target=_metrics_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _metrics_server
+
+
+def configure(enabled: bool = True, trace_log: str = None, metrics_port: int = None):
+    """
+    Enable or disable instrumentation.
+
+    Parameters:
+    - enabled (bool): Record spans and metrics.
+    - trace_log (str): Optional path of a JSON lines file receiving every finished span.
+    - metrics_port (int): Optional port of the Prometheus `/metrics` endpoint.
+    """
+    global _enabled, _trace_log
+    with _lock:
+        _enabled = enabled
+        if trace_log and (_trace_log is None or _trace_log.name != trace_log):
+            _trace_log = open(trace_log, 'a', encoding='utf-8')
+    if enabled and metrics_port:
+        start_metrics_server(metrics_port)
+
+
+def configure_from_env(environ=None):
+    """
+    Apply the MRA_TRACING, MRA_TRACE_LOG and MRA_METRICS_PORT settings.
+
+    Parameters:
+    - environ (dict): Settings to read, defaults to `os.environ`.
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get('MRA_TRACING', '0') not in ('1', 'true', 'yes'):
+        return
+    port = environ.get('MRA_METRICS_PORT')
+    configure(enabled=True, trace_log=environ.get('MRA_TRACE_LOG') or None,
+              metrics_port=int(port) if port else None)
+
+
+configure_from_env()
@@ -1,15 +1,549 @@
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import deque
+from dataclasses import dataclass, field
+import asyncio
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_openai import ChatOpenAI
+import httpx
+import json
+import openai
+import os
+import random
+import threading
+import time
+
+from cache_helper import TieredCache, make_cache_key
+from instrumentation import record_span, span
+from rate_limit_helper import AdaptiveConcurrency, backoff_delay, retry_with_backoff
+from statement_parser import (STATEMENT_COUNT, ParsedStatements, StatementStream, estimate_tokens,
+                              extract_items, parse_statements, statement_token_budget)
 import prompt_templates
 
 # load env variables
 load_dotenv()
 
 
-def generate_survey_statements(goal: str, industry: str, product: str):
+MODEL_NAME = "gpt-3.5-turbo-0125"
+TEMPERATURE = 0.7
+
+# Completions are cached per rendered prompt, model and temperature, and the
+# first one stored is served from then on. Every explicit regenerate adds another
+# sampled completion, up to GENERATION_VARIANTS per key, and cache hits pick one
+# of them at random, so regenerated variety is kept without paying for it again.
+GENERATION_VARIANTS = int(os.getenv('GENERATION_CACHE_VARIANTS', '3'))
+generation_cache = TieredCache(
+    max_items=int(os.getenv('GENERATION_CACHE_ITEMS', '1024')),
+    path=os.getenv('GENERATION_CACHE_PATH', 'generation_cache.sqlite3') or None,
+    max_bytes=int(os.getenv('GENERATION_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+    ttl=float(os.getenv('GENERATION_CACHE_TTL', str(7 * 24 * 3600))),
+)
+generation_cache_stats = {'hits': 0, 'misses': 0}
+_generation_cache_lock = threading.Lock()
+
+# Repair calls per survey when the completion holds fewer than STATEMENT_COUNT usable statements
+MAX_REPAIR_CALLS = int(os.getenv('GENERATION_MAX_REPAIRS', '2'))
+# Per generated survey: what the output cost, what was discarded, and how many
+# unparsed items would have been sent to translation and the form
+statement_stats = {'surveys': 0, 'statements': 0, 'unparsed_items': 0, 'completion_tokens': 0,
+                   'wasted_tokens': 0, 'discarded_items': 0, 'repaired_items': 0, 'repair_calls': 0}
+_statement_stats_lock = threading.Lock()
+
+
+def survey_prompt() -> PromptTemplate:
+    """
+    Return the prompt template used to generate survey statements.
+    """
+    return PromptTemplate(
+        input_variables=["goal","industry","product"],
+        template=prompt_templates.prompt_msg,
+        partial_variables={"count": STATEMENT_COUNT},
+    )
+
+
+def repair_prompt() -> PromptTemplate:
+    """
+    Return the prompt template that asks for replacements of malformed or missing statements.
+    """
+    return PromptTemplate(
+        input_variables=["goal","industry","product","existing","malformed","count"],
+        template=prompt_templates.repair_msg,
+    )
+
+
+# errors worth retrying or hedging against
+TRANSIENT_ERRORS = (openai.APITimeoutError, openai.APIConnectionError,
+                    openai.RateLimitError, openai.InternalServerError)
+
+
+def _token_attributes(usage: dict) -> dict:
+    """Span attributes for the token usage reported by the OpenAI API."""
+    return {name: usage[name] for name in ('prompt_tokens', 'completion_tokens', 'total_tokens') if name in usage}
+
+
+class GenerationClient:
+    """
+    Long-lived client for survey statement generation.
+
+    Parameters:
+    - model_name (str): The OpenAI chat model.
+    - temperature (float): Sampling temperature.
+    - timeout (float): Seconds allowed for a single HTTP request.
+    - deadline (float): Seconds allowed for a whole call, including retries.
+    - max_retries (int): Retries on transient errors (timeouts, connection errors, 429 and 5xx).
+    - hedge_after (float): Seconds after which a second, identical request is sent if the
+      first has not answered yet; the first answer wins. None disables hedging.
+    - base_url (str): OpenAI-compatible endpoint, defaults to the OpenAI API.
+    - max_connections (int): Number of concurrent calls the pooled HTTP connections are sized for;
+      with hedging the pool holds twice as many, so a hedge never waits for a connection.
+    - max_tokens (int): Completion token limit, defaults to `statement_token_budget()`.
+    - json_mode (bool): Ask the API for a JSON object, so the statements arrive as a parseable list.
+
+    The `ChatOpenAI` models, prompt and chain are built once and share one
+    pooled `httpx.Client`, so connections are reused across calls. The OpenAI
+    client's own retries are disabled in favour of jittered backoff bounded by
+    `deadline`: every attempt waits at most for the time left, and backoff
+    sleeps are shortened to it. Requests that lose a hedged pair or outlive the
+    deadline cannot be cancelled and are left to finish in the background.
+
+    Example:
+    ```python
+    client = GenerationClient(timeout=20, hedge_after=5)
+    text = client.invoke({'goal': 'Assess Market Demand', 'industry': 'Automotive', 'product': 'EV'})
+    print(client.latency_percentiles())
+    ```
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, temperature: float = TEMPERATURE,
+                 timeout: float = 30.0, deadline: float = 90.0, max_retries: int = 3,
+                 hedge_after: float = None, base_url: str = None, max_connections: int = 20,
+                 max_tokens: int = None, json_mode: bool = True):
+        self.model_name = model_name
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        # each call may hold a second connection for its hedge
+        pool_size = max_connections if hedge_after is None else 2 * max_connections
+        self.http_client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        llm_kwargs = {'model_name': model_name, 'temperature': temperature, 'timeout': timeout,
+                      'max_retries': 0, 'http_client': self.http_client,
+                      'max_tokens': max_tokens or statement_token_budget()}
+        if json_mode:
+            llm_kwargs['model_kwargs'] = {'response_format': {'type': 'json_object'}}
+        if base_url:
+            llm_kwargs['base_url'] = base_url
+        self.llm = ChatOpenAI(**llm_kwargs)
+        self.streaming_llm = ChatOpenAI(streaming=True, **llm_kwargs)
+        self.prompt = survey_prompt()
+        self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
+        self.repair_chain = LLMChain(llm=self.llm, prompt=repair_prompt())
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='generation')
+        self._latencies = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'retries': 0, 'hedged': 0, 'hedge_wins': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _invoke_once(self, inputs: dict, chain) -> tuple:
+        # `generate` returns the token usage that `invoke` drops
+        result = chain.generate([inputs])
+        return result.generations[0][0].text, (result.llm_output or {}).get('token_usage') or {}
+
+    def _hedged(self, call, deadline: float, discard=None):
+        """
+        Run `call` in the executor, race it against a hedge after `hedge_after` and return the first result.
+
+        Waiting stops at `deadline`. `discard` is called with the results that
+        arrive after the race was decided, e.g. to close a stream nobody reads.
+        """
+        def remaining():
+            return max(deadline - time.monotonic(), 0.0)
+
+        def discard_late(future):
+            if future.exception() is None:
+                discard(future.result())
+
+        def abandon(futures):
+            if discard is not None:
+                for future in futures:
+                    future.add_done_callback(discard_late)
+            return TimeoutError(f'No completion within the {self.deadline}s deadline')
+
+        primary = self._executor.submit(call)
+        done, _ = wait([primary], timeout=remaining() if self.hedge_after is None
+                       else min(self.hedge_after, remaining()))
+        if done:
+            return primary.result()
+        if self.hedge_after is None or not remaining():
+            raise abandon([primary])
+
+        self._count('hedged')
+        hedge = self._executor.submit(call)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise abandon(pending)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count('hedge_wins')
+                    abandon(pending | (done - {future}))
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def invoke(self, inputs: dict) -> str:
+        """
+        Generate a completion for the prompt inputs.
+
+        Parameters:
+        - inputs (dict): The 'goal', 'industry' and 'product' prompt variables.
+
+        Returns:
+        - str: The completion text.
+        """
+        return self.generate(inputs)[0]
+
+    def repair(self, inputs: dict) -> tuple:
+        """
+        Ask for replacement statements with the repair prompt; see `generate`.
+
+        Parameters:
+        - inputs (dict): The 'goal', 'industry', 'product', 'existing', 'malformed' and 'count' prompt variables.
+        """
+        return self.generate(inputs, chain=self.repair_chain)
+
+    def generate(self, inputs: dict, chain=None) -> tuple:
+        """
+        Generate a completion and return it with its token usage.
+
+        Parameters:
+        - inputs (dict): The prompt variables.
+        - chain (LLMChain): The chain to run, defaults to the survey prompt chain.
+
+        Returns:
+        - tuple: The completion text and the token usage reported by the API.
+
+        Raises:
+        - openai.OpenAIError: If the request fails with a non-transient error, or
+          transient errors persist past `max_retries` or `deadline`.
+        - TimeoutError: If no attempt answered before `deadline`.
+        """
+        started = time.monotonic()
+        deadline = started + self.deadline
+
+        def is_retryable(error):
+            return isinstance(error, TRANSIENT_ERRORS)
+
+        with span('llm.call', model=self.model_name, retries=0) as call_span:
+            def on_retry(attempt, error, delay):
+                self._count('retries')
+                call_span.set(retries=attempt + 1)
+
+            hedged = self.stats['hedged']
+            text, usage = retry_with_backoff(lambda: self._hedged(lambda: self._invoke_once(inputs, chain or self.chain),
+                                                                  deadline),
+                                             is_retryable=is_retryable, max_retries=self.max_retries,
+                                             max_delay=8.0, on_retry=on_retry, deadline=deadline)
+            call_span.set(hedged=int(self.stats['hedged'] > hedged), **_token_attributes(usage))
+        with self._lock:
+            self.stats['calls'] += 1
+            self._latencies.append(time.monotonic() - started)
+        return text, usage
+
+    async def ainvoke(self, inputs: dict) -> str:
+        """
+        Generate a completion asynchronously, bounded by `deadline`.
+
+        Retries are left to the caller, so that rate limits can also adjust its concurrency.
+
+        Returns:
+        - str: The completion text.
+        """
+        return (await self.agenerate(inputs))[0]
+
+    async def agenerate(self, inputs: dict) -> tuple:
+        """
+        Generate a completion asynchronously and return it with its token usage; see `ainvoke`.
+
+        Returns:
+        - tuple: The completion text and the token usage reported by the API.
+        """
+        started = time.monotonic()
+        with span('llm.call', model=self.model_name) as call_span:
+            result = await asyncio.wait_for(self.chain.agenerate([inputs]), timeout=self.deadline)
+            usage = (result.llm_output or {}).get('token_usage') or {}
+            call_span.set(**_token_attributes(usage))
+        with self._lock:
+            self.stats['calls'] += 1
+            self._latencies.append(time.monotonic() - started)
+        return result.generations[0][0].text, usage
+
+    def _open_stream(self, inputs: dict) -> tuple:
+        # the request is sent, and a 429 or 5xx raised, when the first chunk is read
+        chunks = (self.prompt | self.streaming_llm).stream(inputs)
+        return chunks, next(chunks, None)
+
+    def _next_chunk(self, chunks, deadline: float):
+        future = self._executor.submit(next, chunks, None)
+        done, _ = wait([future], timeout=max(deadline - time.monotonic(), 0.0))
+        if not done:
+            # the read cannot be interrupted; close the stream once it returns
+            future.add_done_callback(lambda _: chunks.close())
+            raise TimeoutError(f'Completion not finished within the {self.deadline}s deadline')
+        return future.result()
+
+    def stream(self, inputs: dict):
+        """
+        Stream a completion for the prompt inputs over the pooled connection.
+
+        Yields:
+        - str: The content of each streamed chunk.
+
+        Starting the stream follows the policy of `generate`: the request and
+        its first chunk are retried with jittered backoff on transient errors,
+        hedged after `hedge_after` and bounded by `deadline`. Once chunks have
+        been yielded the stream is not retried, but reading it stays bounded by
+        the same deadline.
+
+        Raises:
+        - openai.OpenAIError: If starting the stream fails with a non-transient error,
+          or transient errors persist past `max_retries` or `deadline`.
+        - TimeoutError: If the first chunk or the rest of the stream does not arrive before `deadline`.
+        """
+        started = time.monotonic()
+        deadline = started + self.deadline
+
+        def is_retryable(error):
+            return isinstance(error, TRANSIENT_ERRORS)
+
+        def on_retry(attempt, error, delay):
+            self._count('retries')
+
+        def close_stream(opened):
+            opened[0].close()
+
+        chunks, chunk = retry_with_backoff(lambda: self._hedged(lambda: self._open_stream(inputs), deadline,
+                                                                discard=close_stream),
+                                           is_retryable=is_retryable, max_retries=self.max_retries,
+                                           max_delay=8.0, on_retry=on_retry, deadline=deadline)
+        first_chunk_seconds, count, characters = time.monotonic() - started, 0, 0
+        # a read that overran the deadline closes the stream itself once it returns
+        reading = False
+        try:
+            while chunk is not None:
+                count += 1
+                characters += len(chunk.content)
+                yield chunk.content
+                reading = True
+                chunk = self._next_chunk(chunks, deadline)
+                reading = False
+        finally:
+            if not reading:
+                chunks.close()
+            record_span('llm.stream', time.monotonic() - started, model=self.model_name, chunks=count,
+                        completion_chars=characters, first_chunk_seconds=first_chunk_seconds)
+
+    def latency_percentiles(self) -> dict:
+        """Return the p50 and p99 latency in seconds of the recent calls."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {'count': 0, 'p50': None, 'p99': None}
+        return {
+            'count': len(latencies),
+            'p50': latencies[len(latencies) // 2],
+            'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        }
+
+
+_generation_client = None
+_generation_client_lock = threading.Lock()
+
+def get_generation_client() -> GenerationClient:
+    """
+    Return the process-wide `GenerationClient`, built on first use.
+
+    Timeouts, retries and hedging are read from the `OPENAI_TIMEOUT`,
+    `OPENAI_DEADLINE`, `OPENAI_MAX_RETRIES` and `OPENAI_HEDGE_AFTER`
+    environment variables.
+    """
+    global _generation_client
+    with _generation_client_lock:
+        if _generation_client is None:
+            hedge_after = os.getenv('OPENAI_HEDGE_AFTER')
+            _generation_client = GenerationClient(
+                timeout=float(os.getenv('OPENAI_TIMEOUT', '30')),
+                deadline=float(os.getenv('OPENAI_DEADLINE', '90')),
+                max_retries=int(os.getenv('OPENAI_MAX_RETRIES', '3')),
+                hedge_after=float(hedge_after) if hedge_after else None,
+            )
+        return _generation_client
+
+
+def generation_cache_key(goal: str, industry: str, product: str) -> str:
+    """
+    Return the generation cache key of a request: the rendered prompt, model name and temperature.
+    """
+    with span('llm.prompt_render'):
+        prompt_text = survey_prompt().format(goal=goal, industry=industry, product=product)
+    return make_cache_key(prompt_text, MODEL_NAME, TEMPERATURE)
+
+
+def cached_generation(key: str, regenerate: bool = False):
+    """
+    Return a cached completion text for `key`, or None when a new one should be generated.
+
+    Parameters:
+    - key (str): The key returned by `generation_cache_key`.
+    - regenerate (bool): Always return None, so a new completion is generated and
+      added to the cached variants.
+
+    Returns:
+    - str | None: One of the cached completions, picked at random, as soon as one is stored.
+    """
+    with _generation_cache_lock:
+        cached = [] if regenerate else generation_cache.get(key, [])
+        if cached:
+            generation_cache_stats['hits'] += 1
+            return random.choice(cached)
+        generation_cache_stats['misses'] += 1
+        return None
+
+
+def store_generation(key: str, text: str, variants: int = GENERATION_VARIANTS):
+    """
+    Add a completion text to the variants cached for `key`, keeping the newest `variants`.
+    """
+    with _generation_cache_lock:
+        cached = generation_cache.get(key, [])
+        generation_cache.set(key, (cached + [text])[-variants:])
+
+
+@dataclass
+class SurveyStatements:
+    """
+    Survey statements generated for a request.
+
+    - goal, industry, product (str): The request.
+    - statements (list): The valid, normalized and unique statements, `STATEMENT_COUNT`
+      unless the repairs ran out before enough usable ones were produced.
+    - text (str): The completion, as JSON of the final statements when served from the cache.
+    - cached (bool): Served from `generation_cache` without calling the model.
+    - completion_tokens (int): Completion tokens of the generation and repair calls.
+    - wasted_tokens (int): Estimated completion tokens spent on output that was discarded.
+    - discarded (int): Malformed, duplicated and surplus items that were dropped.
+    - repaired (int): Statements added by repair calls.
+    - repair_calls (int): Calls made to replace malformed or missing statements.
+    """
+    goal: str
+    industry: str
+    product: str
+    statements: list = field(default_factory=list)
+    text: str = ''
+    cached: bool = False
+    completion_tokens: int = 0
+    wasted_tokens: int = 0
+    discarded: int = 0
+    repaired: int = 0
+    repair_calls: int = 0
+
+    def add_parsed(self, parsed: ParsedStatements, completion_tokens: int):
+        self.statements.extend(parsed.statements)
+        self.completion_tokens += completion_tokens
+        self.wasted_tokens += parsed.wasted_tokens(completion_tokens)
+        self.discarded += len(parsed.malformed) + parsed.duplicates + parsed.surplus
+
+
+def _completion_tokens(usage: dict, text: str) -> int:
+    return usage.get('completion_tokens') or estimate_tokens(text)
+
+
+def _repair_statements(client: GenerationClient, result: SurveyStatements, malformed: list):
+    """
+    Ask for replacements of the missing statements only, keeping the valid ones.
+    """
+    for _ in range(MAX_REPAIR_CALLS):
+        missing = STATEMENT_COUNT - len(result.statements)
+        if missing <= 0:
+            return
+        inputs = {'goal': result.goal, 'industry': result.industry, 'product': result.product,
+                  'existing': '\n'.join(result.statements) or '(none)',
+                  'malformed': '\n'.join(json.dumps(item, ensure_ascii=False) for item in malformed) or '(missing)',
+                  'count': missing}
+        text, usage = client.repair(inputs)
+        parsed = parse_statements(text, missing, existing=result.statements)
+        result.add_parsed(parsed, _completion_tokens(usage, text))
+        result.repaired += len(parsed.statements)
+        result.repair_calls += 1
+        malformed = parsed.malformed
+
+
+def _unparsed_items(text: str) -> int:
+    # the items of a JSON list, or the lines that splitting on newlines used to produce
+    items, structured = extract_items(text)
+    return len(items) if structured or text.lstrip().startswith(('{', '[')) else len(text.strip().split('\n'))
+
+
+def _finish_generation(key: str, result: SurveyStatements, unparsed_items: int):
+    # cache the final statements, so a cache hit needs neither parsing fixes nor repairs
+    store_generation(key, json.dumps({'statements': result.statements}, ensure_ascii=False))
+    with _statement_stats_lock:
+        statement_stats['surveys'] += 1
+        statement_stats['statements'] += len(result.statements)
+        statement_stats['unparsed_items'] += unparsed_items
+        statement_stats['completion_tokens'] += result.completion_tokens
+        statement_stats['wasted_tokens'] += result.wasted_tokens
+        statement_stats['discarded_items'] += result.discarded
+        statement_stats['repaired_items'] += result.repaired
+        statement_stats['repair_calls'] += result.repair_calls
+
+
+def _complete_generation(client: GenerationClient, key: str, result: SurveyStatements, usage: dict) -> SurveyStatements:
+    """
+    Parse a new completion in `result.text`, repair the missing statements, then cache and count the result.
+    """
+    with span('llm.parse') as parse_span:
+        parsed = parse_statements(result.text)
+        result.add_parsed(parsed, _completion_tokens(usage, result.text))
+        parse_span.set(statements=len(parsed.statements), malformed=len(parsed.malformed),
+                       duplicates=parsed.duplicates, structured=int(parsed.structured))
+    _repair_statements(client, result, parsed.malformed)
+    _finish_generation(key, result, _unparsed_items(result.text))
+    return result
+
+
+def get_statement_stats() -> dict:
+    """
+    Return the cost of the generated surveys and what parsing saved downstream.
+
+    'unparsed_items' counts the items of each first completion as the model
+    returned them: the JSON list items, or for free text every line, as
+    splitting on newlines used to produce. Each of them would have been one
+    translation and one Form question; 'translation_calls_saved' and
+    'form_items_saved' are the difference to the statements actually kept.
+    """
+    with _statement_stats_lock:
+        stats = dict(statement_stats)
+    surveys = max(stats['surveys'], 1)
+    saved = stats['unparsed_items'] - stats['statements']
+    stats.update(translation_calls_saved=saved, form_items_saved=saved,
+                 statements_per_survey=stats['statements'] / surveys,
+                 wasted_tokens_per_survey=stats['wasted_tokens'] / surveys,
+                 wasted_token_share=stats['wasted_tokens'] / max(stats['completion_tokens'], 1))
+    return stats
+
+
+def generate_survey_statements(goal: str, industry: str, product: str, regenerate: bool = False) -> SurveyStatements:
     """
     Generate survey statements based on the specified goal, industry, and product.
 
@@ -17,38 +551,205 @@ def generate_survey_statements(goal: str, industry: str, product: str):
     - goal (str): The goal of the survey.
     - industry (str): The industry for which the survey is targeted.
     - product (str): The product or service related to the survey.
+    - regenerate (bool): Skip the generation cache and request a new completion.
 
     Returns:
-    - str: The generated survey statements.
+    - SurveyStatements: The generated survey statements under `statements`.
 
     This function generates survey statements using a language model (LLM) and prompts
-    tailored to the specified goal, industry, and product. It combines the LLM and prompts
-    in multi-step workflows to generate the survey statements.
+    tailored to the specified goal, industry, and product. The model is asked
+    for a JSON list of exactly `STATEMENT_COUNT` statements within a completion
+    token limit, and the output is validated, normalized and de-duplicated by
+    `parse_statements`. If fewer usable statements remain, only the missing
+    ones are requested again, at most `MAX_REPAIR_CALLS` times. Completions are
+    served from `generation_cache` once one has been stored for the request.
 
     Example:
     ```python
-    statements = generate_survey_statements(goal="Gather customer feedback",
-                                            industry="Retail",
-                                            product="Online shopping platform")
-    print(statements)
+    result = generate_survey_statements(goal="Gather customer feedback",
+                                        industry="Retail",
+                                        product="Online shopping platform")
+    print(result.statements, result.wasted_tokens)
     ```
 
     """
 
-    # choose model
-    llm = ChatOpenAI(model_name="gpt-3.5-turbo-0125", temperature=0.7)
+    key = generation_cache_key(goal, industry, product)
+    result = SurveyStatements(goal=goal, industry=industry, product=product)
+    text = cached_generation(key, regenerate=regenerate)
+    if text is not None:
+        result.text, result.cached = text, True
+        result.statements = parse_statements(text).statements
+        return result
+
+    # run the chain on the shared, pooled client
+    client = get_generation_client()
+    result.text, usage = client.generate({'goal': goal, 'industry': industry, 'product': product})
+    return _complete_generation(client, key, result, usage)
+
+async def _agenerate_one(client: GenerationClient, limiter: AdaptiveConcurrency, goal: str, industry: str,
+                         product: str, regenerate: bool, max_retries: int) -> dict:
+    result = {'goal': goal, 'industry': industry, 'product': product, 'text': None, 'statements': None, 'error': None}
+    key = generation_cache_key(goal, industry, product)
+    text = cached_generation(key, regenerate=regenerate)
+    if text is not None:
+        result['text'] = text
+        result['statements'] = parse_statements(text).statements
+        return result
+
+    inputs = {'goal': goal, 'industry': industry, 'product': product}
+    for attempt in range(max_retries + 1):
+        try:
+            text, usage = await client.agenerate(inputs)
+        except (asyncio.TimeoutError,) + TRANSIENT_ERRORS as error:
+            if isinstance(error, openai.RateLimitError):
+                limiter.on_throttled()
+            if attempt == max_retries:
+                result['error'] = error
+                return result
+            await asyncio.sleep(backoff_delay(attempt, max_delay=16.0))
+        except Exception as error:
+            result['error'] = error
+            return result
+        else:
+            limiter.on_success()
+            break
+
+    # same parsing, repairs and caching as `generate_survey_statements`; repair
+    # calls are blocking, so they run in a thread instead of on the event loop
+    survey = SurveyStatements(goal=goal, industry=industry, product=product, text=text)
+    try:
+        survey = await asyncio.to_thread(_complete_generation, client, key, survey, usage)
+    except Exception as error:
+        result['error'] = error
+    result['text'], result['statements'] = survey.text, survey.statements
+    return result
+
+
+async def agenerate_many(requests, max_concurrency: int = 8, max_retries: int = 5, regenerate: bool = False):
+    """
+    Generate survey statements for many (goal, industry, product) requests concurrently.
+
+    Parameters:
+    - requests (iterable): (goal, industry, product) tuples; consumed lazily.
+    - max_concurrency (int): Upper bound on requests in flight.
+    - max_retries (int): Retries per request on timeouts, connection errors, 429 and 5xx.
+    - regenerate (bool): Skip the generation cache.
+
+    Yields:
+    - dict: 'goal', 'industry', 'product', 'text', 'statements' and 'error' of each request, in completion order.
+      Failed requests are yielded with the exception under 'error' instead of stopping the run.
+
+    The number of requests in flight starts at `max_concurrency`, is halved every
+    time the provider answers with a rate limit and grows back by one after a
+    run of successful calls, so throughput scales with the concurrency limit up
+    to what the provider accepts.
+
+    Example:
+    ```python
+    async def main():
+        async for result in agenerate_many([("Assess Market Demand", "Automotive", "EV")] * 100):
+            print(result['product'], result['error'] or result['text'][:40])
+    asyncio.run(main())
+    ```
+    """
+    client = get_generation_client()
+    limiter = AdaptiveConcurrency(max_concurrency)
+    iterator = iter(requests)
+    pending = set()
+    exhausted = False
+    while True:
+        # top up the tasks in flight to the current limit
+        while not exhausted and len(pending) < limiter.limit:
+            try:
+                goal, industry, product = next(iterator)
+            except StopIteration:
+                exhausted = True
+                break
+            pending.add(asyncio.ensure_future(
+                _agenerate_one(client, limiter, goal, industry, product, regenerate, max_retries)))
+        if not pending:
+            return
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+
+
+def generate_many(requests, max_concurrency: int = 8, max_retries: int = 5, regenerate: bool = False,
+                  on_result=None) -> list:
+    """
+    Synchronous wrapper of `agenerate_many` for scripts.
+
+    Parameters:
+    - requests (iterable): (goal, industry, product) tuples.
+    - max_concurrency (int): Upper bound on requests in flight.
+    - max_retries (int): Retries per request on transient errors.
+    - regenerate (bool): Skip the generation cache.
+    - on_result (callable): Optional, called with each result as soon as it completes.
+
+    Returns:
+    - list: The results in completion order, see `agenerate_many`.
+    """
+    async def collect():
+        results = []
+        async for result in agenerate_many(requests, max_concurrency, max_retries, regenerate):
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+
+    return asyncio.run(collect())
+
+
+def stream_survey_statements(goal: str, industry: str, product: str, regenerate: bool = False):
+    """
+    Stream survey statements one at a time while the model is still generating.
+
+    Parameters:
+    - goal (str): The goal of the survey.
+    - industry (str): The industry for which the survey is targeted.
+    - product (str): The product or service related to the survey.
+    - regenerate (bool): Skip the generation cache and request a new completion.
+
+    Yields:
+    - str: Each valid statement, as soon as it is complete in the streamed output.
+
+    This function sends the same prompt as `generate_survey_statements` with
+    streaming enabled, so the first statement can be translated and displayed
+    while the remaining ones are still being generated. Statements are parsed
+    incrementally by `StatementStream`; missing ones are repaired after the
+    stream ends. Cached completions are yielded at once, and a new completion
+    is added to the cache when it ends.
+
+    Example:
+    ```python
+    for statement in stream_survey_statements(goal="Gather customer feedback",
+                                              industry="Retail",
+                                              product="Online shopping platform"):
+        print(statement)
+    ```
+    """
+
+    key = generation_cache_key(goal, industry, product)
+    text = cached_generation(key, regenerate=regenerate)
+    if text is not None:
+        yield from parse_statements(text).statements
+        return
+
+    client = get_generation_client()
+    result = SurveyStatements(goal=goal, industry=industry, product=product)
+    stream = StatementStream()
+    for content in client.stream({'goal': goal, 'industry': industry, 'product': product}):
+        yield from stream.feed(content)
+    yield from stream.close()
+    # streamed responses carry no token usage, so it is estimated from the text
+    result.text = stream.text
+    result.add_parsed(stream.parsed, estimate_tokens(stream.text))
+
+    _repair_statements(client, result, stream.parsed.malformed)
+    yield from result.statements[len(stream.parsed.statements):]
+    _finish_generation(key, result, _unparsed_items(stream.text))
 
-    # define prompt
-    prompt = PromptTemplate(
-        input_variables=["goal","industry","product"],
-        template=prompt_templates.prompt_msg,
-    )
-    
-    # define and run chain
-    chain = LLMChain(llm=llm, prompt=prompt)
-    response = chain.invoke(input={'goal': goal,'industry': industry, 'product': product})
-    
-    return response
 
 if __name__ == "__main__":
     # print(generate_survey_statements("car manufacturing", "electric cars"))
@@ -1,12 +1,73 @@
+import time
+
 import streamlit as st
 import langchain_helper as lch
-import google_form_helper as gf
 import translator_helper as lang_helper
+from cache_helper import make_cache_key
+from language_codes import language_codes
+from translation_server import TranslationServerBusy, get_translation_server
+from form_jobs import get_form_job_queue
+import instrumentation
+from instrumentation import span
 from dotenv import dotenv_values
 
 # Load environment variables from .env file
 env_vars = dotenv_values('.env')
-language_codes = lang_helper.language_codes
+
+# tracing and metrics (MRA_TRACING, MRA_TRACE_LOG, MRA_METRICS_PORT), off by default
+instrumentation.configure_from_env(env_vars)
+
+# number of results kept per stage in each session
+MAX_STAGE_RESULTS = 8
+# seconds between status checks of a form being published in the background
+FORM_POLL_SECONDS = 1.0
+
+
+# heavyweight resources are created once per process and shared by all sessions
+@st.cache_resource
+def load_translator():
+    # start loading the translation model in the background
+    if env_vars.get('TRANSLATOR_WARMUP', '1') != '0':
+        lang_helper.warm_up()
+    return True
+
+@st.cache_resource
+def load_translation_server():
+    return get_translation_server()
+
+@st.cache_resource
+def load_generation_client():
+    return lch.get_generation_client()
+
+@st.cache_resource
+def load_form_job_queue():
+    return get_form_job_queue()
+
+def form_job_progress(job: dict) -> tuple:
+    """Return the progress fraction and label of a form publishing job."""
+    if job['step'] == 'questions':
+        share = job['questions_added'] / max(job['questions_total'], 1)
+        return 0.2 + 0.8 * share, f"{job['questions_added']}/{job['questions_total']} questions added"
+    return {'created': (0.1, 'Form created'), 'relocated': (0.2, 'Form placed in the folder')}.get(
+        job['step'], (0.0, 'Waiting for a publishing worker'))
+
+load_translator()
+
+
+# Streamlit reruns this script on every interaction, so each stage result is
+# kept in the session, keyed by the inputs of the stage
+if 'stage_results' not in st.session_state:
+    st.session_state.stage_results = {'generate': {}, 'translate': {}, 'form': {}}
+
+def stage_result(stage: str, key: str):
+    return st.session_state.stage_results[stage].get(key)
+
+def store_stage_result(stage: str, key: str, value):
+    results = st.session_state.stage_results[stage]
+    results.pop(key, None)
+    results[key] = value
+    while len(results) > MAX_STAGE_RESULTS:
+        results.pop(next(iter(results)))
 
 # Access the DRIVE_FOLDER_ID variable
 drive_folder_id = env_vars['DRIVE_FOLDER_ID']
@@ -49,42 +110,128 @@ user_product = st.sidebar.text_area(
 submit_button = st.sidebar.button('Submit')
 # checkbox to generate Google Form
 generate_form_checkbox = st.sidebar.checkbox('Generate Google Form in Google Drive')
+# checkbox to bypass the generation cache
+regenerate_checkbox = st.sidebar.checkbox('Regenerate statements', help='ignore previously generated statements for the same request')
 
-response_text =  ''
+submitted = False
 if submit_button:
     if user_industry and user_product and user_language:
-        print('User Submitted')
-        # generate statements based on user options
-        response = lch.generate_survey_statements(user_goal, user_industry, user_product)
-         # extract text to list
-        response_text = response['text'].strip().split('\n')
-        print('Survey Statements Generated!')
-        st.success('Survey Statements Generated (English)!')
-        if user_language_code != 'en_XX':
-            # processing message
-            with st.spinner(f'Translating in {user_language}...'):
-                print(f'Translating Statements to {user_language}..')
-                # translate..
-                response_text = lang_helper.translate_survey_questions(text_list=response_text, target_lng=user_language_code)
-                text = '\n'.join(response_text)
-                
+        submitted = True
+        # the submitted request stays active across reruns until the next submit
+        st.session_state.request = {'goal': user_goal, 'industry': user_industry, 'product': user_product}
+    else:
+        st.warning("Please provide values for language, industry and product.")
+
+request = st.session_state.get('request')
+poll_form_job = False
+if request:
+    with span('ui.run', language=user_language_code, create_form=generate_form_checkbox) as run_span:
+        started = time.perf_counter()
+        translate = user_language_code != 'en_XX'
+        generate_key = make_cache_key(request)
+        statements = stage_result('generate', generate_key)
+        rendered = False
+        slots, pending = [], []
+
+        # generation stage: only a submit runs it, every other rerun reuses its result
+        if submitted or statements is None:
+            first_statement_seconds = None
+            translation_server = load_translation_server() if translate else None
+            load_generation_client()
+            # render each statement as soon as it is generated; translations are
+            # queued right away and replace the English text when they are ready
+            statements = []
+            with span('ui.generate') as generate_span:
+                for statement in lch.stream_survey_statements(request['goal'], request['industry'], request['product'],
+                                                              regenerate=regenerate_checkbox):
+                    if first_statement_seconds is None:
+                        first_statement_seconds = time.perf_counter() - started
+                    statements.append(statement)
+                    slot = st.empty()
+                    slot.markdown(statement)
+                    slots.append(slot)
+                    if translation_server is not None:
+                        try:
+                            pending.append(translation_server.submit([statement], user_language_code))
+                        except TranslationServerBusy:
+                            # the rest is translated in one request after generation
+                            translation_server = None
+                        for ready_slot, future in zip(slots, pending):
+                            if future.done():
+                                ready_slot.markdown(future.result()[0])
+                generate_span.set(statements=len(statements))
+            store_stage_result('generate', generate_key, statements)
+            rendered = True
+            run_span.set(first_statement_seconds=first_statement_seconds or 0.0)
+            st.caption(f'First statement after {first_statement_seconds or 0:.2f}s')
+
+        # translation stage: keyed by the statements and the language, so changing
+        # only the language reuses the generated statements
+        response_text = statements
+        if translate:
+            translate_key = make_cache_key(statements, user_language_code)
+            response_text = stage_result('translate', translate_key)
+            if response_text is None:
+                with st.spinner(f'Translating in {user_language}...'), span('ui.translate', statements=len(statements)):
+                    try:
+                        # statements not queued while streaming go in one request
+                        rest = load_translation_server().submit(statements[len(pending):], user_language_code)
+                    except TranslationServerBusy:
+                        for future in pending:
+                            future.cancel()
+                        # the generated statements are kept, so a retry only translates
+                        st.warning('The translation service is busy right now, please retry in a moment.')
+                        st.button('Retry translation')
+                        st.stop()
+                    response_text = [future.result()[0] for future in pending] + rest.result()
+                store_stage_result('translate', translate_key, response_text)
+            # the streamed statements still show English until their slots are overwritten;
+            # on a memoized translation (e.g. a resubmit served from the generation cache)
+            # the futures queued while streaming are left to finish and their results ignored
+            for slot, translated in zip(slots, response_text):
+                slot.markdown(translated)
+            pending = []
             st.success(f'Survey Statements Translated to {user_language}!')
-            st.markdown(text)
         else:
-            st.markdown(response['text'])
-            
-        # create google form on Drive
+            st.success('Survey Statements Generated (English)!')
+
+        if not rendered:
+            for statement in response_text:
+                st.markdown(statement)
+        st.caption(f'Ready after {time.perf_counter() - started:.2f}s')
+
+        # form stage: keyed by the final statements and the form name, so ticking the
+        # checkbox after seeing the results creates the form without generating again.
+        # Publishing runs in the background job queue and this page polls its progress;
+        # the job ID is kept per form key, so a rerun polls the same job instead of publishing twice.
         if generate_form_checkbox:
-            print('User Requested Google Form')
-            print('Generating Form..')
-            with st.spinner('Generating Form..'):
-                # form name
-                form_name = f'({user_language})' + ' ' + user_goal +  ' of ' + user_product
-                # generate form
-                results = gf.google_form_generator(text_list=response_text, folder_id=drive_folder_id, form_name=form_name, form_description= 'Please respond on a scale 1-5')
-                print('User Form Created!')
+            # form name
+            form_name = f'({user_language})' + ' ' + request['goal'] +  ' of ' + request['product']
+            form_key = make_cache_key(response_text, form_name, drive_folder_id)
+            job_id = stage_result('form', form_key)
+            if job_id is None:
+                with span('ui.form', questions=len(response_text)):
+                    job_id = load_form_job_queue().submit(text_list=response_text, folder_id=drive_folder_id, form_name=form_name, form_description= 'Please respond on a scale 1-5')
+                store_stage_result('form', form_key, job_id)
+            job = load_form_job_queue().status(job_id)
+            if job is None:
+                # e.g. the job database was removed; forget the job so the next run submits a new one
+                st.session_state.stage_results['form'].pop(form_key, None)
+                st.error('Google Form job was not found, please submit again.')
+            elif job['status'] == 'done':
                 st.success('Google Form Uploaded to Drive!')
-        else:
-            st.stop()
-    else:
-        st.warning("Please provide values for language, industry and product.")
+                if job['result'].get('responderUri'):
+                    st.markdown(f"[Open the form]({job['result']['responderUri']})")
+            elif job['status'] == 'failed':
+                st.error(f"Google Form could not be created: {job['error']}")
+            else:
+                fraction, label = form_job_progress(job)
+                if job['status'] == 'queued' and job['attempts']:
+                    label += f" (retrying, attempt {job['attempts'] + 1})"
+                st.progress(fraction, text=f'Generating Form.. {label}')
+                poll_form_job = True
+
+# check the background form job again without blocking the session in the meantime
+if poll_form_job:
+    time.sleep(FORM_POLL_SECONDS)
+    st.rerun()
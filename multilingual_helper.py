@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import google_form_helper as gf
+from language_codes import language_codes
+from translation_server import TranslationClient
+
+# language code -> language name, used for form names
+language_names = {code: name for name, code in language_codes.items()}
+
+
+def _translate_and_publish(text_list: list, target_lng: str, folder_id: str, form_name: str,
+                           form_description: str, create_form: bool, limiter) -> dict:
+    result = {'language': target_lng, 'statements': text_list, 'form': None, 'error': None}
+    try:
+        if target_lng != 'en_XX':
+            # the shared translation server owns the model and serializes generate calls
+            result['statements'] = TranslationClient().translate(text_list, target_lng)
+        if create_form:
+            with gf.api_rate_limit(limiter):
+                result['form'] = gf.google_form_generator(text_list=result['statements'],
+                                                          folder_id=folder_id,
+                                                          form_name=f'({language_names[target_lng]}) {form_name}',
+                                                          form_description=form_description)
+    except Exception as error:
+        result['error'] = error
+    return result
+
+
+def generate_multilingual_surveys(text_list: list, target_lngs: list, folder_id: str = None,
+                                  form_name: str = '', form_description: str = '',
+                                  create_form: bool = True, max_workers: int = 4,
+                                  requests_per_second: float = None):
+    """
+    Translate survey statements into several languages and create one Google Form per language.
+
+    Parameters:
+    - text_list (list): The survey statements in English.
+    - target_lngs (list): Language codes from `language_codes.language_codes`.
+    - folder_id (str): The ID of the Drive folder where the forms will be placed.
+    - form_name (str): The form name, prefixed with the language name for each form.
+    - form_description (str): The description of every form.
+    - create_form (bool): Create a Google Form for each language, or only translate.
+    - max_workers (int): Number of languages processed at the same time.
+    - requests_per_second (float): Optional limit on the Google API calls of this call, shared by its languages.
+
+    Yields:
+    - dict: One result per language as soon as it completes, with the keys
+      'language', 'statements', 'form' and 'error'. A failing language does not
+      stop the others; its exception is returned under 'error'.
+
+    Languages are processed by a bounded thread pool. Google API calls are
+    retried with exponential backoff on 429 and 5xx responses by
+    `google_form_helper.execute_request`, and share one token bucket of
+    `requests_per_second`; other Google API calls of the process are not limited by it.
+
+    Example:
+    ```python
+    for result in generate_multilingual_surveys(statements, ['de_DE', 'fr_XX', 'es_XX'],
+                                                folder_id="your_folder_id_here",
+                                                form_name="Assess Market Demand of EV",
+                                                form_description="Please respond on a scale 1-5"):
+        print(result['language'], result['error'] or result['form']['formId'])
+    ```
+
+    Raises:
+    - ValueError: If a language code is not supported or `folder_id` is missing when forms are requested.
+    """
+
+    unknown = [code for code in target_lngs if code not in language_names]
+    if unknown:
+        raise ValueError(f"Unsupported language codes: {', '.join(unknown)}")
+    if create_form and not folder_id:
+        raise ValueError("folder_id is required to create Google Forms.")
+    # validated up front, so a bad limit fails the call instead of every language
+    limiter = gf.make_api_rate_limiter(requests_per_second) if requests_per_second else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_translate_and_publish, text_list, code, folder_id,
+                                   form_name, form_description, create_form, limiter)
+                   for code in dict.fromkeys(target_lngs)]
+        for future in as_completed(futures):
+            yield future.result()
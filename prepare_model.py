@@ -0,0 +1,41 @@
+"""
+Convert the translation model into a local, memory-mappable copy.
+
+Run once, e.g. while building the Docker image. Afterwards the app loads the
+model from the output directory with zero-copy mmap and needs no network.
+
+    python prepare_model.py prepared_model
+
+With `--onnx`, the ONNX export of the 'onnx' backend is written once as well.
+"""
+import argparse
+import time
+
+import translator_helper as lang_helper
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?', default=lang_helper.PREPARED_MODEL_DIR)
+    parser.add_argument('--model', default=lang_helper.MODEL_NAME, help='model id or directory to convert')
+    parser.add_argument('--onnx', nargs='?', const=lang_helper.ONNX_MODEL_DIR, default=None,
+                        help='also export the model to ONNX, into this directory')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    lang_helper.prepare_model(args.directory, args.model)
+    print(f'Prepared {args.model} in {args.directory} ({time.perf_counter() - started:.1f}s)')
+
+    # check that the copy loads without touching the network
+    started = time.perf_counter()
+    lang_helper.load_prepared_model(args.directory)
+    print(f'Memory-mapped load: {time.perf_counter() - started:.2f}s')
+
+    if args.onnx:
+        started = time.perf_counter()
+        lang_helper.export_onnx_model(args.onnx, args.model)
+        print(f'Exported {args.model} to ONNX in {args.onnx} ({time.perf_counter() - started:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
 prompt_msg = '''You are a professional market researcher working in the {industry} industry. Your Goal is to {goal} of product {product}.
-In order to perform market research you need to crete a survey of 10 statements/questions to which the users will respond on a scale 1-5 (negative-positive)'''
-
-
-
-
-
-
+In order to perform market research you need to crete a survey of {count} statements/questions to which the users will respond on a scale 1-5 (negative-positive).
+Respond with a JSON object of the form {{"statements": ["...", "..."]}} holding exactly {count} distinct statements, each a single sentence without numbering, and nothing else.'''
+
+repair_msg = '''You are a professional market researcher working in the {industry} industry. Your Goal is to {goal} of product {product}.
+A survey to which the users will respond on a scale 1-5 (negative-positive) already has these statements:
+{existing}
+The following items could not be used as survey statements:
+{malformed}
+Write {count} new statements/questions to replace them, different from the existing statements.
+Respond with a JSON object of the form {{"statements": ["...", "..."]}} holding exactly {count} distinct statements, each a single sentence without numbering, and nothing else.'''
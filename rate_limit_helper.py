@@ -0,0 +1,157 @@
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Parameters:
+    - rate (float): Tokens added per second.
+    - capacity (float): Maximum number of tokens the bucket can hold (defaults to `rate`),
+      at least 1 so a single call can always be served.
+
+    Every call to `acquire` takes tokens from the bucket and blocks until enough
+    tokens are available, so callers sharing a bucket never exceed `rate` calls
+    per second on average while still allowing short bursts up to `capacity`.
+
+    Example:
+    ```python
+    bucket = TokenBucket(rate=5)
+    for request in requests:
+        bucket.acquire()
+        request.execute()
+    ```
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        if self.capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take `tokens` from the bucket, waiting until they are available.
+
+        Returns:
+        - float: The number of seconds spent waiting.
+
+        Raises:
+        - ValueError: If more tokens are requested than the bucket can ever hold.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}.")
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def backoff_delay(attempt: int, base_delay: float = 0.5, max_delay: float = 32.0) -> float:
+    """
+    Return a full-jitter exponential backoff delay for the given retry attempt.
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_with_backoff(func, is_retryable, max_retries: int = 5, base_delay: float = 0.5,
+                       max_delay: float = 32.0, retry_after=None, on_retry=None, deadline: float = None):
+    """
+    Call `func` and retry it with exponential backoff while it raises retryable errors.
+
+    Parameters:
+    - func (callable): The function to call, without arguments.
+    - is_retryable (callable): Returns True for exceptions that should be retried.
+    - max_retries (int): Maximum number of retries before the error is re-raised.
+    - base_delay (float): Delay of the first retry in seconds, doubled on every attempt.
+    - max_delay (float): Upper bound of a single delay in seconds.
+    - retry_after (callable): Optional, returns a server-provided delay for an exception, or None.
+    - on_retry (callable): Optional, called with (attempt, exception, delay) before sleeping.
+    - deadline (float): Optional `time.monotonic()` time after which no retry is made;
+      every delay is shortened to the time left before it.
+
+    Returns:
+    - The return value of `func`.
+
+    Example:
+    ```python
+    result = retry_with_backoff(lambda: request.execute(), is_retryable=is_retryable_http_error)
+    ```
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as error:
+            if attempt >= max_retries or not is_retryable(error):
+                raise
+            delay = retry_after(error) if retry_after else None
+            if delay is None:
+                delay = backoff_delay(attempt, base_delay, max_delay)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+                delay = min(delay, remaining)
+            if on_retry:
+                on_retry(attempt, error, delay)
+            time.sleep(delay)
+            if deadline is not None and time.monotonic() >= deadline:
+                # no time left for another attempt
+                raise
+            attempt += 1
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase, multiplicative-decrease concurrency limit.
+
+    Parameters:
+    - max_limit (int): Upper bound of the limit, and its starting value.
+    - min_limit (int): Lower bound of the limit.
+    - increase_every (int): Successful calls needed to raise the limit by one.
+
+    Callers report every outcome: `on_success` slowly raises the limit, while
+    `on_throttled` halves it as soon as the provider signals a rate limit, so
+    the number of requests in flight follows what the provider accepts.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_every: int = 10):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.increase_every = increase_every
+        self.limit = self.max_limit
+        self.throttled = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def on_success(self):
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.increase_every and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+
+    def on_throttled(self):
+        with self._lock:
+            self.throttled += 1
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._successes = 0
@@ -0,0 +1,275 @@
+from dataclasses import dataclass, field
+import json
+import os
+import re
+
+# number of statements per survey, and the completion tokens allowed for them
+STATEMENT_COUNT = int(os.getenv('SURVEY_STATEMENT_COUNT', '10'))
+TOKENS_PER_STATEMENT = int(os.getenv('SURVEY_STATEMENT_TOKENS', '40'))
+# tokens of the JSON wrapper around the statements
+JSON_OVERHEAD_TOKENS = 16
+# rough size of an English token, for streamed output without reported usage
+CHARS_PER_TOKEN = 4
+
+MIN_STATEMENT_WORDS = 3
+MAX_STATEMENT_CHARS = 250
+
+# "1.", "2)", "(3)", "Q4:", "-", "*" and "•" in front of a statement
+_ENUMERATOR = re.compile(r'^\s*(?:[-*•]+|\(?(?:q(?:uestion)?\s*)?\d+\s*[.):\]]|statement\s*\d+\s*[.:)])\s*', re.IGNORECASE)
+_JSON_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def statement_token_budget(count: int = STATEMENT_COUNT) -> int:
+    """Return the completion token limit for a survey of `count` statements."""
+    return count * TOKENS_PER_STATEMENT + JSON_OVERHEAD_TOKENS
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text from its length."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def normalize_statement(item) -> str:
+    """
+    Return a statement with its numbering, bullets, quotes and extra whitespace removed.
+
+    Parameters:
+    - item: One item of the model output.
+
+    Returns:
+    - str | None: The statement, or None if the item is not a usable statement: not a
+      string, too short or too long, or a heading such as "Here are 10 statements:".
+    """
+    if not isinstance(item, str):
+        return None
+    text = _WHITESPACE.sub(' ', item).strip()
+    text = _ENUMERATOR.sub('', text).strip().strip('"\'“”').strip().rstrip(',').strip()
+    if len(text.split()) < MIN_STATEMENT_WORDS or len(text) > MAX_STATEMENT_CHARS or text.endswith(':'):
+        return None
+    return text
+
+
+def statement_key(statement: str) -> str:
+    """Return the key under which two statements count as duplicates: case, punctuation and spacing ignored."""
+    return ' '.join(_PUNCTUATION.sub(' ', statement.casefold()).split())
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    return text.strip()
+
+
+def _array_end(text: str, start: int) -> int:
+    """Return the index of the `]` closing an array whose items start at `start`, or -1 if it is not closed yet.
+
+    Brackets inside string literals, e.g. "I would recommend [Product].", do not end the array.
+    """
+    position = start
+    while True:
+        bracket = text.find(']', position)
+        quote = text.find('"', position)
+        if bracket < 0:
+            return -1
+        if quote < 0 or bracket < quote:
+            return bracket
+        string = _JSON_STRING.match(text, quote)
+        if string is None:
+            # the string is still open, so the bracket is part of it
+            return -1
+        position = string.end()
+
+
+def extract_items(text: str) -> tuple:
+    """
+    Split model output into raw items.
+
+    Returns:
+    - tuple: (items, structured), where `structured` is True if the output was valid JSON.
+
+    Valid JSON is read as a list, or as an object holding one ('statements').
+    Otherwise the complete string literals of a JSON array are used, which
+    recovers the statements of an output cut off by the token limit, and text
+    without an array is split into lines.
+    """
+    text = _strip_fences(text)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get('statements', next((value for value in data.values() if isinstance(value, list)), None))
+    if isinstance(data, list):
+        return data, True
+
+    if '[' in text:
+        array = text[text.index('[') + 1:]
+        end = _array_end(array, 0)
+        array = array[:end] if end >= 0 else array
+        return [_decode_string(match.group(1)) for match in _JSON_STRING.finditer(array)], False
+    return [line for line in text.split('\n') if line.strip()], False
+
+
+def _decode_string(literal: str) -> str:
+    try:
+        return json.loads(f'"{literal}"')
+    except ValueError:
+        return literal
+
+
+@dataclass
+class ParsedStatements:
+    """
+    Statements parsed from model output.
+
+    - statements (list): Valid, normalized and unique statements, at most `count`.
+    - malformed (list): Items that are not usable statements, e.g. headings or empty items.
+    - duplicates (int): Items repeating an earlier statement.
+    - surplus (int): Valid items beyond `count`.
+    - structured (bool): The output was valid JSON.
+    - count (int): The number of statements requested.
+    - discarded_chars (int): Characters of the output that did not end up in a statement.
+    - total_chars (int): Characters of the output.
+    """
+    statements: list = field(default_factory=list)
+    malformed: list = field(default_factory=list)
+    duplicates: int = 0
+    surplus: int = 0
+    structured: bool = False
+    count: int = STATEMENT_COUNT
+    discarded_chars: int = 0
+    total_chars: int = 0
+
+    @property
+    def missing(self) -> int:
+        """Number of statements still needed to reach `count`."""
+        return max(self.count - len(self.statements), 0)
+
+    def wasted_tokens(self, completion_tokens: int) -> int:
+        """Estimate the completion tokens spent on discarded output, by its share of the characters."""
+        return round(completion_tokens * self.discarded_chars / self.total_chars) if self.total_chars else 0
+
+    def add(self, item, seen: set) -> str:
+        """
+        Validate, normalize and de-duplicate one item, returning the statement if it was kept.
+
+        `seen` holds the `statement_key` of every statement kept so far and is updated.
+        """
+        statement = normalize_statement(item)
+        if statement is None:
+            self.malformed.append(item)
+        elif statement_key(statement) in seen:
+            self.duplicates += 1
+        elif len(self.statements) >= self.count:
+            self.surplus += 1
+        else:
+            seen.add(statement_key(statement))
+            self.statements.append(statement)
+            return statement
+        self.discarded_chars += len(item) if isinstance(item, str) else len(json.dumps(item))
+        return None
+
+    def finish(self, text: str, structured: bool):
+        """Record the size of the whole output once all items are added."""
+        self.structured = structured
+        self.total_chars = len(text)
+        if not structured and not _strip_fences(text).startswith(('{', '[')):
+            # without JSON, everything around the statements (preambles, numbering) is waste too
+            self.discarded_chars = max(len(text) - sum(len(statement) for statement in self.statements), 0)
+
+
+def parse_statements(text: str, count: int = STATEMENT_COUNT, existing: list = None) -> ParsedStatements:
+    """
+    Parse model output into at most `count` valid, normalized and unique statements.
+
+    Parameters:
+    - text (str): The completion text.
+    - count (int): The number of statements requested.
+    - existing (list): Statements already kept, e.g. before a repair; new items
+      repeating them count as duplicates.
+
+    Returns:
+    - ParsedStatements: The statements and what was discarded.
+
+    Example:
+    ```python
+    parsed = parse_statements('Here are the statements:\\n1. The price is fair.\\n2. The price is fair.', count=10)
+    print(parsed.statements, parsed.malformed, parsed.duplicates, parsed.missing)
+    ```
+    """
+    parsed = ParsedStatements(count=count)
+    items, structured = extract_items(text)
+    seen = {statement_key(statement) for statement in existing or []}
+    for item in items:
+        parsed.add(item, seen)
+    parsed.finish(text, structured)
+    return parsed
+
+
+class StatementStream:
+    """
+    Incremental parser that returns statements as soon as they are complete in a streamed completion.
+
+    Parameters:
+    - count (int): The number of statements requested.
+    - existing (list): Statements that new items must not repeat.
+
+    JSON output yields each string of the statements array when its closing
+    quote arrives; output that does not start with JSON yields each complete
+    line. Items go through the same validation, normalization and
+    de-duplication as `parse_statements`.
+
+    Example:
+    ```python
+    stream = StatementStream(count=10)
+    for content in chunks:
+        for statement in stream.feed(content):
+            print(statement)
+    for statement in stream.close():
+        print(statement)
+    parsed = stream.parsed
+    ```
+    """
+
+    def __init__(self, count: int = STATEMENT_COUNT, existing: list = None):
+        self.text = ''
+        self.parsed = ParsedStatements(count=count)
+        self._seen = {statement_key(statement) for statement in existing or []}
+        self._position = 0
+
+    def _complete_items(self, final: bool) -> list:
+        stripped = _strip_fences(self.text) if final else self.text.lstrip()
+        if not stripped:
+            return []
+        if stripped.startswith(('{', '[', '```')):
+            start = self.text.find('[')
+            if start < 0:
+                return []
+            end = _array_end(self.text, start + 1)
+            array = self.text[start + 1:end if end >= 0 else len(self.text)]
+            matches = list(_JSON_STRING.finditer(array, self._position))
+            if matches:
+                self._position = matches[-1].end()
+            return [_decode_string(match.group(1)) for match in matches]
+        complete = len(self.text) if final else self.text.rfind('\n') + 1
+        lines = self.text[self._position:complete].split('\n')
+        self._position = max(self._position, complete)
+        return [line for line in lines if line.strip()]
+
+    def _add(self, items: list) -> list:
+        return [statement for statement in (self.parsed.add(item, self._seen) for item in items) if statement]
+
+    def feed(self, content: str) -> list:
+        """Add a streamed chunk and return the statements it completed."""
+        self.text += content
+        return self._add(self._complete_items(final=False))
+
+    def close(self) -> list:
+        """Finish the stream and return the remaining statements."""
+        statements = self._add(self._complete_items(final=True))
+        self.parsed.finish(self.text, extract_items(self.text)[1])
+        return statements
@@ -0,0 +1,169 @@
+import gc
+import multiprocessing
+import os
+
+import translator_helper as lang_helper
+
+
+def _init_worker(num_threads: int):
+    import torch
+    torch.set_num_threads(num_threads)
+
+
+def _translate_chunk(chunk: tuple) -> tuple:
+    target_lng, texts = chunk
+    return target_lng, texts, lang_helper._generate_translations(texts, target_lng), os.getpid()
+
+
+class TranslationProcessPool:
+    """
+    Pool of forked worker processes sharing one copy of the translation model.
+
+    Parameters:
+    - workers (int): Number of worker processes, defaults to `TRANSLATION_POOL_WORKERS`
+      or one per `threads_per_worker` cores.
+    - threads_per_worker (int): PyTorch intra-op threads per worker, defaults to
+      `TRANSLATION_POOL_THREADS` or the cores divided by the workers.
+    - token_budget (int): Padded tokens per chunk sent to a worker.
+    - max_chunk_size (int): Statements per chunk sent to a worker.
+
+    The model is loaded in the parent before the workers are forked, so the
+    weights are shared copy-on-write instead of being loaded once per worker;
+    `gc.freeze()` keeps the garbage collector from touching (and so copying)
+    the pages of the inherited objects. Each worker gets its share of the cores
+    as intra-op threads, so the pool does not oversubscribe the machine.
+
+    Work is split per language into chunks of similar-length statements, and
+    the largest chunks are dispatched first so workers finish at about the same
+    time. Translations are looked up in and added to the translation cache by
+    the parent only.
+
+    Fork is required, so the pool is not available on Windows. The parent must
+    not run a translation before `start`, because forking after PyTorch has
+    started its thread pool can deadlock the workers.
+
+    Example:
+    ```python
+    with TranslationProcessPool(workers=4) as pool:
+        translations = pool.translate_many({"de_DE": statements, "fr_XX": statements})
+    ```
+    """
+
+    def __init__(self, workers: int = None, threads_per_worker: int = None,
+                 token_budget: int = None, max_chunk_size: int = 16):
+        cores = os.cpu_count() or 1
+        threads_per_worker = threads_per_worker or int(os.getenv('TRANSLATION_POOL_THREADS', '0')) or None
+        workers = workers or int(os.getenv('TRANSLATION_POOL_WORKERS', '0')) or None
+        if workers is None:
+            workers = max(1, cores // (threads_per_worker or 1))
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, cores // workers)
+        self.token_budget = token_budget or lang_helper.GENERATION_SETTINGS['token_budget']
+        self.max_chunk_size = max_chunk_size
+        self._pool = None
+        self.stats = {'statements': 0, 'cache_hits': 0, 'chunks': 0, 'chunks_per_worker': {}}
+
+    def start(self) -> 'TranslationProcessPool':
+        if self._pool is not None:
+            return self
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError('TranslationProcessPool needs the fork start method')
+        # HF tokenizers disable their own threads after a fork; say so up front to avoid the warning
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+        # load once in the parent; forked workers inherit the weights
+        lang_helper.get_translator()
+        gc.collect()
+        gc.freeze()
+        context = multiprocessing.get_context('fork')
+        self._pool = context.Pool(self.workers, initializer=_init_worker, initargs=(self.threads_per_worker,))
+        return self
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            gc.unfreeze()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def plan_chunks(self, texts_by_language: dict) -> list:
+        """
+        Split the statements of every language into chunks of similar length.
+
+        Parameters:
+        - texts_by_language (dict): Language code -> list of statements.
+
+        Returns:
+        - list: (language code, statements) chunks, largest first.
+        """
+        _, tokenizer = lang_helper.get_translator()
+        chunks = []
+        for target_lng, texts in texts_by_language.items():
+            if not texts:
+                continue
+            lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=True)['input_ids']]
+            for batch in lang_helper.plan_batches(lengths, self.token_budget, self.max_chunk_size):
+                chunks.append((sum(lengths[position] for position in batch), target_lng,
+                               [texts[position] for position in batch]))
+        chunks.sort(key=lambda chunk: chunk[0], reverse=True)
+        return [(target_lng, texts) for _, target_lng, texts in chunks]
+
+    def translate_many(self, texts_by_language: dict) -> dict:
+        """
+        Translate statements into several languages across the worker processes.
+
+        Parameters:
+        - texts_by_language (dict): Language code -> list of English statements.
+
+        Returns:
+        - dict: Language code -> list of translated statements, in input order.
+        """
+        self.start()
+        results, missing = {}, {}
+        for target_lng, text_list in texts_by_language.items():
+            normalized = [lang_helper.normalize_text(text) for text in text_list]
+            cached = [lang_helper.translation_cache.get(lang_helper.translation_cache_key(text, target_lng))
+                      for text in normalized]
+            results[target_lng] = (normalized, cached)
+            missing[target_lng] = list(dict.fromkeys(text for text, hit in zip(normalized, cached) if hit is None))
+            self.stats['statements'] += len(text_list)
+            self.stats['cache_hits'] += len(set(normalized)) - len(missing[target_lng])
+
+        translated = {target_lng: {} for target_lng in texts_by_language}
+        chunks = self.plan_chunks(missing)
+        for target_lng, texts, outputs, pid in self._pool.imap_unordered(_translate_chunk, chunks):
+            for text, output in zip(texts, outputs):
+                translated[target_lng][text] = output
+                lang_helper.translation_cache.set(lang_helper.translation_cache_key(text, target_lng), output)
+            self.stats['chunks_per_worker'][pid] = self.stats['chunks_per_worker'].get(pid, 0) + 1
+        self.stats['chunks'] += len(chunks)
+
+        return {target_lng: [translated[target_lng][text] if hit is None else hit for text, hit in zip(normalized, cached)]
+                for target_lng, (normalized, cached) in results.items()}
+
+    def translate(self, text_list: list, target_lng: str) -> list:
+        """Translate statements into one language; see `translate_many`."""
+        return self.translate_many({target_lng: text_list})[target_lng]
+
+
+def process_memory(pid: int = None) -> dict:
+    """
+    Return the memory of a process in MiB from /proc (Linux only).
+
+    Returns:
+    - dict: 'rss' (resident), 'pss' (resident with shared pages divided among their users)
+      and 'shared' (resident pages shared with other processes).
+    """
+    memory = {}
+    with open(f"/proc/{pid or os.getpid()}/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, value = line.partition(':')
+            if name in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty'):
+                memory[name] = int(value.split()[0]) / 1024
+    return {'rss': memory.get('Rss', 0.0), 'pss': memory.get('Pss', 0.0),
+            'shared': memory.get('Shared_Clean', 0.0) + memory.get('Shared_Dirty', 0.0)}
@@ -0,0 +1,232 @@
+from concurrent.futures import Future
+from collections import OrderedDict
+import os
+import queue
+import threading
+import time
+
+import translator_helper as lang_helper
+
+
+class TranslationServerBusy(Exception):
+    """Raised when the translation queue is full."""
+
+
+class _TranslationRequest:
+    def __init__(self, text_list: list, target_lng: str):
+        self.text_list = text_list
+        self.target_lng = target_lng
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class TranslationServer:
+    """
+    Local translation service that owns the model and batches concurrent requests.
+
+    Parameters:
+    - translate_fn (callable): Called as `translate_fn(text_list, target_lng)`, defaults to
+      `translator_helper.translate_survey_questions`.
+    - max_batch_size (int): Number of statements after which a batch is sent without waiting further.
+    - max_wait (float): Seconds to wait after the first queued request for more requests to join the batch.
+    - max_queue (int): Number of requests that may wait in the queue.
+    - submit_timeout (float): Seconds `submit` waits for room in a full queue before giving up.
+
+    A single worker thread takes requests from a bounded queue. Requests
+    arriving within `max_wait` of each other are grouped by target language,
+    and each group is translated with one call; the results are split back to
+    the callers in order. When the queue is full, `submit` raises
+    `TranslationServerBusy` so callers can back off instead of piling up.
+    Futures cancelled while they wait in the queue are skipped, and an error in
+    one batch fails only its own futures, so the worker thread keeps running.
+
+    Example:
+    ```python
+    server = TranslationServer(max_batch_size=64, max_wait=0.05).start()
+    future = server.submit(["The price is fair."], "es_XX")
+    print(future.result())
+    ```
+    """
+
+    def __init__(self, translate_fn=None, max_batch_size: int = 64, max_wait: float = 0.05,
+                 max_queue: int = 256, submit_timeout: float = 1.0):
+        self.translate_fn = translate_fn or lang_helper.translate_survey_questions
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.submit_timeout = submit_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'statements': 0, 'batches': 0, 'rejected': 0, 'cancelled': 0,
+                       'failed_batches': 0, 'max_queue_depth': 0}
+
+    def start(self) -> "TranslationServer":
+        """Start the worker thread if it is not running yet."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='translation-server', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stop the worker thread after the current batch."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, text_list: list, target_lng: str) -> Future:
+        """
+        Queue statements for translation.
+
+        Parameters:
+        - text_list (list): The statements in English.
+        - target_lng (str): The target language code.
+
+        Returns:
+        - Future: Resolves to the list of translated statements.
+
+        Raises:
+        - TranslationServerBusy: If the queue stays full for `submit_timeout` seconds.
+        """
+        request = _TranslationRequest(list(text_list), target_lng)
+        if not request.text_list:
+            request.future.set_result([])
+            return request.future
+        try:
+            self._queue.put(request, timeout=self.submit_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise TranslationServerBusy("The translation queue is full, try again later.")
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+        return request.future
+
+    def stats(self) -> dict:
+        """Return request, batch and queue counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['statements_per_batch'] = stats['statements'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def _claim(self, request: _TranslationRequest) -> bool:
+        # a cancelled future must not be set, so it is dropped instead of translated
+        if request.future.set_running_or_notify_cancel():
+            return True
+        with self._lock:
+            self._stats['cancelled'] += 1
+        return False
+
+    def _collect(self, first: _TranslationRequest) -> list:
+        # gather requests arriving within max_wait of the first one, plus any
+        # that queued up while the previous batch was being translated
+        pending = [first] if self._claim(first) else []
+        statements = sum(len(request.text_list) for request in pending)
+        deadline = first.enqueued + self.max_wait
+        while statements < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if self._claim(request):
+                pending.append(request)
+                statements += len(request.text_list)
+        return pending
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            groups = OrderedDict()
+            for request in self._collect(first):
+                groups.setdefault(request.target_lng, []).append(request)
+            for target_lng, requests in groups.items():
+                try:
+                    self._translate_group(target_lng, requests)
+                except Exception as error:
+                    # never let one bad request end the only worker thread
+                    self._fail(requests, error)
+
+    def _fail(self, requests: list, error: Exception):
+        with self._lock:
+            self._stats['failed_batches'] += 1
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _translate_group(self, target_lng: str, requests: list):
+        text_list = [text for request in requests for text in request.text_list]
+        try:
+            translation = self.translate_fn(text_list, target_lng)
+        except Exception as error:
+            self._fail(requests, error)
+            return
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['statements'] += len(text_list)
+        start = 0
+        for request in requests:
+            end = start + len(request.text_list)
+            request.future.set_result(translation[start:end])
+            start = end
+
+
+_translation_server = None
+_translation_server_lock = threading.Lock()
+
+def get_translation_server() -> TranslationServer:
+    """
+    Return the process-wide `TranslationServer`, starting it on first use.
+
+    Batch size, wait time and queue size are read from the `TRANSLATION_SERVER_*`
+    environment variables.
+    """
+    global _translation_server
+    with _translation_server_lock:
+        if _translation_server is None:
+            _translation_server = TranslationServer(
+                max_batch_size=int(os.getenv('TRANSLATION_SERVER_MAX_BATCH', '64')),
+                max_wait=float(os.getenv('TRANSLATION_SERVER_MAX_WAIT', '0.05')),
+                max_queue=int(os.getenv('TRANSLATION_SERVER_MAX_QUEUE', '256')),
+            )
+        return _translation_server.start()
+
+
+class TranslationClient:
+    """
+    Small client API for the shared translation server.
+
+    Parameters:
+    - server (TranslationServer): The server to use, defaults to `get_translation_server()`.
+    - timeout (float): Seconds to wait for a translation, None to wait indefinitely.
+
+    Example:
+    ```python
+    client = TranslationClient()
+    translated = client.translate(["The price is fair."], "es_XX")
+    ```
+    """
+
+    def __init__(self, server: TranslationServer = None, timeout: float = None):
+        self.server = server or get_translation_server()
+        self.timeout = timeout
+
+    def translate(self, text_list: list, target_lng: str) -> list:
+        """
+        Translate statements through the server.
+
+        Raises:
+        - TranslationServerBusy: If the server queue is full.
+        - concurrent.futures.TimeoutError: If the translation takes longer than `timeout`.
+        """
+        return self.server.submit(text_list, target_lng).result(timeout=self.timeout)
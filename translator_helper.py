@@ -1,89 +1,640 @@
-from transformers import MBartForConditionalGeneration, MBart50TokenizerFast
-
-# language code mapping dict (Llama2)
-language_codes = {
-    'Arabic': 'ar_AR',
-    'Czech': 'cs_CZ',
-    'German': 'de_DE',
-    'English': 'en_XX',
-    'Spanish': 'es_XX',
-    'Estonian': 'et_EE',
-    'Finnish': 'fi_FI',
-    'French': 'fr_XX',
-    'Gujarati': 'gu_IN',
-    'Hindi': 'hi_IN',
-    'Italian': 'it_IT',
-    'Japanese': 'ja_XX',
-    'Kazakh': 'kk_KZ',
-    'Korean': 'ko_KR',
-    'Lithuanian': 'lt_LT',
-    'Latvian': 'lv_LV',
-    'Burmese': 'my_MM',
-    'Nepali': 'ne_NP',
-    'Dutch': 'nl_XX',
-    'Romanian': 'ro_RO',
-    'Russian': 'ru_RU',
-    'Sinhala': 'si_LK',
-    'Turkish': 'tr_TR',
-    'Vietnamese': 'vi_VN',
-    'Chinese': 'zh_CN',
-    'Afrikaans': 'af_ZA',
-    'Azerbaijani': 'az_AZ',
-    'Bengali': 'bn_IN',
-    'Persian': 'fa_IR',
-    'Hebrew': 'he_IL',
-    'Croatian': 'hr_HR',
-    'Indonesian': 'id_ID',
-    'Georgian': 'ka_GE',
-    'Khmer': 'km_KH',
-    'Macedonian': 'mk_MK',
-    'Malayalam': 'ml_IN',
-    'Mongolian': 'mn_MN',
-    'Marathi': 'mr_IN',
-    'Polish': 'pl_PL',
-    'Pashto': 'ps_AF',
-    'Portuguese': 'pt_XX',
-    'Swedish': 'sv_SE',
-    'Swahili': 'sw_KE',
-    'Tamil': 'ta_IN',
-    'Telugu': 'te_IN',
-    'Thai': 'th_TH',
-    'Tagalog': 'tl_XX',
-    'Ukrainian': 'uk_UA',
-    'Urdu': 'ur_PK',
-    'Xhosa': 'xh_ZA',
-    'Galician': 'gl_ES',
-    'Slovene': 'sl_SI'
+import time
+_import_started = time.perf_counter()
+
+import os
+import re
+import threading
+
+from cache_helper import TieredCache, make_cache_key
+from instrumentation import span
+from language_codes import language_codes
+
+# Hugging Face model id or local directory of the translation model
+MODEL_NAME = os.getenv("TRANSLATOR_MODEL", "SnypzZz/Llama2-13b-Language-translate")
+
+# Directory of the memory-mappable copy written by `prepare_model.py`. When it
+# exists, the model and tokenizer are loaded from it instead of `MODEL_NAME`.
+PREPARED_MODEL_DIR = os.getenv("TRANSLATOR_PREPARED_DIR", "prepared_model")
+PREPARED_WEIGHTS = "weights.pt"
+# Name of the model a prepared or exported directory was built from, so a
+# directory built from another model than `MODEL_NAME` is not used
+SOURCE_MODEL_FILE = "source_model.txt"
+
+# Directory of the ONNX export used by the 'onnx' backend. The model is
+# exported there once, by `export_onnx_model` or on first load, and loaded from it afterwards.
+ONNX_MODEL_DIR = os.getenv("TRANSLATOR_ONNX_DIR", "onnx_model")
+ONNX_ENCODER = "encoder_model.onnx"
+
+# Statements longer than `max_segment_tokens` are split on sentence boundaries.
+# Batches hold inputs of similar length and at most `token_budget` padded
+# tokens. These settings are part of the translation cache key.
+GENERATION_SETTINGS = {'max_segment_tokens': 64, 'token_budget': 2048, 'max_batch_size': 64}
+
+# CPU inference profile:
+# - backend: 'eager' (fp32 PyTorch), 'int8' (dynamic int8 quantization of the
+#   linear layers) or 'onnx' (exported ONNX Runtime graph, needs `optimum[onnxruntime]`)
+# - num_threads: intra-op threads used by PyTorch, None for the library default
+# - num_beams: beam size, None for the model default
+# - max_new_tokens: upper bound on generated tokens per input, None for the
+#   generation length of the model's own generation config
+INFERENCE_BACKENDS = ('eager', 'int8', 'onnx')
+INFERENCE_SETTINGS = {
+    'backend': os.getenv('TRANSLATOR_BACKEND', 'eager'),
+    'num_threads': int(os.getenv('TRANSLATOR_NUM_THREADS', '0')) or None,
+    'num_beams': int(os.getenv('TRANSLATOR_NUM_BEAMS', '0')) or None,
+    'max_new_tokens': int(os.getenv('TRANSLATOR_MAX_NEW_TOKENS', '0')) or None,
 }
 
-model = MBartForConditionalGeneration.from_pretrained("SnypzZz/Llama2-13b-Language-translate")
-tokenizer = MBart50TokenizerFast.from_pretrained("SnypzZz/Llama2-13b-Language-translate", src_lang="en_XX")
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;:])\s+')
+
+# Counters of the bucketed translation engine
+translation_batch_stats = {'statements': 0, 'segments': 0, 'split_statements': 0,
+                           'truncated': 0, 'batches': 0, 'tokens': 0, 'padding_tokens': 0}
+
+# Translation memory: in-memory LRU in front of a SQLite file shared by all processes.
+# The file is opened on first use, not at import; an empty TRANSLATION_CACHE_PATH keeps it in memory only.
+translation_cache = TieredCache(
+    max_items=int(os.getenv('TRANSLATION_CACHE_ITEMS', '8192')),
+    path=os.getenv('TRANSLATION_CACHE_PATH', 'translation_cache.sqlite3') or None,
+    max_bytes=int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+)
+translation_cache_stats = {'hits': 0, 'misses': 0, 'generate_seconds': 0.0}
+_cache_stats_lock = threading.Lock()
+
+# Loaded on first use by `get_translator`. Module globals live for the whole
+# process, so the model is shared by every Streamlit rerun and session.
+_translator = None
+_translator_lock = threading.Lock()
+_warm_up_thread = None
+
+# Import time, model load time and first translation latency, in seconds
+translator_stats = {
+    'import_seconds': None,
+    'load_seconds': None,
+    'first_translation_seconds': None,
+    'model_source': None,
+}
+
+def _write_source_model(directory: str, model_name: str):
+    with open(os.path.join(directory, SOURCE_MODEL_FILE), 'w', encoding='utf-8') as source:
+        source.write(model_name)
+
+def _built_from(directory: str, model_name: str) -> bool:
+    try:
+        with open(os.path.join(directory, SOURCE_MODEL_FILE), encoding='utf-8') as source:
+            return source.read().strip() == model_name
+    except OSError:
+        # built before the source was recorded; it may be any model
+        return False
+
+def prepared_model_available(directory: str = None) -> bool:
+    """
+    Return True if `directory` (default `PREPARED_MODEL_DIR`) holds a prepared copy of `MODEL_NAME`.
+
+    A directory prepared from another model, or without a recorded source, is
+    ignored, so changing `TRANSLATOR_MODEL` loads that model with `from_pretrained`.
+    """
+    directory = directory or PREPARED_MODEL_DIR
+    return (bool(directory) and os.path.exists(os.path.join(directory, PREPARED_WEIGHTS))
+            and _built_from(directory, MODEL_NAME))
+
+def prepare_model(directory: str = None, model_name: str = None) -> str:
+    """
+    Convert the translation model into a memory-mappable copy.
+
+    Args:
+        directory (str): Output directory, defaults to `PREPARED_MODEL_DIR`.
+        model_name (str): Model id or directory to convert, defaults to `MODEL_NAME`.
+
+    Returns:
+        str: The output directory.
+
+    The config and tokenizer are saved with `save_pretrained` and the weights as
+    one uncompressed `torch.save` archive, which `load_prepared_model` maps into
+    memory instead of reading. Tied weights are stored once.
+    """
+    import torch
+    from transformers import MBart50TokenizerFast, MBartForConditionalGeneration
+
+    directory = directory or PREPARED_MODEL_DIR
+    model_name = model_name or MODEL_NAME
+    os.makedirs(directory, exist_ok=True)
+    model = MBartForConditionalGeneration.from_pretrained(model_name).eval()
+    model.config.save_pretrained(directory)
+    model.generation_config.save_pretrained(directory)
+    MBart50TokenizerFast.from_pretrained(model_name, src_lang="en_XX").save_pretrained(directory)
+    # write to a temporary name first, so an interrupted build never leaves a partial model
+    path = os.path.join(directory, PREPARED_WEIGHTS)
+    torch.save(model.state_dict(), path + '.tmp')
+    os.replace(path + '.tmp', path)
+    _write_source_model(directory, model_name)
+    return directory
+
+def load_prepared_model(directory: str = None):
+    """
+    Load a model written by `prepare_model` without copying its weights.
+
+    Args:
+        directory (str): The prepared model directory, defaults to `PREPARED_MODEL_DIR`.
+
+    Returns:
+        The `MBartForConditionalGeneration` model, in eval mode.
+
+    The model is built on the meta device, so no memory is allocated for its
+    parameters. The weights are then memory-mapped with `torch.load(mmap=True)`
+    and assigned to the model as they are, so pages are read from disk on first
+    use and shared by every process that maps the same file. Nothing is downloaded.
+
+    Raises:
+        RuntimeError: If the prepared weights do not cover every parameter and buffer of the model.
+    """
+    import torch
+    from transformers import GenerationConfig, MBartConfig, MBartForConditionalGeneration
+
+    directory = directory or PREPARED_MODEL_DIR
+    config = MBartConfig.from_pretrained(directory)
+    with torch.device('meta'):
+        model = MBartForConditionalGeneration(config)
+    if os.path.exists(os.path.join(directory, 'generation_config.json')):
+        model.generation_config = GenerationConfig.from_pretrained(directory)
+    state_dict = torch.load(os.path.join(directory, PREPARED_WEIGHTS), map_location='cpu', mmap=True, weights_only=True)
+    model.load_state_dict(state_dict, assign=True)
+    # assignment replaces the shared embedding parameters one by one; tie them again
+    model.tie_weights()
+    left_on_meta = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+                    if tensor.is_meta]
+    if left_on_meta:
+        raise RuntimeError(f"Prepared model in {directory} is missing: {', '.join(left_on_meta)}")
+    return model.eval()
+
+def onnx_model_available(directory: str = None) -> bool:
+    """Return True if `directory` (default `ONNX_MODEL_DIR`) holds an ONNX export of `MODEL_NAME`."""
+    directory = directory or ONNX_MODEL_DIR
+    return (bool(directory) and os.path.exists(os.path.join(directory, ONNX_ENCODER))
+            and _built_from(directory, MODEL_NAME))
+
+def export_onnx_model(directory: str = None, model_name: str = None) -> str:
+    """
+    Export the translation model to ONNX for the 'onnx' backend.
+
+    Args:
+        directory (str): Output directory, defaults to `ONNX_MODEL_DIR`.
+        model_name (str): Model id or directory to export, defaults to `MODEL_NAME`.
+
+    Returns:
+        str: The output directory.
+
+    The export traces the whole model and takes much longer than loading it,
+    so it is done once and `load_model('onnx')` loads the saved files.
+
+    Raises:
+        ImportError: If `optimum[onnxruntime]` is not installed.
+    """
+    ORTModelForSeq2SeqLM = _ort_model_class()
+    directory = directory or ONNX_MODEL_DIR
+    model_name = model_name or MODEL_NAME
+    # export next to the target first, so an interrupted export never leaves a partial model
+    ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(directory + '.tmp')
+    _write_source_model(directory + '.tmp', model_name)
+    if os.path.exists(directory):
+        import shutil
+        shutil.rmtree(directory)
+    os.replace(directory + '.tmp', directory)
+    return directory
+
+def _ort_model_class():
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as error:
+        raise ImportError("The 'onnx' translator backend requires `pip install optimum[onnxruntime]`.") from error
+    return ORTModelForSeq2SeqLM
+
+def load_model(backend: str):
+    """
+    Load the translation model for an inference backend.
+
+    Args:
+        backend (str): One of `INFERENCE_BACKENDS`.
+
+    Returns:
+        The model, ready for `generate`.
+
+    The 'eager' and 'int8' backends load the prepared, memory-mapped model
+    when `PREPARED_MODEL_DIR` holds one of `MODEL_NAME`, see `prepare_model`. The 'onnx'
+    backend loads the export in `ONNX_MODEL_DIR`, exporting it first if it is
+    missing or was exported from another model.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the 'onnx' backend is selected without `optimum[onnxruntime]` installed.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown translator backend: {backend!r}")
+    if backend == 'onnx':
+        ORTModelForSeq2SeqLM = _ort_model_class()
+        if not onnx_model_available():
+            export_onnx_model()
+        return ORTModelForSeq2SeqLM.from_pretrained(ONNX_MODEL_DIR)
+
+    import torch
+    from transformers import MBartForConditionalGeneration
+    if prepared_model_available():
+        model = load_prepared_model()
+    else:
+        model = MBartForConditionalGeneration.from_pretrained(MODEL_NAME).eval()
+    if backend == 'int8':
+        # quantization writes new int8 weights, so only the remaining layers stay memory-mapped
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+def get_translator():
+    """
+    Return the translation model and tokenizer, loading them on first use.
+
+    Returns:
+        tuple: The model for the backend in `INFERENCE_SETTINGS` and the `MBart50TokenizerFast` tokenizer.
+
+    The model is loaded once per process behind a lock, so concurrent callers
+    wait for the same load instead of loading it twice.
+    """
+    global _translator
+    if _translator is None:
+        with _translator_lock:
+            if _translator is None:
+                started = time.perf_counter()
+                import torch
+                from transformers import MBart50TokenizerFast
+                if INFERENCE_SETTINGS['num_threads']:
+                    torch.set_num_threads(INFERENCE_SETTINGS['num_threads'])
+                source = PREPARED_MODEL_DIR if prepared_model_available() else MODEL_NAME
+                model = load_model(INFERENCE_SETTINGS['backend'])
+                tokenizer = MBart50TokenizerFast.from_pretrained(source, src_lang="en_XX")
+                _translator = (model, tokenizer)
+                translator_stats['load_seconds'] = time.perf_counter() - started
+                translator_stats['model_source'] = source
+    return _translator
+
+def set_inference_profile(**settings):
+    """
+    Change the CPU inference profile and unload the current model.
+
+    Args:
+        **settings: Any of the keys of `INFERENCE_SETTINGS`.
+
+    The next translation loads the model again with the new profile.
+
+    Raises:
+        ValueError: If a setting or the backend is unknown.
+    """
+    global _translator
+    unknown = set(settings) - set(INFERENCE_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown inference settings: {', '.join(sorted(unknown))}")
+    if settings.get('backend', INFERENCE_SETTINGS['backend']) not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown translator backend: {settings['backend']!r}")
+    with _translator_lock:
+        INFERENCE_SETTINGS.update(settings)
+        _translator = None
+
+def warm_up(background: bool = True):
+    """
+    Load the translation model ahead of the first translation.
+
+    Args:
+        background (bool): Load in a daemon thread instead of blocking the caller.
+
+    Returns:
+        threading.Thread: The warm-up thread, or None when loading in the foreground
+        or when the model is already loaded or loading.
+    """
+    global _warm_up_thread
+    if _translator is not None:
+        return None
+    if not background:
+        get_translator()
+        return None
+    with _translator_lock:
+        if _warm_up_thread is not None:
+            return None
+        _warm_up_thread = threading.Thread(target=get_translator, name='translator-warm-up', daemon=True)
+        _warm_up_thread.start()
+        return _warm_up_thread
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so equivalent statements share a cache entry."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+def translation_cache_key(text: str, target_lng: str) -> str:
+    """Cache key of a normalized statement translated with the current model and settings."""
+    profile = {key: value for key, value in INFERENCE_SETTINGS.items() if key != 'num_threads'}
+    return make_cache_key(text, target_lng, MODEL_NAME, GENERATION_SETTINGS, profile)
+
+def get_translation_cache_stats() -> dict:
+    """
+    Return translation cache statistics.
+
+    Returns:
+        dict: Hits, misses, hit rate, and the estimated generation seconds saved by the hits,
+        based on the average generation time of a missed statement.
+    """
+    with _cache_stats_lock:
+        stats = dict(translation_cache_stats)
+    lookups = stats['hits'] + stats['misses']
+    per_statement = stats['generate_seconds'] / stats['misses'] if stats['misses'] else 0.0
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['seconds_saved'] = stats['hits'] * per_statement
+    return stats
+
+def split_statement(text: str, tokenizer, max_tokens: int) -> list:
+    """
+    Split a long statement into segments of whole sentences of at most `max_tokens` tokens.
+
+    Args:
+        text (str): The statement to split.
+        tokenizer: The translation tokenizer.
+        max_tokens (int): Target maximum number of tokens per segment.
+
+    Returns:
+        list: The segments, in order. A single sentence longer than `max_tokens`
+        is kept whole rather than cut.
+    """
+    sentences = [sentence for sentence in SENTENCE_BOUNDARY.split(text) if sentence]
+    if len(sentences) < 2:
+        return [text]
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)['input_ids']]
+    segments, current, current_length = [], [], 0
+    for sentence, length in zip(sentences, lengths):
+        if current and current_length + length > max_tokens:
+            segments.append(' '.join(current))
+            current, current_length = [], 0
+        current.append(sentence)
+        current_length += length
+    segments.append(' '.join(current))
+    return segments
+
+def plan_batches(lengths: list, token_budget: int, max_batch_size: int) -> list:
+    """
+    Group inputs of similar length into batches bounded by a padded token budget.
+
+    Args:
+        lengths (list): Token length of every input.
+        token_budget (int): Maximum of batch size times longest input in a batch.
+        max_batch_size (int): Maximum number of inputs in a batch.
+
+    Returns:
+        list: Batches as lists of input positions, shortest inputs first.
+    """
+    batches, current, longest = [], [], 0
+    for position in sorted(range(len(lengths)), key=lengths.__getitem__):
+        longest_with = max(longest, lengths[position])
+        if current and (len(current) >= max_batch_size or longest_with * (len(current) + 1) > token_budget):
+            batches.append(current)
+            current, longest_with = [], lengths[position]
+        current.append(position)
+        longest = longest_with
+    if current:
+        batches.append(current)
+    return batches
+
+def _generate_batch(model, tokenizer, input_ids: list, target_lng: str) -> list:
+    import torch
+
+    # pad only up to the longest input of this batch
+    model_inputs = tokenizer.pad({'input_ids': input_ids}, padding=True, return_tensors="pt")
+    longest = model_inputs['input_ids'].shape[1]
+    padding = sum(longest - len(ids) for ids in input_ids)
+
+    generate_kwargs = {}
+    if INFERENCE_SETTINGS['max_new_tokens']:
+        generate_kwargs['max_new_tokens'] = INFERENCE_SETTINGS['max_new_tokens']
+    if INFERENCE_SETTINGS['num_beams']:
+        generate_kwargs['num_beams'] = INFERENCE_SETTINGS['num_beams']
+    with span('translate.generate', language=target_lng, batch_size=len(input_ids),
+              input_tokens=longest * len(input_ids), padding_tokens=padding) as generate_span:
+        with torch.inference_mode():
+            generated_tokens = model.generate(
+                **model_inputs,
+                forced_bos_token_id=tokenizer.lang_code_to_id[target_lng],
+                **generate_kwargs,
+            )
+        generate_span.set(output_tokens=int(generated_tokens.numel()))
+
+    translation_batch_stats['batches'] += 1
+    translation_batch_stats['tokens'] += longest * len(input_ids)
+    translation_batch_stats['padding_tokens'] += padding
+    with span('translate.decode', batch_size=len(input_ids)):
+        return tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+def _segment_inputs(model, tokenizer, text_list: list) -> tuple:
+    settings = GENERATION_SETTINGS
+
+    # split long statements into sentence segments instead of truncating them
+    segments, owners = [], []
+    with span('translate.tokenize', statements=len(text_list)) as tokenize_span:
+        for index, text in enumerate(text_list):
+            parts = split_statement(text, tokenizer, settings['max_segment_tokens'])
+            if len(parts) > 1:
+                translation_batch_stats['split_statements'] += 1
+            segments.extend(parts)
+            owners.extend([index] * len(parts))
+
+        # only inputs beyond the model's own limit are truncated
+        max_length = min(tokenizer.model_max_length, model.config.max_position_embeddings)
+        input_ids = tokenizer(segments, add_special_tokens=True)['input_ids']
+        truncated = sum(len(ids) > max_length for ids in input_ids)
+        translation_batch_stats['truncated'] += truncated
+        input_ids = [ids if len(ids) <= max_length else ids[:max_length - 1] + ids[-1:] for ids in input_ids]
+        tokenize_span.set(segments=len(segments), tokens=sum(len(ids) for ids in input_ids), truncated=truncated)
+
+    translation_batch_stats['statements'] += len(text_list)
+    translation_batch_stats['segments'] += len(segments)
+    return owners, input_ids
+
+def _join_segments(text_list: list, owners: list, translated: list) -> list:
+    translation = [[] for _ in text_list]
+    for owner, output in zip(owners, translated):
+        translation[owner].append(output)
+    return [' '.join(parts) for parts in translation]
+
+def _generate_translations(text_list: list, target_lng: str) -> list:
+    model, tokenizer = get_translator()
+    settings = GENERATION_SETTINGS
+    owners, input_ids = _segment_inputs(model, tokenizer, text_list)
+
+    # translate length-sorted batches and put the results back in input order
+    translated = [None] * len(input_ids)
+    for batch in plan_batches([len(ids) for ids in input_ids], settings['token_budget'], settings['max_batch_size']):
+        outputs = _generate_batch(model, tokenizer, [input_ids[position] for position in batch], target_lng)
+        for position, output in zip(batch, outputs):
+            translated[position] = output
+    return _join_segments(text_list, owners, translated)
+
+def _generate_multi_target_batch(model, tokenizer, input_ids: list, target_lngs: list) -> list:
+    import torch
+    from transformers.modeling_outputs import BaseModelOutput
+
+    model_inputs = tokenizer.pad({'input_ids': input_ids}, padding=True, return_tensors="pt")
+    longest = model_inputs['input_ids'].shape[1]
+    rows = len(input_ids) * len(target_lngs)
+
+    generate_kwargs = {}
+    if INFERENCE_SETTINGS['max_new_tokens']:
+        generate_kwargs['max_new_tokens'] = INFERENCE_SETTINGS['max_new_tokens']
+    if INFERENCE_SETTINGS['num_beams']:
+        generate_kwargs['num_beams'] = INFERENCE_SETTINGS['num_beams']
+    with span('translate.generate', languages=len(target_lngs), batch_size=rows,
+              input_tokens=longest * len(input_ids)) as generate_span:
+        with torch.inference_mode():
+            # run the encoder once, then reuse its output for every target language:
+            # row k * batch + i decodes input i into target_lngs[k]
+            encoder_outputs = model.get_encoder()(**model_inputs)
+            hidden_states = encoder_outputs.last_hidden_state.repeat(len(target_lngs), 1, 1)
+            attention_mask = model_inputs['attention_mask'].repeat(len(target_lngs), 1)
+            # each row starts with the decoder start token and its own language code,
+            # which is what `forced_bos_token_id` would force for a single language
+            language_ids = torch.tensor([tokenizer.lang_code_to_id[target_lng] for target_lng in target_lngs])
+            decoder_input_ids = torch.stack([
+                torch.full((rows,), model.config.decoder_start_token_id),
+                language_ids.repeat_interleave(len(input_ids)),
+            ], dim=1)
+            generated_tokens = model.generate(
+                encoder_outputs=BaseModelOutput(last_hidden_state=hidden_states),
+                attention_mask=attention_mask,
+                decoder_input_ids=decoder_input_ids,
+                **generate_kwargs,
+            )
+        generate_span.set(output_tokens=int(generated_tokens.numel()))
+
+    translation_batch_stats['batches'] += 1
+    translation_batch_stats['tokens'] += longest * len(input_ids)
+    translation_batch_stats['padding_tokens'] += sum(longest - len(ids) for ids in input_ids)
+    with span('translate.decode', batch_size=rows):
+        outputs = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+    return [outputs[index * len(input_ids):(index + 1) * len(input_ids)] for index in range(len(target_lngs))]
+
+def _generate_multi_target_translations(text_list: list, target_lngs: list) -> dict:
+    if len(target_lngs) == 1 or INFERENCE_SETTINGS['backend'] == 'onnx':
+        # the ONNX Runtime model does not accept precomputed encoder outputs
+        return {target_lng: _generate_translations(text_list, target_lng) for target_lng in target_lngs}
+    model, tokenizer = get_translator()
+    settings = GENERATION_SETTINGS
+    owners, input_ids = _segment_inputs(model, tokenizer, text_list)
+
+    # every input is decoded once per language, so the budgets are shared by the languages
+    token_budget = max(settings['token_budget'] // len(target_lngs), 1)
+    max_batch_size = max(settings['max_batch_size'] // len(target_lngs), 1)
+    translated = {target_lng: [None] * len(input_ids) for target_lng in target_lngs}
+    for batch in plan_batches([len(ids) for ids in input_ids], token_budget, max_batch_size):
+        outputs = _generate_multi_target_batch(model, tokenizer, [input_ids[position] for position in batch], target_lngs)
+        for target_lng, language_outputs in zip(target_lngs, outputs):
+            for position, output in zip(batch, language_outputs):
+                translated[target_lng][position] = output
+    return {target_lng: _join_segments(text_list, owners, translated[target_lng]) for target_lng in target_lngs}
 
 def translate_survey_questions(text_list: list, target_lng: str):
     """
     Translates a list of survey questions from English to the specified target language.
-    
+
     Args:
         text_list (list): A list of strings containing survey questions in English.
         target_lng (str): The language code of the target language for translation.
 
     Returns:
         list: A list of translated survey questions in the target language.
+
+    Statements are looked up in `translation_cache` first; only the misses are
+    sent to the model, and their translations are merged back in the original order.
+    """
+    if isinstance(text_list, str):
+        text_list = [text_list]
+    normalized = [normalize_text(text) for text in text_list]
+    keys = [translation_cache_key(text, target_lng) for text in normalized]
+    translation = [translation_cache.get(key) for key in keys]
+
+    # translate each distinct missing statement once
+    missing = list(dict.fromkeys(text for text, cached in zip(normalized, translation) if cached is None))
+    if missing:
+        started = time.perf_counter()
+        with span('translate.model', language=target_lng, statements=len(missing)):
+            translated = dict(zip(missing, _generate_translations(missing, target_lng)))
+        elapsed = time.perf_counter() - started
+        if translator_stats['first_translation_seconds'] is None:
+            translator_stats['first_translation_seconds'] = elapsed
+        for text in missing:
+            translation_cache.set(translation_cache_key(text, target_lng), translated[text])
+        translation = [translated[text] if cached is None else cached
+                       for text, cached in zip(normalized, translation)]
+    else:
+        elapsed = 0.0
+
+    # a statement repeated within the request is one lookup, not a hit for every repeat
+    with _cache_stats_lock:
+        translation_cache_stats['hits'] += len(set(normalized)) - len(missing)
+        translation_cache_stats['misses'] += len(missing)
+        translation_cache_stats['generate_seconds'] += elapsed
+    return translation
+
+def translate_to_languages(text_list: list, target_lngs: list) -> dict:
+    """
+    Translates a list of survey questions from English into several target languages at once.
+
+    Args:
+        text_list (list): A list of strings containing survey questions in English.
+        target_lngs (list): The language codes of the target languages.
+
+    Returns:
+        dict: Language code -> list of translated survey questions, in input order.
+
+    The English input is tokenized and encoded once per batch and the encoder
+    output is reused for every language, so K languages cost one encoder pass
+    plus one batched decode instead of K calls to `translate_survey_questions`.
+    Cached translations are reused per language as in `translate_survey_questions`.
     """
-    model_inputs = tokenizer(text_list, return_tensors="pt", padding=True, truncation=True, max_length = 40)
+    if isinstance(text_list, str):
+        text_list = [text_list]
+    target_lngs = list(dict.fromkeys(target_lngs))
+    normalized = [normalize_text(text) for text in text_list]
+    translation = {target_lng: [translation_cache.get(translation_cache_key(text, target_lng)) for text in normalized]
+                   for target_lng in target_lngs}
+
+    # group the distinct missing statements by the languages they are missing in,
+    # usually a single group holding every statement and every language
+    missing_languages = {}
+    for target_lng in target_lngs:
+        for text, cached in zip(normalized, translation[target_lng]):
+            if cached is None:
+                missing_languages.setdefault(text, {})[target_lng] = None
+    groups = {}
+    for text, languages in missing_languages.items():
+        groups.setdefault(tuple(languages), []).append(text)
 
-    # translate from English to Spanish
-    generated_tokens = model.generate(
-        **model_inputs,
-        forced_bos_token_id=tokenizer.lang_code_to_id[target_lng]
-    )
+    started = time.perf_counter()
+    for languages, texts in groups.items():
+        with span('translate.model', language=','.join(languages), statements=len(texts)):
+            translated = _generate_multi_target_translations(texts, list(languages))
+        for target_lng in languages:
+            outputs = dict(zip(texts, translated[target_lng]))
+            for text, output in outputs.items():
+                translation_cache.set(translation_cache_key(text, target_lng), output)
+            translation[target_lng] = [outputs.get(text, cached) if cached is None else cached
+                                       for text, cached in zip(normalized, translation[target_lng])]
+    elapsed = time.perf_counter() - started if groups else 0.0
+    if groups and translator_stats['first_translation_seconds'] is None:
+        translator_stats['first_translation_seconds'] = elapsed
 
-    translation = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
-    print(translation)
+    misses = sum(len(languages) for languages in missing_languages.values())
+    with _cache_stats_lock:
+        translation_cache_stats['hits'] += len(set(normalized)) * len(target_lngs) - misses
+        translation_cache_stats['misses'] += misses
+        translation_cache_stats['generate_seconds'] += elapsed
     return translation
-    
+
+translator_stats['import_seconds'] = time.perf_counter() - _import_started
+
 if __name__ == "__main__":
     # print(generate_survey_statements("car manufacturing", "electric cars"))
     # langchain_agent("Ford Mustang Mach‑E® electric SUV")
-    translate_survey_questions('Hi! Nice to meet you!', language_codes['Spanish'])
-    print('ok')
\ No newline at end of file
+    print(translate_survey_questions('Hi! Nice to meet you!', language_codes['Spanish']))
+    print(translator_stats)
+    print(get_translation_cache_stats())
+    print('ok')